@@ -0,0 +1,86 @@
+"""
+Benchmarks for two_players_fair_division.py
+
+Run with: python benchmark_two_player_fair_division.py
+
+programmers: Itay Hasidi & Amichai Bitan
+"""
+import json
+import subprocess
+import sys
+import timeit
+
+
+def import_time(module: str = 'two_players_fair_division', repeat: int = 5) -> float:
+    """
+    Returns the best time in seconds it takes a fresh interpreter to import the module, measured with -X importtime so
+    the start of the interpreter itself is not counted.
+
+    :param module the name of the module to import.
+    :param repeat the number of fresh interpreters to measure.
+    """
+    best = None
+    for _ in range(repeat):
+        result = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'import ' + module],
+                                capture_output=True, text=True, check=True)
+        for line in result.stderr.splitlines():
+            fields = line.split('|')
+            if len(fields) == 3 and fields[2].strip() == module:
+                cumulative = int(fields[1]) / 1e6
+                if best is None or cumulative < best:
+                    best = cumulative
+    return best
+
+
+def imported_modules(module: str = 'two_players_fair_division'):
+    """
+    Returns the top level packages that importing the module loads, besides the ones a bare interpreter already has.
+
+    :param module the name of the module to import.
+    """
+    code = ('import json, sys; before = set(sys.modules); import %s; '
+            'print(json.dumps(sorted({name.split(".")[0] for name in set(sys.modules) - before})))' % module)
+    result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True)
+    return json.loads(result.stdout)
+
+
+def algorithm_time(algorithm_name: str, ranks, number: int = 1000) -> float:
+    """
+    Returns the mean time in seconds of one call of an algorithm on a rank array.
+
+    :param algorithm_name the name of the algorithm in two_players_fair_division.py.
+    :param ranks a (2, n) array of ranks.
+    :param number the number of calls to average.
+    """
+    import two_players_fair_division
+    algorithm = getattr(two_players_fair_division, algorithm_name)
+    return timeit.timeit(lambda: algorithm(ranks), number=number) / number
+
+
+def thread_scaling(algorithm: str = 'OS', jobs: int = 4, count: int = 400, n: int = 12) -> float:
+    """
+    Returns how many times faster solve_batch() runs a batch of random profiles on jobs threads than on one.
+    Only free-threaded builds of Python get more than 1.
+
+    :param algorithm the abbreviation of the algorithm.
+    :param jobs the number of threads.
+    :param count the number of profiles.
+    :param n the number of items.
+    """
+    from generators_two_player_fair_division import uniform_profiles
+    from threads_two_player_fair_division import solve_batch
+    profiles = uniform_profiles(count, n, seed=0).tolist()
+    serial = timeit.timeit(lambda: solve_batch(profiles, algorithm, jobs=1), number=1)
+    threaded = timeit.timeit(lambda: solve_batch(profiles, algorithm, jobs=jobs), number=1)
+    return serial / threaded
+
+
+if __name__ == '__main__':
+    print("import two_players_fair_division: %.1f ms" % (import_time() * 1e3))
+    print("modules loaded: %s" % ', '.join(imported_modules()))
+    ranks = [[1, 2, 3, 4, 5, 6, 7, 8, 9, 10], [3, 4, 5, 6, 7, 8, 9, 10, 1, 2]]
+    for name in ['top_down', 'top_down_alternating', 'bottom_up', 'bottom_up_alternating', 'trump', 'run_picking_suite']:
+        print("%s on 10 items: %.1f us" % (name, algorithm_time(name, ranks) * 1e6))
+    from threads_two_player_fair_division import gil_enabled
+    print("OS batch on 4 threads: %.2fx faster than on one (GIL %s)"
+          % (thread_scaling(), 'enabled' if gil_enabled() else 'disabled'))
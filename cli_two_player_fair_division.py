@@ -0,0 +1,188 @@
+"""
+Command line entry point for two_players_fair_division.py
+
+Reads preference profiles and writes one JSON line with the results of the chosen algorithms per profile, in the
+input order and tagged with the index of the profile:
+
+    python cli_two_player_fair_division.py -a TD,BU < profiles.jsonl > results.jsonl
+    python cli_two_player_fair_division.py -a OS --jobs 8 profiles.npy
+
+A JSON line is either a (2, n) array of ranks, [[1, 2, 3, 4], [4, 2, 3, 1]], or an object with the ranks and optional
+item and agent names, {"ranks": [[1, 2, 3, 4], [4, 2, 3, 1]], "items": ["a", "b", "c", "d"], "names": ["A", "B"]}.
+A .npy file holds a (k, 2, n) stack of k rank arrays and needs NumPy.
+Profiles are read, solved and written in batches, so memory does not grow with the size of the input.
+
+programmers: Itay Hasidi & Amichai Bitan
+"""
+import argparse
+import itertools
+import json
+import sys
+from typing import List, Any, Dict, Iterator, NamedTuple
+
+from two_players_fair_division import ALGORITHMS, make_profile
+
+
+class InvalidLine(NamedTuple):
+    """
+    Stands for a line that is not valid JSON, so solve() writes an error record for it and the run goes on.
+    """
+    error: str
+
+
+def read_json_lines(lines) -> Iterator[Any]:
+    """
+    Yields the profile of every non empty JSON line, or an InvalidLine for a line that is not valid JSON.
+
+    :param lines an iterable of text lines.
+
+    >>> list(read_json_lines(['[[1, 2], [2, 1]]', '', '{"ranks": [[1, 2], [1, 2]], "items": ["a", "b"]}']))
+    [[[1, 2], [2, 1]], {'ranks': [[1, 2], [1, 2]], 'items': ['a', 'b']}]
+    >>> list(read_json_lines(['[[1, 2], [2, 1]', '']))
+    [InvalidLine(error="JSONDecodeError: Expecting ',' delimiter: line 1 column 16 (char 15)")]
+    """
+    for line in lines:
+        if line.strip():
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError as e:
+                yield InvalidLine('%s: %s' % (type(e).__name__, e))
+
+
+def read_npy(path: str) -> Iterator[Any]:
+    """
+    Yields the rank arrays of a (k, 2, n) .npy stack. The file is memory mapped, so only one profile is read at a time.
+
+    :param path the path of the .npy file.
+    """
+    import numpy
+    stack = numpy.load(path, mmap_mode='r')
+    for ranks in stack:
+        yield ranks.tolist()
+
+
+def solve(task) -> Dict:
+    """
+    Runs the algorithms on one profile and returns its JSON record.
+    A profile that fails, or a line that is not valid JSON, gets an "error" entry instead of results.
+
+    :param task a (profile index, profile, algorithm abbreviations) tuple.
+
+    >>> solve((0, [[1, 2, 3, 4], [4, 2, 3, 1]], ['TD', 'TR']))
+    {'index': 0, 'TD': {0: [0, 1], 1: [3, 2]}, 'TR': {0: [0, 2], 1: [3, 1]}}
+    >>> solve((1, {'ranks': [[1, 2], [2, 1]], 'items': ['a', 'b'], 'names': ['A', 'B']}, ['BU']))
+    {'index': 1, 'BU': {'A': ['a'], 'B': ['b']}}
+    >>> solve((2, InvalidLine('JSONDecodeError: Expecting value: line 1 column 1 (char 0)'), ['BU']))
+    {'index': 2, 'error': 'JSONDecodeError: Expecting value: line 1 column 1 (char 0)'}
+    """
+    index, record, algorithms = task
+    result = {'index': index}
+    if isinstance(record, InvalidLine):
+        result['error'] = record.error
+        return result
+    try:
+        if isinstance(record, dict):
+            profile = make_profile(record['ranks'], record.get('items'), record.get('names'))
+        else:
+            profile = make_profile(record)
+        for name in algorithms:
+            result[name] = ALGORITHMS[name](profile)
+    except Exception as e:
+        result['error'] = '%s: %s' % (type(e).__name__, e)
+    return result
+
+
+def run(profiles, algorithms: List[str], output, jobs: int = 1, batch_size: int = 1000):
+    """
+    Solves the profiles and writes one JSON line per profile, in the input order.
+
+    :param profiles an iterable of profiles, as read by read_json_lines() or read_npy().
+    :param algorithms the abbreviations of the algorithms to run, see ALGORITHMS.
+    :param output a text file to write to.
+    :param jobs the number of worker processes, 1 solves in this process.
+    :param batch_size the number of profiles read ahead for every worker.
+
+    >>> import io
+    >>> out = io.StringIO()
+    >>> run([[[1, 2], [2, 1]], [[1, 2], [1, 2]]], ['TD'], out)
+    >>> print(out.getvalue(), end='')
+    {"index": 0, "TD": {"0": [0], "1": [1]}}
+    {"index": 1, "TD": {"0": [0], "1": [1]}}
+    """
+    tasks = ((index, record, algorithms) for index, record in enumerate(profiles))
+    if jobs == 1:
+        for result in map(solve, tasks):
+            output.write(json.dumps(result) + '\n')
+        return
+    import multiprocessing
+    with multiprocessing.Pool(jobs) as pool:
+        while True:
+            batch = list(itertools.islice(tasks, batch_size * jobs))
+            if not batch:
+                break
+            for result in pool.imap(solve, batch, chunksize=max(1, batch_size // 10)):
+                output.write(json.dumps(result) + '\n')
+            output.flush()
+
+
+def algorithm_list(text: str) -> List[str]:
+    """
+    Parses a comma separated list of algorithm abbreviations.
+
+    >>> algorithm_list('td,BU')
+    ['TD', 'BU']
+    """
+    algorithms = [name.strip().upper() for name in text.split(',')]
+    for name in algorithms:
+        if name not in ALGORITHMS:
+            raise argparse.ArgumentTypeError("unknown algorithm %s, expected one of %s" % (name, ','.join(ALGORITHMS)))
+    return algorithms
+
+
+def job_count(text: str) -> int:
+    """
+    Parses the number of worker processes, which must be at least 1.
+
+    >>> job_count('4')
+    4
+    """
+    try:
+        jobs = int(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError("the number of jobs must be a whole number, got %s" % text)
+    if jobs < 1:
+        raise argparse.ArgumentTypeError("the number of jobs must be at least 1, got %d" % jobs)
+    return jobs
+
+
+def main(argv: List[str] = None):
+    """
+    Parses the command line and runs the algorithms, see the module docstring.
+
+    :param argv the command line arguments, sys.argv[1:] by default.
+    """
+    parser = argparse.ArgumentParser(description="Two-player fair division of indivisible items.")
+    parser.add_argument('input', nargs='?', default='-',
+                        help="a JSON lines file or a .npy stack of rank arrays, - or nothing for stdin")
+    parser.add_argument('-a', '--algorithms', type=algorithm_list, required=True,
+                        help="comma separated algorithms to run, out of %s" % ','.join(ALGORITHMS))
+    parser.add_argument('-o', '--output', default='-', help="the file to write to, - or nothing for stdout")
+    parser.add_argument('-j', '--jobs', type=job_count, default=1, help="the number of worker processes")
+    args = parser.parse_args(argv)
+
+    output = sys.stdout if args.output == '-' else open(args.output, 'w')
+    try:
+        if args.input.endswith('.npy'):
+            run(read_npy(args.input), args.algorithms, output, args.jobs)
+        elif args.input == '-':
+            run(read_json_lines(sys.stdin), args.algorithms, output, args.jobs)
+        else:
+            with open(args.input) as lines:
+                run(read_json_lines(lines), args.algorithms, output, args.jobs)
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+
+if __name__ == '__main__':
+    main()
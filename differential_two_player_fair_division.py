@@ -0,0 +1,216 @@
+"""
+Differential testing of the algorithms of two_players_fair_division.py against the frozen reference implementations
+
+check_backend() runs an implementation of one of the algorithms and its reference from
+reference_two_player_fair_division.py on many random profiles. When they disagree, the profile is shrunk to a smallest
+one that still shows the difference, so a faster engine can be checked with:
+
+    assert check_backend('OS', my_sequential) is None
+
+programmers: Itay Hasidi & Amichai Bitan
+"""
+import random
+
+from profile_two_player_fair_division import Profile
+from reference_two_player_fair_division import REFERENCE_ALGORITHMS, reference_agents
+
+NAMES = ['Alice', 'George']
+
+# The picking algorithms take any number of items and run in polynomial time, so they are checked on larger profiles
+# with odd numbers of items too. The searches, and their references, need an even number of items.
+POLYNOMIAL = ['TD', 'TA', 'BU', 'BA', 'TR']
+MAX_ITEMS = 8
+MAX_POLYNOMIAL_ITEMS = 40
+
+
+def random_profile(rng: random.Random, max_items: int = MAX_ITEMS, odd: bool = False) -> Profile:
+    """
+    Returns a random profile with an even number of items, or with any number of items from 1 with odd=True. Half of
+    the profiles state the items in a random order, as agents built from dicts can.
+
+    :param rng the random generator.
+    :param max_items the largest number of items.
+    :param odd True to allow odd numbers of items.
+
+    >>> profile = random_profile(random.Random(0), 4)
+    >>> sorted(profile.ranks[0]) == list(range(1, len(profile.items) + 1))
+    True
+    >>> sorted({len(random_profile(random.Random(seed), 5, odd=True).items) for seed in range(50)})
+    [1, 2, 3, 4, 5]
+    """
+    n = rng.randint(1, max_items) if odd else 2 * rng.randint(1, max_items // 2)
+    ranks = [rng.sample(range(1, n + 1), n) for _ in NAMES]
+    orders = [list(range(n)) for _ in NAMES]
+    if rng.random() < 0.5:
+        for order in orders:
+            rng.shuffle(order)
+    return Profile(list(NAMES), [chr(ord('a') + i) for i in range(n)], ranks, orders)
+
+
+def reference_result(algorithm: str, profile: Profile):
+    """
+    Returns the result of the reference algorithm, or the exception it raises.
+
+    :param algorithm the abbreviation of the algorithm, see REFERENCE_ALGORITHMS.
+    :param profile the preferences of the agents.
+    """
+    try:
+        return REFERENCE_ALGORITHMS[algorithm](reference_agents(profile), list(profile.items))
+    except Exception as e:
+        return e
+
+
+def differs(algorithm: str, backend, profile: Profile, ordered: bool = True) -> bool:
+    """
+    Returns True if the backend does not return what the reference returns on the profile.
+    Profiles the reference fails on have no reference result and never differ.
+
+    :param algorithm the abbreviation of the algorithm, see REFERENCE_ALGORITHMS.
+    :param backend a function that takes a Profile, like the functions of two_players_fair_division.py.
+    :param profile the preferences of the agents.
+    :param ordered False to compare lists of allocations regardless of their order.
+
+    >>> profile = Profile(NAMES, ['a', 'b'], [[1, 2], [2, 1]], [[0, 1], [0, 1]])
+    >>> differs('TD', lambda profile: {'Alice': ['a'], 'George': ['b']}, profile)
+    False
+    >>> differs('TD', lambda profile: {'Alice': ['b'], 'George': ['a']}, profile)
+    True
+    """
+    expected = reference_result(algorithm, profile)
+    if isinstance(expected, Exception):
+        return False
+    return differs_from(expected, backend, profile, ordered)
+
+
+def differs_from(expected, backend, profile: Profile, ordered: bool = True) -> bool:
+    """
+    Returns True if the backend does not return the expected result on the profile, see differs().
+
+    :param expected what the reference returns on the profile.
+    :param backend a function that takes a Profile, like the functions of two_players_fair_division.py.
+    :param profile the preferences of the agents.
+    :param ordered False to compare lists of allocations regardless of their order.
+    """
+    try:
+        result = backend(profile)
+    except Exception:
+        return True
+    if not ordered and isinstance(expected, list) and isinstance(result, list):
+        return sorted(map(repr, expected)) != sorted(map(repr, result))
+    return expected != result
+
+
+def check_backend(algorithm: str, backend, count: int = 1000, seed=0, max_items: int = None, ordered: bool = True,
+                  min_compared: int = None):
+    """
+    Compares the backend with the reference algorithm on count random profiles, with odd numbers of items too for the
+    POLYNOMIAL algorithms.
+    Returns None if they always agree, otherwise the shrunk profile of the first disagreement.
+    The profiles the reference raises on are not compared, and an AssertionError is raised if fewer than min_compared
+    profiles were.
+
+    :param algorithm the abbreviation of the algorithm, see REFERENCE_ALGORITHMS.
+    :param backend a function that takes a Profile, like the functions of two_players_fair_division.py.
+    :param count the number of random profiles.
+    :param seed the seed of the random profiles.
+    :param max_items the largest number of items, MAX_POLYNOMIAL_ITEMS for the POLYNOMIAL algorithms and MAX_ITEMS for
+    the others by default.
+    :param ordered False to compare lists of allocations regardless of their order.
+    :param min_compared the least number of profiles that must be compared, half of count by default.
+
+    >>> profile = check_backend('TD', lambda profile: {'Alice': [], 'George': []}, count=10)
+    >>> profile.items, profile.ranks
+    (['w', 'x', 'y'], [[3, 1, 2], [3, 1, 2]])
+    >>> check_backend('SD', lambda profile: reference_result('SD', profile), count=10, min_compared=10)
+    Traceback (most recent call last):
+    ...
+    AssertionError: only 8 of 10 profiles were compared with the reference SD, expected at least 10
+    """
+    odd = algorithm in POLYNOMIAL
+    if max_items is None:
+        max_items = MAX_POLYNOMIAL_ITEMS if odd else MAX_ITEMS
+    if min_compared is None:
+        min_compared = count // 2
+    rng = random.Random(seed)
+    compared = 0
+    for _ in range(count):
+        profile = random_profile(rng, max_items, odd)
+        expected = reference_result(algorithm, profile)
+        if isinstance(expected, Exception):
+            continue
+        compared += 1
+        if differs_from(expected, backend, profile, ordered):
+            return shrink(profile, lambda smaller: differs(algorithm, backend, smaller, ordered))
+    if compared < min_compared:
+        raise AssertionError("only %d of %d profiles were compared with the reference %s, expected at least %d"
+                             % (compared, count, algorithm, min_compared))
+    return None
+
+
+def shrink(profile: Profile, failing) -> Profile:
+    """
+    Returns a smallest and simplest profile that still fails, by repeatedly removing pairs of items, putting the items
+    in their natural order and removing disagreements between the agents while the profile fails.
+
+    :param profile a failing profile.
+    :param failing a function that returns True for failing profiles.
+
+    >>> shrink(Profile(NAMES, ['a', 'b', 'c', 'd'], [[1, 2, 3, 4], [4, 3, 2, 1]], [[0, 1, 2, 3], [3, 2, 1, 0]]),
+    ...        lambda profile: 'c' in profile.items)
+    Profile(names=['Alice', 'George'], items=['c', 'd'], ranks=[[1, 2], [1, 2]], orders=[[0, 1], [0, 1]], values=None)
+    """
+    changed = True
+    while changed:
+        changed = False
+        for smaller in simpler_profiles(profile):
+            if failing(smaller):
+                profile = smaller
+                changed = True
+                break
+    return profile
+
+
+def simpler_profiles(profile: Profile):
+    """
+    Yields the profiles shrink() tries instead of a failing one, the simplest changes first.
+
+    :param profile the preferences of the agents.
+    """
+    n = len(profile.items)
+    for a in range(n):
+        for b in range(a + 1, n):
+            yield without_items(profile, {a, b})
+    natural = [list(range(n)) for _ in profile.orders]
+    if profile.orders != natural:
+        yield profile._replace(orders=natural)
+    A_ranks, B_ranks = profile.ranks[0], profile.ranks[1]
+    for i in range(n):
+        for j in range(n):
+            if B_ranks[j] == B_ranks[i] + 1 and A_ranks[j] < A_ranks[i]:
+                swapped = list(B_ranks)
+                swapped[i], swapped[j] = swapped[j], swapped[i]
+                yield profile._replace(ranks=[A_ranks, swapped])
+
+
+def without_items(profile: Profile, removed) -> Profile:
+    """
+    Returns the profile without some items, with the remaining ranks renumbered from 1.
+
+    :param profile the preferences of the agents.
+    :param removed the positions of the items to remove.
+
+    >>> without_items(Profile(NAMES, ['a', 'b', 'c'], [[1, 2, 3], [3, 1, 2]], [[0, 1, 2], [2, 1, 0]]), {1})
+    Profile(names=['Alice', 'George'], items=['a', 'c'], ranks=[[1, 2], [2, 1]], orders=[[0, 1], [1, 0]], values=None)
+    """
+    kept = [i for i in range(len(profile.items)) if i not in removed]
+    position = {i: k for k, i in enumerate(kept)}
+    ranks = []
+    for agent_ranks in profile.ranks:
+        order = sorted(kept, key=agent_ranks.__getitem__)
+        new_ranks = [0] * len(kept)
+        for rank, i in enumerate(order, 1):
+            new_ranks[position[i]] = rank
+        ranks.append(new_ranks)
+    orders = [[position[i] for i in order if i in position] for order in profile.orders]
+    values = None if profile.values is None else [[row[i] for i in kept] for row in profile.values]
+    return Profile(profile.names, [profile.items[i] for i in kept], ranks, orders, values)
@@ -0,0 +1,382 @@
+"""
+Experiment pipeline for the property comparison of the eleven algorithms (comparison.png)
+
+comparison.png lists, per algorithm, whether its allocations are envy-free (EF), max-min (MM) and Pareto optimal (PO).
+run_experiment() measures how often that holds on random profiles for every even number of items n: it splits the
+profiles of every n into seeded chunks, solves the chunks with a process pool, and appends the counts of every finished
+chunk to a checkpoint file, so an interrupted run started again with the same checkpoint only solves what is missing.
+
+An allocation is judged by the Borda scores of the agents (n + 1 - rank, see agent_values()), against all the
+allocations that give both agents n / 2 items, which are scored at once with NumPy:
+    EF: every agent scores its own bundle at least as high as the other bundle.
+    MM: the lower of the two scores is the highest possible.
+    PO: no allocation gives both agents at least their scores and one of them more.
+For the algorithms that return several allocations, a profile counts when all of them have the property. The rates are
+taken over the profiles where the algorithm returns an allocation, and "returned" is the rate of those profiles.
+
+    python experiment_two_player_fair_division.py --sizes 4-12 --profiles 10000 --jobs 8 --checkpoint run.jsonl
+
+programmers: Itay Hasidi & Amichai Bitan
+"""
+import argparse
+import itertools
+import json
+import os
+from typing import List, Any, Dict
+
+import numpy as np
+
+from cli_two_player_fair_division import job_count
+from generators_two_player_fair_division import uniform_profiles, mallows_profiles
+from two_players_fair_division import ALGORITHMS
+
+PROPERTIES = ['returned', 'EF', 'MM', 'PO']
+
+
+def balanced_masks(n: int) -> np.ndarray:
+    """
+    Returns a (C(n, n/2), n) array with one row per allocation that gives both agents n / 2 items: 1 for the items of
+    the first agent.
+
+    :param n the number of items.
+
+    >>> balanced_masks(4).tolist()
+    [[1, 1, 0, 0], [1, 0, 1, 0], [1, 0, 0, 1], [0, 1, 1, 0], [0, 1, 0, 1], [0, 0, 1, 1]]
+    """
+    combinations = list(itertools.combinations(range(n), n // 2))
+    masks = np.zeros((len(combinations), n), dtype=np.int8)
+    rows = np.repeat(np.arange(len(combinations)), n // 2)
+    masks[rows, np.array(combinations, dtype=np.intp).reshape(-1)] = 1
+    return masks
+
+
+def allocations_of(result) -> List[Dict]:
+    """
+    Returns the allocations an algorithm returned as a list: none for [] and None, one for a dict.
+
+    :param result the result of one of the algorithms.
+    """
+    if not result:
+        return []
+    if isinstance(result, dict):
+        return [result]
+    return result
+
+
+def profile_properties(ranks: List[List[int]], masks: np.ndarray, results: Dict[str, Any]) -> Dict[str, List[bool]]:
+    """
+    Returns, for every algorithm, whether it returned an allocation and whether all of its allocations are EF, MM and
+    PO.
+
+    :param ranks a (2, n) rank array.
+    :param masks the balanced_masks() of n.
+    :param results the result of every algorithm on the rank array, by abbreviation.
+
+    >>> ranks = [[1, 2, 3, 4], [4, 2, 3, 1]]
+    >>> profile_properties(ranks, balanced_masks(4), {'TD': {0: [0, 1], 1: [3, 2]}, 'TR': []})
+    {'TD': [True, True, True, True], 'TR': [False, False, False, False]}
+    """
+    values = len(ranks[0]) + 1 - np.asarray(ranks, dtype=np.int64)
+    totals = values.sum(axis=1).tolist()
+    A_scores = masks @ values[0]
+    B_scores = totals[1] - masks @ values[1]
+    best_min = int(np.minimum(A_scores, B_scores).max())
+    properties = {}
+    for name, result in results.items():
+        allocations = allocations_of(result)
+        flags = [bool(allocations), bool(allocations), bool(allocations), bool(allocations)]
+        for allocation in allocations:
+            A_score = int(values[0][allocation[0]].sum())
+            B_score = int(values[1][allocation[1]].sum())
+            flags[1] = flags[1] and 2 * A_score >= totals[0] and 2 * B_score >= totals[1]
+            flags[2] = flags[2] and min(A_score, B_score) == best_min
+            flags[3] = flags[3] and not ((A_scores >= A_score) & (B_scores >= B_score)
+                                         & ((A_scores > A_score) | (B_scores > B_score))).any()
+        properties[name] = flags
+    return properties
+
+
+def chunk_seed(seed: int, n: int, chunk: int) -> np.random.Generator:
+    """
+    Returns the random generator of one chunk, which depends only on the seed of the run, n and the chunk's index, so
+    a chunk has the same profiles whichever worker solves it and whenever.
+
+    :param seed the seed of the run.
+    :param n the number of items.
+    :param chunk the index of the chunk.
+    """
+    return np.random.default_rng([seed, n, chunk])
+
+
+def solve_chunk(task) -> Dict:
+    """
+    Generates the profiles of one chunk, runs the algorithms on them and returns the counts of the chunk.
+
+    :param task a (parameters, n, chunk index, number of profiles) tuple, see run_experiment() for the parameters.
+
+    >>> record = solve_chunk(({'seed': 0, 'algorithms': ['TD', 'SD'], 'dispersion': None}, 4, 0, 10))
+    >>> record['n'], record['chunk'], record['profiles']
+    (4, 0, 10)
+    >>> sorted(record['counts'])
+    ['SD', 'TD']
+    """
+    parameters, n, chunk, count = task
+    rng = chunk_seed(parameters['seed'], n, chunk)
+    if parameters['dispersion'] is None:
+        profiles = uniform_profiles(count, n, seed=rng)
+    else:
+        profiles = mallows_profiles(count, n, parameters['dispersion'], seed=rng)
+    masks = balanced_masks(n)
+    counts = {name: [0] * len(PROPERTIES) for name in parameters['algorithms']}
+    for ranks in profiles.tolist():
+        results = {name: ALGORITHMS[name](ranks) for name in parameters['algorithms']}
+        for name, flags in profile_properties(ranks, masks, results).items():
+            for k, flag in enumerate(flags):
+                counts[name][k] += flag
+    return {'n': n, 'chunk': chunk, 'profiles': count, 'counts': counts}
+
+
+def run_experiment(sizes: List[int] = (4, 6, 8, 10, 12), profiles: int = 1000, chunk_size: int = 250, seed: int = 0,
+                   algorithms: List[str] = None, dispersion: float = None, jobs: int = 1,
+                   checkpoint: str = None) -> Dict:
+    """
+    Runs the algorithms on profiles random profiles for every n and returns the summed counts by n, see aggregate().
+
+    :param sizes the numbers of items, all even.
+    :param profiles the number of profiles for every n.
+    :param chunk_size the number of profiles of a chunk, the unit of work and of checkpointing.
+    :param seed the seed of the run.
+    :param algorithms the abbreviations of the algorithms, all of ALGORITHMS by default.
+    :param dispersion None for uniformly random profiles, otherwise the dispersion of Mallows profiles, see
+    mallows_profiles().
+    :param jobs the number of worker processes, 1 solves in this process.
+    :param checkpoint a JSON lines file that the counts of every finished chunk are appended to, and read from when the
+    run starts. A checkpoint of a run with other parameters raises a ValueError.
+
+    >>> totals = run_experiment(sizes=[4], profiles=20, chunk_size=10, algorithms=['TD', 'TR'])
+    >>> totals[4]['profiles'], totals[4]['counts']['TD'][0]
+    (20, 20)
+    """
+    for n in sizes:
+        if n % 2:
+            raise ValueError("the number of items must be even, got %d" % n)
+    parameters = {'seed': seed, 'algorithms': list(ALGORITHMS) if algorithms is None else list(algorithms),
+                  'dispersion': dispersion, 'profiles': profiles, 'chunk_size': chunk_size}
+    records = read_checkpoint(checkpoint, parameters) if checkpoint else []
+    done = {(record['n'], record['chunk']) for record in records}
+    tasks = [(parameters, n, chunk, min(chunk_size, profiles - start))
+             for n in sizes for chunk, start in enumerate(range(0, profiles, chunk_size)) if (n, chunk) not in done]
+    output = open(checkpoint, 'a') if checkpoint else None
+    try:
+        if output is not None and output.tell() and not ends_with_newline(checkpoint):
+            output.write('\n')
+        if output is not None and not records:
+            output.write(json.dumps({'parameters': parameters}) + '\n')
+        if jobs == 1:
+            solved = map(solve_chunk, tasks)
+            records.extend(save_records(solved, output))
+        else:
+            import multiprocessing
+            with multiprocessing.Pool(jobs) as pool:
+                solved = pool.imap_unordered(solve_chunk, tasks)
+                records.extend(save_records(solved, output))
+    finally:
+        if output is not None:
+            output.close()
+    return aggregate([record for record in records if record['n'] in sizes])
+
+
+def save_records(records, output):
+    """
+    Yields the records, appending every one to the checkpoint file first.
+
+    :param records the records of solve_chunk().
+    :param output the open checkpoint file, or None.
+    """
+    for record in records:
+        if output is not None:
+            output.write(json.dumps(record) + '\n')
+            output.flush()
+        yield record
+
+
+def ends_with_newline(path: str) -> bool:
+    """
+    Returns True if the last byte of a non empty file is a newline, False for a line cut short.
+
+    :param path the path of the file.
+    """
+    with open(path, 'rb') as file:
+        file.seek(-1, os.SEEK_END)
+        return file.read(1) == b'\n'
+
+
+def read_checkpoint(path: str, parameters: Dict) -> List[Dict]:
+    """
+    Returns the chunk records of a checkpoint file, [] if there is none. A last line cut short by an interruption is
+    ignored.
+
+    :param path the path of the checkpoint file.
+    :param parameters the parameters of the run, which must be the ones the checkpoint was written with.
+    """
+    if not os.path.exists(path):
+        return []
+    records = []
+    with open(path) as lines:
+        for line in lines:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            if 'parameters' in record:
+                if record['parameters'] != parameters:
+                    raise ValueError("the checkpoint %s was written with other parameters: %s"
+                                     % (path, record['parameters']))
+            else:
+                records.append(record)
+    return records
+
+
+def aggregate(records: List[Dict]) -> Dict:
+    """
+    Sums the records of the chunks by n: totals[n] = {'profiles': ..., 'counts': {algorithm: [returned, EF, MM, PO]}}.
+
+    :param records the records of solve_chunk().
+    """
+    totals = {}
+    for record in records:
+        total = totals.setdefault(record['n'], {'profiles': 0, 'counts': {}})
+        total['profiles'] += record['profiles']
+        for name, counts in record['counts'].items():
+            summed = total['counts'].setdefault(name, [0] * len(PROPERTIES))
+            for k, count in enumerate(counts):
+                summed[k] += count
+    return dict(sorted(totals.items()))
+
+
+def rates(totals: Dict) -> Dict:
+    """
+    Returns rates[property][algorithm][n]: for "returned" the share of the profiles, for the other properties the
+    share of the profiles where the algorithm returned an allocation.
+
+    :param totals the result of aggregate().
+
+    >>> rates({4: {'profiles': 10, 'counts': {'TR': [5, 5, 2, 5]}}})['MM']
+    {'TR': {4: 0.4}}
+    """
+    table = {name: {} for name in PROPERTIES}
+    for n, total in totals.items():
+        for algorithm, counts in total['counts'].items():
+            table['returned'].setdefault(algorithm, {})[n] = counts[0] / total['profiles']
+            for k in range(1, len(PROPERTIES)):
+                table[PROPERTIES[k]].setdefault(algorithm, {})[n] = counts[k] / counts[0] if counts[0] else float('nan')
+    return table
+
+
+def rate_tables(totals: Dict) -> str:
+    """
+    Returns one text table per property, with a row per algorithm and a column per n.
+
+    :param totals the result of aggregate().
+    """
+    lines = []
+    sizes = list(totals)
+    for name, table in rates(totals).items():
+        lines.append('%-9s' % name + ''.join('%8s' % ('n=%d' % n) for n in sizes))
+        for algorithm, by_n in table.items():
+            lines.append('%-9s' % algorithm + ''.join('%8.3f' % by_n[n] for n in sizes))
+        lines.append('')
+    return '\n'.join(lines)
+
+
+def write_csv(totals: Dict, path: str):
+    """
+    Writes the rates as CSV, one row per algorithm and n.
+
+    :param totals the result of aggregate().
+    :param path the path of the file.
+    """
+    table = rates(totals)
+    with open(path, 'w') as output:
+        output.write('algorithm,n,profiles,' + ','.join(PROPERTIES) + '\n')
+        for algorithm in table['returned']:
+            for n, total in totals.items():
+                output.write('%s,%d,%d,' % (algorithm, n, total['profiles'])
+                             + ','.join('%.6f' % table[name][algorithm][n] for name in PROPERTIES) + '\n')
+
+
+def plot_rates(totals: Dict, path: str) -> bool:
+    """
+    Draws the EF, MM and PO rates of every algorithm by n, one panel per property, and saves the chart.
+    Returns False without drawing when matplotlib is not installed.
+
+    :param totals the result of aggregate().
+    :param path the path of the image.
+    """
+    try:
+        import matplotlib
+        matplotlib.use('Agg')
+        import matplotlib.pyplot as plt
+    except ImportError:
+        return False
+    table = rates(totals)
+    sizes = list(totals)
+    figure, axes = plt.subplots(1, 3, figsize=(15, 4.5), sharey=True)
+    for axis, name in zip(axes, PROPERTIES[1:]):
+        for algorithm, by_n in table[name].items():
+            axis.plot(sizes, [by_n[n] for n in sizes], marker='o', label=algorithm)
+        axis.set_title(name)
+        axis.set_xlabel('items')
+        axis.set_xticks(sizes)
+    axes[0].set_ylabel('rate')
+    axes[-1].legend(loc='center left', bbox_to_anchor=(1, 0.5))
+    figure.tight_layout()
+    figure.savefig(path)
+    plt.close(figure)
+    return True
+
+
+def size_list(text: str) -> List[int]:
+    """
+    Parses the numbers of items: a range such as 4-12 for every even number in it, or a comma separated list.
+
+    >>> size_list('4-12'), size_list('6,10')
+    ([4, 6, 8, 10, 12], [6, 10])
+    """
+    if '-' in text:
+        low, high = text.split('-')
+        return list(range(int(low) + int(low) % 2, int(high) + 1, 2))
+    return [int(n) for n in text.split(',')]
+
+
+def main(argv: List[str] = None):
+    """
+    Parses the command line, runs the experiment and writes the tables and the chart, see the module docstring.
+
+    :param argv the command line arguments, sys.argv[1:] by default.
+    """
+    parser = argparse.ArgumentParser(description="Rates of EF, MM and PO allocations of the eleven algorithms.")
+    parser.add_argument('--sizes', type=size_list, default=[4, 6, 8, 10, 12], help="numbers of items, e.g. 4-12")
+    parser.add_argument('--profiles', type=int, default=1000, help="the number of profiles for every number of items")
+    parser.add_argument('--chunk-size', type=int, default=250, help="the number of profiles of a chunk")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--dispersion', type=float, default=None,
+                        help="draw Mallows profiles with this dispersion instead of uniform ones")
+    parser.add_argument('-j', '--jobs', type=job_count, default=1, help="the number of worker processes")
+    parser.add_argument('--checkpoint', default=None, help="a JSON lines file to resume from and append to")
+    parser.add_argument('-o', '--output', default='experiment', help="the prefix of the .txt, .csv and .png outputs")
+    args = parser.parse_args(argv)
+
+    totals = run_experiment(args.sizes, args.profiles, args.chunk_size, args.seed, dispersion=args.dispersion,
+                            jobs=args.jobs, checkpoint=args.checkpoint)
+    tables = rate_tables(totals)
+    print(tables)
+    with open(args.output + '.txt', 'w') as output:
+        output.write(tables)
+    write_csv(totals, args.output + '.csv')
+    if not plot_rates(totals, args.output + '.png'):
+        print("matplotlib is not installed, no chart was drawn")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,141 @@
+"""
+Seeded generators of two-agent rank profiles for benchmarks and stress tests of two_players_fair_division.py
+
+Every generator returns a (count, 2, n) NumPy array: profiles[k] is a rank array the algorithms accept as is, where
+profiles[k][agent][item] is the rank the agent gives the item and 1 is the most valued item.
+The same seed always gives the same profiles.
+
+programmers: Itay Hasidi & Amichai Bitan
+"""
+from typing import Iterator
+
+import numpy as np
+
+DTYPE = np.int32
+
+
+def uniform_profiles(count: int, n: int, seed=None) -> np.ndarray:
+    """
+    Returns profiles where both agents rank the items by independent uniformly random permutations.
+
+    :param count the number of profiles.
+    :param n the number of items.
+    :param seed an int or a numpy.random.Generator.
+
+    >>> profiles = uniform_profiles(3, 4, seed=0)
+    >>> profiles.shape
+    (3, 2, 4)
+    >>> sorted(profiles[2][1].tolist())
+    [1, 2, 3, 4]
+    """
+    rng = np.random.default_rng(seed)
+    return rng.permuted(np.tile(np.arange(1, n + 1, dtype=DTYPE), (count, 2, 1)), axis=2)
+
+
+def mallows_profiles(count: int, n: int, dispersion: float, seed=None) -> np.ndarray:
+    """
+    Returns profiles where the first agent's ranking is uniformly random and the second agent's ranking is drawn from
+    the Mallows model around it: a ranking at Kendall tau distance d from the first one has probability proportional to
+    dispersion ** d. With dispersion 0 both agents agree, with dispersion 1 the rankings are independent.
+    The rankings are drawn with the repeated insertion model, one item position at a time for all profiles at once.
+
+    :param count the number of profiles.
+    :param n the number of items.
+    :param dispersion a number between 0 and 1.
+    :param seed an int or a numpy.random.Generator.
+
+    >>> profiles = mallows_profiles(2, 5, 0.0, seed=1)
+    >>> bool((profiles[:, 0] == profiles[:, 1]).all())
+    True
+    """
+    rng = np.random.default_rng(seed)
+    reference = rng.permuted(np.tile(np.arange(n), (count, 1)), axis=1)
+    rows = np.arange(count)
+    order = np.empty((count, 0), dtype=np.int64)
+    for i in range(n):
+        weights = dispersion ** np.arange(i, -1, -1, dtype=float)
+        positions = rng.choice(i + 1, size=count, p=weights / weights.sum())
+        columns = np.arange(i + 1)
+        source = columns[None, :] - (columns[None, :] > positions[:, None])
+        inserted = np.empty((count, i + 1), dtype=np.int64)
+        if i:
+            inserted[:] = np.take_along_axis(order, np.minimum(source, i - 1), axis=1)
+        inserted[rows, positions] = reference[:, i]
+        order = inserted
+    profiles = np.empty((count, 2, n), dtype=DTYPE)
+    ranks = np.arange(1, n + 1, dtype=DTYPE)
+    np.put_along_axis(profiles[:, 0], reference, ranks[None, :], axis=1)
+    np.put_along_axis(profiles[:, 1], order, ranks[None, :], axis=1)
+    return profiles
+
+
+def sequential_worst_profiles(count: int, n: int, seed=None) -> np.ndarray:
+    """
+    Returns profiles on which sequential() (OS) returns 2 * 3 ** (n / 2 - 1) allocations for an even n, the most
+    possible for n up to 8 (checked over all profiles): the agents agree on the first and last items and every other
+    adjacent pair in between is swapped.
+    The items of every profile are shuffled the same way for both agents.
+
+    :param count the number of profiles.
+    :param n the number of items.
+    :param seed an int or a numpy.random.Generator.
+
+    >>> ranks = sequential_worst_profiles(1, 6, seed=0)[0]
+    >>> ranks[:, np.argsort(ranks[0])].tolist()
+    [[1, 2, 3, 4, 5, 6], [1, 3, 2, 5, 4, 6]]
+    """
+    base = np.tile(np.arange(1, n + 1, dtype=DTYPE), (2, 1))
+    for k in range(1, n - 2, 2):
+        base[1, k], base[1, k + 1] = base[1, k + 1], base[1, k]
+    return shuffled_items(base, count, seed)
+
+
+def singles_doubles_worst_profiles(count: int, n: int, seed=None) -> np.ndarray:
+    """
+    Returns profiles on which the singles-doubles family (SD, IS, S1, L1) branches at every step: both agents rank
+    the items the same, so there are no singles and the agents always share their first item, 2 ** (n / 2) leaves.
+
+    :param count the number of profiles.
+    :param n the number of items.
+    :param seed an int or a numpy.random.Generator.
+
+    >>> profiles = singles_doubles_worst_profiles(2, 4, seed=0)
+    >>> bool((profiles[:, 0] == profiles[:, 1]).all())
+    True
+    """
+    return shuffled_items(np.tile(np.arange(1, n + 1, dtype=DTYPE), (2, 1)), count, seed)
+
+
+def shuffled_items(base: np.ndarray, count: int, seed=None) -> np.ndarray:
+    """
+    Returns count copies of a rank array, each with its items (columns) in a random order.
+
+    :param base a (2, n) rank array.
+    :param count the number of copies.
+    :param seed an int or a numpy.random.Generator.
+    """
+    rng = np.random.default_rng(seed)
+    n = base.shape[1]
+    columns = rng.permuted(np.tile(np.arange(n), (count, 1)), axis=1)
+    return base[:, columns].transpose(1, 0, 2).copy()
+
+
+def profile_stream(generator, total: int, n: int, batch_size: int = 10000, seed=None, **parameters) \
+        -> Iterator[np.ndarray]:
+    """
+    Yields total profiles in batches of batch_size, drawn by one seeded random generator, so a stream can be larger
+    than memory and is still reproducible.
+
+    :param generator one of the generators of this module.
+    :param total the number of profiles.
+    :param n the number of items.
+    :param batch_size the number of profiles of every batch except maybe the last one.
+    :param seed an int or a numpy.random.Generator.
+    :param parameters more arguments of the generator, for example dispersion.
+
+    >>> [batch.shape for batch in profile_stream(mallows_profiles, 5, 4, batch_size=2, seed=0, dispersion=0.5)]
+    [(2, 2, 4), (2, 2, 4), (1, 2, 4)]
+    """
+    rng = np.random.default_rng(seed)
+    for start in range(0, total, batch_size):
+        yield generator(min(batch_size, total - start), n, seed=rng, **parameters)
@@ -0,0 +1,248 @@
+"""
+Incremental re-solving of sequential() (OS) and singles_doubles() (SD) while a profile changes by small edits
+
+A ResolveSession keeps a profile together with the memo tables of its search and takes edits: an item added, an item
+withdrawn, or the ranks of two items that an agent ranks one after the other swapped. solve() returns what
+sequential() or singles_doubles() returns for the current profile, and an edit only drops the memo entries of the
+search states it can change:
+    OS: the branches of a search state (remaining items, level) only depend on which of its items each agent ranks at
+        the level or better. Swapping the ranks r < s of two items changes that at the levels r to s - 1 of the states
+        that hold one of them, so the states of the levels from s on are kept, and adding or withdrawing an item
+        changes no state without it.
+    SD: after the singles, the branches of the remaining items and the rank sum differences the allocations below them
+        can reach only depend on the ranks of those items, and on which of them are ranked at most the number of items.
+        The singles are taken again on every solve(), and the search only enters the branches that can still end with
+        equal scores.
+
+Ranks are kept as the agents state them: withdrawing an item does not renumber the ranks of the others, just like
+sequential() given only some of the items of fairpy agents, and an added item gets the ranks the agents give it.
+
+programmers: Itay Hasidi & Amichai Bitan
+"""
+from typing import List, Any, Dict
+
+from two_players_fair_division import *
+
+# The algorithms a session re-solves.
+SESSION_ALGORITHMS = ['OS', 'SD']
+
+
+class ResolveSession:
+    """
+    A profile that changes by small edits, with the memo tables of its search, see the module docstring.
+
+    >>> session = ResolveSession([[1, 2, 3, 4], [4, 2, 3, 1]], ['computer', 'phone', 'tv', 'book'])
+    >>> session.solve()
+    [{0: ['computer', 'phone'], 1: ['book', 'tv']}, {0: ['computer', 'tv'], 1: ['book', 'phone']}]
+    >>> session.swap_ranks(0, 'phone')
+    >>> session.solve()
+    [{0: ['computer', 'tv'], 1: ['book', 'phone']}]
+    >>> session.withdraw_item('phone')
+    >>> session.add_item('radio', [2, 2])
+    >>> session.solve() == sequential(session.profile)
+    True
+    """
+
+    def __init__(self, agents, items: List[Any] = None, algorithm: str = 'OS'):
+        """
+        :param agents A list of agents or a (2, n) array of ranks, see make_profile().
+        :param items A list of all existing items (U), or the item names of a rank array.
+        :param algorithm 'OS' or 'SD'.
+        """
+        if algorithm not in SESSION_ALGORITHMS:
+            raise ValueError("a session re-solves %s, got %s" % (' and '.join(SESSION_ALGORITHMS), algorithm))
+        profile = make_profile(agents, items)
+        self.algorithm = algorithm
+        # Every item the session ever had, withdrawn items included, so item positions never change.
+        self.base = Profile(list(profile.names), list(profile.items), [list(ranks) for ranks in profile.ranks],
+                            [list(order) for order in profile.orders])
+        self.items = list(range(len(profile.items)))
+        self.positions = {item: i for i, item in enumerate(profile.items)}
+        self.branches = {}
+        self.diffs = {}
+
+    @property
+    def profile(self) -> Profile:
+        """
+        The current profile, the one a cold run of the algorithm would get.
+        """
+        position = {i: k for k, i in enumerate(self.items)}
+        return Profile(self.base.names, [self.base.items[i] for i in self.items],
+                       [[ranks[i] for i in self.items] for ranks in self.base.ranks],
+                       [[position[i] for i in order if i in position] for order in self.base.orders])
+
+    def solve(self) -> List[Dict]:
+        """
+        Returns what sequential() or singles_doubles() returns for the current profile.
+        """
+        if self.algorithm == 'OS':
+            end_allocation = []
+            self.walk_sequential(frozenset(self.items), 1, [[], []], end_allocation)
+            return end_allocation
+        items = list(self.items)
+        allocations = [[], []]
+        A_items, B_items = ranked_items(self.base, items)
+        _, items, allocations = singles(A_items, B_items, items, allocations)
+        if not items:
+            if has_equal_scores(self.base, allocations):
+                return [allocation_dict(self.base, allocations)]
+            return None
+        if len(items) % 2 == 0 and not equal_scores_exist(self.base, items, allocations):
+            return []
+        A_ranks, B_ranks = self.base.ranks
+        target = sum(B_ranks[j] for j in allocations[1]) - sum(A_ranks[i] for i in allocations[0])
+        end_allocation = []
+        items = frozenset(items)
+        if target in self.reachable(items):
+            self.walk_singles_doubles(items, target, allocations, end_allocation)
+        return end_allocation
+
+    def add_item(self, item, ranks: List[int]):
+        """
+        Adds an item, last in the order both agents state their items.
+
+        :param item the name of the item.
+        :param ranks the rank each agent gives the item.
+        """
+        if item in self.positions:
+            raise ValueError("%s is already an item" % item)
+        position = len(self.base.items)
+        self.base.items.append(item)
+        for agent_ranks, rank in zip(self.base.ranks, ranks):
+            agent_ranks.append(rank)
+        for order in self.base.orders:
+            order.append(position)
+        self.positions[item] = position
+        self.items.append(position)
+        self.recount(len(self.items) - 1)
+
+    def withdraw_item(self, item):
+        """
+        Withdraws an item, the ranks of the other items stay as they are.
+
+        :param item the name of the item.
+        """
+        if item not in self.positions:
+            raise ValueError("%s is not an item" % item)
+        position = self.positions.pop(item)
+        self.items.remove(position)
+        self.forget(lambda items, level: position in items)
+        self.recount(len(self.items) + 1)
+
+    def swap_ranks(self, agent: int, item):
+        """
+        Swaps the ranks an agent gives an item and the item it ranks right after it.
+
+        :param agent the position of the agent.
+        :param item the name of the item.
+        """
+        if item not in self.positions:
+            raise ValueError("%s is not an item" % item)
+        order = ranked_items(self.base, self.items)[agent]
+        k = order.index(self.positions[item])
+        if k + 1 == len(order):
+            raise ValueError("%s is the last item of %s" % (item, self.base.names[agent]))
+        i, j = order[k], order[k + 1]
+        ranks = self.base.ranks[agent]
+        low, high = ranks[i], ranks[j]
+        if low == high:
+            return
+        ranks[i], ranks[j] = high, low
+        if self.algorithm == 'OS':
+            self.forget(lambda items, level: level < high and (i in items or j in items))
+        else:
+            self.forget(lambda items, level: i in items or j in items)
+
+    def recount(self, count: int):
+        """
+        Drops the SD states whose branches change when the number of items was count, see singles_doubles_branches().
+
+        :param count the number of items before the edit.
+        """
+        if self.algorithm != 'SD':
+            return
+        low, high = sorted((count, len(self.items)))
+        self.forget(lambda items, level: any(low < ranks[i] <= high for ranks in self.base.ranks for i in items))
+
+    def forget(self, stale):
+        """
+        Drops the memo entries of the search states for which stale(items, level) is True. SD states have no level.
+
+        :param stale a function of the remaining items and the level of a state.
+        """
+        for table in (self.branches, self.diffs):
+            for key in list(table):
+                items, level = key if self.algorithm == 'OS' else (key, None)
+                if stale(items, level):
+                    del table[key]
+
+    def walk_sequential(self, items: frozenset, level: int, allocations: List[Any], end_allocation: List[Dict]):
+        """
+        Adds the allocations below an OS search state to end_allocation, in the order recursive_sequential() finds
+        them.
+
+        :param items the positions of the items that are not allocated yet.
+        :param level is the depth level for item searching for each iteration.
+        :param allocations is the allocation for each player so far.
+        :param end_allocation is the end allocation for each player.
+        """
+        if not items:
+            end_allocation.append(allocation_dict(self.base, allocations))
+            return
+        state = (items, level)
+        if state not in self.branches:
+            self.branches[state] = sequential_branches(self.base, list(items), level)
+        branches = self.branches[state]
+        if not branches:
+            self.walk_sequential(items, level + 1, allocations, end_allocation)
+            return
+        for i, j in branches:
+            allocations[0].append(i)
+            allocations[1].append(j)
+            self.walk_sequential(items - {i, j}, level + 1, allocations, end_allocation)
+            allocations[0].pop()
+            allocations[1].pop()
+
+    def reachable(self, items: frozenset) -> set:
+        """
+        Returns the differences between the first agent's rank sum and the second agent's rank sum that the SD
+        allocations of the remaining items can have.
+
+        :param items the positions of the items that are not allocated yet.
+        """
+        if not items:
+            return {0}
+        if items not in self.diffs:
+            A_ranks, B_ranks = self.base.ranks
+            self.branches[items] = singles_doubles_branches(self.base, list(items), len(self.items))
+            diffs = set()
+            for i, j in self.branches[items]:
+                step = A_ranks[i] - B_ranks[j]
+                diffs.update(diff + step for diff in self.reachable(items - {i, j}))
+            self.diffs[items] = diffs
+        return self.diffs[items]
+
+    def walk_singles_doubles(self, items: frozenset, target: int, allocations: List[Any],
+                             end_allocation: List[Dict]):
+        """
+        Adds the SD allocations below the remaining items whose rank sum difference is target to end_allocation, in the
+        order singles_doubles_helper() finds them.
+
+        :param items the positions of the items that are not allocated yet.
+        :param target the rank sum difference the rest of the allocation must have for equal scores.
+        :param allocations is the allocation for each player so far.
+        :param end_allocation is the end allocation for each player.
+        """
+        if not items:
+            end_allocation.append(allocation_dict(self.base, allocations))
+            return
+        A_ranks, B_ranks = self.base.ranks
+        for i, j in self.branches[items]:
+            rest = items - {i, j}
+            diff = target - (A_ranks[i] - B_ranks[j])
+            if diff in self.reachable(rest):
+                allocations[0].append(i)
+                allocations[1].append(j)
+                self.walk_singles_doubles(rest, diff, allocations, end_allocation)
+                allocations[0].pop()
+                allocations[1].pop()
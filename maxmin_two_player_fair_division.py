@@ -0,0 +1,126 @@
+"""
+Exact max-min and leximin allocations for two agents, a baseline for the heuristics of two_players_fair_division.py
+
+The README says which algorithms return max-min allocations; max_min() computes the optimum to check that against.
+An allocation's scores are what each agent gets by its own valuation: Borda scores n + 1 - rank, or the cardinal
+values of a profile made with cardinal=True, which must be whole numbers.
+
+The solver is a dynamic program over the items: cost[c][a] is the least value the second agent loses over the
+allocations of the first agent's c items worth a to it, so the second agent's best score next to every score a of the
+first agent is its total minus cost[c][a], and the max-min and leximin allocations are read off those score pairs.
+One step per item updates the whole (c, a) table with NumPy, and which entries took the item is kept as a packed
+bitset per item to rebuild the allocation. For n items with Borda scores the table has about n ** 3 / 4 entries, so
+100 items take well under a second.
+
+programmers: Itay Hasidi & Amichai Bitan
+"""
+from typing import List, Any, Dict
+
+import numpy as np
+
+from profile_two_player_fair_division import Profile, make_profile, agent_values, allocation_dict
+
+
+def max_min(agents, items: List[Any] = None, balanced: bool = True) -> Dict:
+    """
+    Returns a leximin allocation: its lower score is the highest possible (it is max-min), and among those its higher
+    score is the highest possible.
+
+    :param agents A list that represent the players(agents) and for each player his valuation for each item, plus the
+    player's name. Or a (2, n) array of ranks, see make_profile().
+    :param items A list of all existing items (U), or the item names of a rank array.
+    :param balanced True to give the first agent n // 2 items and the second one the rest, as the algorithms do, False
+    to allow any split.
+
+    >>> max_min([[1, 2, 3, 4], [4, 2, 3, 1]], ['computer', 'phone', 'tv', 'book'])
+    {0: ['computer', 'tv'], 1: ['phone', 'book']}
+    >>> max_min([[1, 2, 3, 4], [1, 2, 3, 4]])
+    {0: [1, 2], 1: [0, 3]}
+    """
+    profile = make_profile(agents, items)
+    return allocation_dict(profile, max_min_allocation(profile, balanced))
+
+
+def max_min_value(agents, items: List[Any] = None, balanced: bool = True):
+    """
+    Returns the lower score of a max-min allocation, the most the worse-off agent can get.
+
+    :param agents A list of agents or a (2, n) array of ranks, see make_profile().
+    :param items A list of all existing items (U), or the item names of a rank array.
+    :param balanced see max_min().
+
+    >>> max_min_value([[1, 2, 3, 4], [1, 2, 3, 4]])
+    5
+    """
+    profile = make_profile(agents, items)
+    A_scores, B_scores = score_frontier(profile, balanced)[:2]
+    return int(np.minimum(A_scores, B_scores).max())
+
+
+def max_min_allocation(profile: Profile, balanced: bool = True) -> List[List[int]]:
+    """
+    Returns the item positions of both agents in a leximin allocation, see max_min().
+
+    :param profile the preferences of the agents, see make_profile().
+    :param balanced see max_min().
+    """
+    A_scores, B_scores, taken = score_frontier(profile, balanced)
+    lower, higher = np.minimum(A_scores, B_scores), np.maximum(A_scores, B_scores)
+    best = np.lexsort((-higher, -lower))[0]
+    A_values = agent_values(profile)[0]
+    n = len(profile.items)
+    count, score = (n // 2 if balanced else 0), int(A_scores[best])
+    A_items = []
+    for i in range(n - 1, -1, -1):
+        if taken(i, count, score):
+            A_items.append(i)
+            count -= balanced
+            score -= A_values[i]
+    A_items.reverse()
+    B_items = [i for i in range(n) if i not in set(A_items)]
+    return [A_items, B_items]
+
+
+def score_frontier(profile: Profile, balanced: bool = True):
+    """
+    Returns (A_scores, B_scores, taken): every score the first agent can get, the best score the second agent can get
+    next to it, and taken(i, c, a), which tells whether the allocation of c items worth a to the first agent that the
+    table keeps after item i includes item i.
+
+    :param profile the preferences of the agents, see make_profile().
+    :param balanced see max_min().
+
+    >>> A_scores, B_scores, _ = score_frontier(make_profile([[1, 2, 3, 4], [4, 2, 3, 1]]))
+    >>> A_scores.tolist(), B_scores.tolist()
+    ([3, 4, 5, 6, 7], [4, 3, 5, 7, 6])
+    """
+    A_values, B_values = agent_values(profile)
+    if any(type(value) is not int or value < 0 for value in A_values + B_values):
+        raise ValueError("the exact solver needs whole, non negative values; scale cardinal values to integers")
+    n = len(A_values)
+    A_total, B_total = sum(A_values), sum(B_values)
+    counts = n // 2 + 1 if balanced else 1
+    unreachable = B_total + 1
+    cost = np.full((counts, A_total + 1), unreachable, dtype=np.int64)
+    cost[0, 0] = 0
+    bitsets = []
+    for i in range(n):
+        a, b = A_values[i], B_values[i]
+        candidate = np.full_like(cost, unreachable)
+        if balanced:
+            candidate[1:, a:] = cost[:-1, :A_total + 1 - a] + b
+        else:
+            candidate[:, a:] = cost[:, :A_total + 1 - a] + b
+        take = candidate < cost
+        np.copyto(cost, candidate, where=take)
+        bitsets.append(np.packbits(take, axis=None))
+    final = cost[-1] if balanced else cost[0]
+    A_scores = np.flatnonzero(final < unreachable)
+    B_scores = B_total - final[A_scores]
+    width = A_total + 1
+
+    def taken(i, count, score):
+        bit = count * width + score
+        return bool(bitsets[i][bit >> 3] >> (7 - (bit & 7)) & 1)
+
+    return A_scores, B_scores, taken
@@ -0,0 +1,166 @@
+"""
+Online allocation for trump() (TR), top_down() (TD) and top_down_alternating() (TA) while the items arrive one by one
+
+The agents rank all the items up front with the ranks 1 to count, but the items arrive as a stream, each with the rank
+every agent gives it. An OnlineAllocator commits the picks of the algorithm in their order, each as soon as it is
+determined by the items that arrived:
+    TD, TA: the acting agent takes its best remaining item, so the pick waits until the item of its best rank that is
+            not taken arrived.
+    TR:     the acting agent takes, among its remaining items within the level, the one the other agent ranks worst, so
+            the pick waits until all the items the agent ranks within the level arrived.
+Every agent keeps its items in a table by rank with a pointer to the first rank it has not looked at yet, and for TR a
+heap of the items within the level keyed by the other agent's ranks, as in picking_two_player_fair_division.py. Each
+item is placed in the tables once, passed by every pointer once and pushed on every heap at most once, so an arriving
+item costs O(log n). Once all the items arrived, the allocation is the one the algorithm returns for them.
+
+programmers: Itay Hasidi & Amichai Bitan
+"""
+import heapq
+from typing import List, Any, Dict, Tuple
+
+from picking_two_player_fair_division import TOP, TRUMP, pick_order
+
+# The pick order and rule of the algorithms an OnlineAllocator runs.
+ONLINE = {'TD': ('AB', TOP), 'TA': ('ABBA', TOP), 'TR': ('AB', TRUMP)}
+
+
+class OnlineAllocator:
+    """
+    Allocates items between two agents while they arrive, see the module docstring.
+
+    >>> allocator = OnlineAllocator(4, 'TD', names=['Alice', 'George'])
+    >>> allocator.add_item('phone', [2, 2])
+    []
+    >>> allocator.add_item('computer', [1, 4])
+    [('Alice', 'computer')]
+    >>> allocator.add_items([('book', [4, 1]), ('tv', [3, 3])])
+    [('George', 'book'), ('Alice', 'phone'), ('George', 'tv')]
+    >>> allocator.allocation()
+    {'Alice': ['computer', 'phone'], 'George': ['book', 'tv']}
+    """
+
+    def __init__(self, count: int, algorithm: str = 'TR', names: List[Any] = None):
+        """
+        :param count the number of items that will arrive.
+        :param algorithm 'TD', 'TA' or 'TR'.
+        :param names the names of the agents, their positions by default.
+        """
+        if algorithm not in ONLINE:
+            raise ValueError("unknown algorithm %s, expected one of %s" % (algorithm, ', '.join(ONLINE)))
+        pattern, self.rule = ONLINE[algorithm]
+        self.count = count
+        self.names = [0, 1] if names is None else list(names)
+        self.order = pick_order(pattern, 2, count - count % 2)
+        self.items = []
+        self.positions = {}
+        self.ranks = [[], []]
+        # slots[agent][rank] is the position of the item the agent gives the rank, None until it arrives.
+        self.slots = [[None] * (count + 1) for _ in range(2)]
+        self.pointers = [1, 1]
+        self.heaps = [[], []]
+        self.taken = bytearray()
+        self.bundles = [[], []]
+        self.step = 0
+        self.failed = False
+
+    @property
+    def done(self) -> bool:
+        """
+        True once every pick is committed or the trump run failed.
+        """
+        return self.failed or self.step == len(self.order)
+
+    def add_item(self, item, ranks: List[int]) -> List[Tuple[Any, Any]]:
+        """
+        Takes an arriving item and returns the (agent name, item) picks it lets the allocator commit.
+
+        :param item the name of the item.
+        :param ranks the rank every agent gives the item, from 1 (the best) to count.
+        """
+        if item in self.positions:
+            raise ValueError("%s already arrived" % item)
+        if len(self.items) == self.count:
+            raise ValueError("all the %d items already arrived" % self.count)
+        for agent in range(2):
+            rank = ranks[agent]
+            if type(rank) is not int or not 1 <= rank <= self.count or self.slots[agent][rank] is not None:
+                raise ValueError("%s: %s already has an item of rank %r, or it is not from 1 to %d"
+                                 % (item, self.names[agent], rank, self.count))
+        position = len(self.items)
+        self.items.append(item)
+        self.positions[item] = position
+        self.taken.append(0)
+        for agent in range(2):
+            self.ranks[agent].append(ranks[agent])
+            self.slots[agent][ranks[agent]] = position
+        return self.commit()
+
+    def add_items(self, arrivals: List[Tuple[Any, List[int]]]) -> List[Tuple[Any, Any]]:
+        """
+        Takes several arriving items and returns the picks they let the allocator commit, see add_item().
+
+        :param arrivals (item, ranks) pairs.
+        """
+        picks = []
+        for item, ranks in arrivals:
+            picks.extend(self.add_item(item, ranks))
+        return picks
+
+    def allocation(self) -> Dict:
+        """
+        Returns the items every agent picked so far, or [] if the trump run failed.
+        """
+        if self.failed:
+            return []
+        return {self.names[k]: [self.items[i] for i in self.bundles[k]] for k in range(2)}
+
+    def commit(self) -> List[Tuple[Any, Any]]:
+        """
+        Commits the picks that are determined, in their order, and returns them.
+        """
+        picks = []
+        while not self.done:
+            agent = self.order[self.step]
+            item = self.top_pick(agent) if self.rule == TOP else self.trump_pick(agent)
+            if item is None:
+                break
+            self.taken[item] = 1
+            self.bundles[agent].append(item)
+            self.step += 1
+            picks.append((self.names[agent], self.items[item]))
+        return picks
+
+    def top_pick(self, agent: int):
+        """
+        Returns the position of the agent's best remaining item, or None if it did not arrive yet.
+
+        :param agent the position of the agent.
+        """
+        slots, rank = self.slots[agent], self.pointers[agent]
+        while slots[rank] is not None and self.taken[slots[rank]]:
+            rank += 1
+        self.pointers[agent] = rank
+        return slots[rank]
+
+    def trump_pick(self, agent: int):
+        """
+        Returns the position of the item the agent trumps with at the current step, or None if an item within the level
+        did not arrive yet. Marks the run failed if the agent has no remaining item within the level.
+
+        :param agent the position of the agent.
+        """
+        level = min(2 * (self.step // 2) + 1, self.count)
+        slots, rank, heap = self.slots[agent], self.pointers[agent], self.heaps[agent]
+        judge = self.ranks[1 - agent]
+        while rank <= level and slots[rank] is not None:
+            heapq.heappush(heap, (-judge[slots[rank]], slots[rank]))
+            rank += 1
+        self.pointers[agent] = rank
+        if rank <= level:
+            return None
+        while heap and self.taken[heap[0][1]]:
+            heapq.heappop(heap)
+        if not heap:
+            self.failed = True
+            return None
+        return heapq.heappop(heap)[1]
@@ -0,0 +1,108 @@
+"""
+Fast feasibility tests that let the searches of two_players_fair_division.py stop before they start
+
+envy_free_exists() decides whether two agents with strict rankings can split the items envy-free in the ordinal sense:
+every agent's k-th best item beats the other agent's k-th best item by its own ranking, for every k. Such an allocation
+exists exactly when, for every odd k below the number of items, the agents' top k items are not the same set (both
+would need more than half of them), which one scan of the two rankings decides in linear time. trump() finds such an
+allocation exactly when one exists, so it returns [] at once when there is none. With tied ranks the oracle does not
+decide it, so trump() only asks it when strict_ranks() holds.
+
+equal_scores_exist() decides whether the items left can be split so that the agents' rank sums are equal, the test
+singles_doubles() and iterated_singles_doubles() apply to every allocation they find, so they return [] at once when
+no allocation passes it. It is a subset sum over the items with a given number of items, done with int bitsets.
+
+programmers: Itay Hasidi & Amichai Bitan
+"""
+from typing import List, Any
+
+from profile_two_player_fair_division import Profile, make_profile
+from picking_two_player_fair_division import rank_order
+
+
+def envy_free_exists(agents, items: List[Any] = None) -> bool:
+    """
+    Returns True if the agents can split the items envy-free, see the module docstring.
+
+    :param agents A list of agents or a (2, n) array of ranks, see make_profile().
+    :param items A list of all existing items (U), or the item names of a rank array.
+
+    >>> envy_free_exists([[1, 2, 3, 4], [4, 2, 3, 1]])
+    True
+    >>> envy_free_exists([[1, 3, 2, 4], [1, 2, 3, 4]])
+    False
+    >>> envy_free_exists([[1, 2, 3, 4, 5, 6], [2, 1, 3, 5, 4, 6]])
+    False
+    """
+    profile = make_profile(agents, items)
+    return envy_free_items_exist(profile, list(range(len(profile.items))))
+
+
+def envy_free_items_exist(profile: Profile, items: List[int], ranked: List[List[int]] = None) -> bool:
+    """
+    Works like envy_free_exists() on item positions.
+
+    :param profile the preferences of the agents, see make_profile().
+    :param items the positions of the items to split.
+    :param ranked the items of both agents sorted by rank_order(), computed here if not given.
+    """
+    if ranked is None:
+        ranked = [rank_order(profile.ranks[0], items), rank_order(profile.ranks[1], items)]
+    A_order, B_order = ranked
+    A_seen, B_seen = set(), set()
+    common = 0
+    for k in range(len(items) - 1):
+        a, b = A_order[k], B_order[k]
+        common += (a in B_seen) + (b in A_seen) + (a == b)
+        A_seen.add(a)
+        B_seen.add(b)
+        if k % 2 == 0 and common == k + 1:
+            return False
+    return True
+
+
+def strict_ranks(profile: Profile, items: List[int]) -> bool:
+    """
+    Returns True if no agent gives two of the items the same rank, the rankings envy_free_items_exist() decides.
+
+    :param profile the preferences of the agents, see make_profile().
+    :param items the positions of the items.
+
+    >>> profile = make_profile([[1, 1, 2, 4], [1, 4, 3, 2]])
+    >>> strict_ranks(profile, [0, 1, 2, 3]), strict_ranks(profile, [1, 2, 3])
+    (False, True)
+    """
+    return all(len({ranks[i] for i in items}) == len(items) for ranks in profile.ranks)
+
+
+def equal_scores_exist(profile: Profile, items: List[int], allocations: List[Any]) -> bool:
+    """
+    Returns True if the items can be split in half so that, together with the allocations so far, both agents give
+    their own items the same total rank (see has_equal_scores()).
+    The first agent's half S must satisfy sum over S of (A rank + B rank) = B's total so far + B's ranks of all the
+    items - A's total so far, so the sums of every number of items are kept as the bits of an int.
+
+    :param profile the preferences of the agents, see make_profile().
+    :param items the positions of the items that are not allocated yet.
+    :param allocations the item positions each agent has so far.
+
+    >>> profile = make_profile([[1, 2, 3, 4, 5, 6], [1, 2, 3, 4, 5, 6]])
+    >>> equal_scores_exist(profile, [0, 1, 2, 3, 4, 5], [[], []])
+    False
+    >>> equal_scores_exist(make_profile([[1, 2, 3, 4], [1, 2, 3, 4]]), [0, 1, 2, 3], [[], []])
+    True
+    """
+    if len(items) % 2:
+        return False
+    A_ranks, B_ranks = profile.ranks[0], profile.ranks[1]
+    target = sum(B_ranks[i] for i in allocations[1]) + sum(B_ranks[i] for i in items) \
+        - sum(A_ranks[i] for i in allocations[0])
+    if target < 0:
+        return False
+    half = len(items) // 2
+    sums = [1] + [0] * half
+    for i in items:
+        weight = A_ranks[i] + B_ranks[i]
+        for count in range(half, 0, -1):
+            sums[count] |= sums[count - 1] << weight
+    return bool(sums[half] >> target & 1)
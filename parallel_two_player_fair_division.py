@@ -0,0 +1,141 @@
+"""
+Parallel search for one large instance of the branching algorithms of two_players_fair_division.py
+
+The top of the search tree is expanded in this process until it has enough independent subtrees (the frontier), the
+subtrees are searched by a process pool and their results are joined in the order the serial algorithm visits them,
+so parallel_search() returns exactly what the serial algorithm returns.
+Subtrees are handed out one at a time, the largest first when their size is known (OS and RS, where
+count_allocations_helper() counts them cheaply), so a worker that finishes a small subtree takes the next one while
+the large ones are still running.
+
+programmers: Itay Hasidi & Amichai Bitan
+"""
+import os
+from typing import List, Any, Dict
+
+from two_players_fair_division import *
+
+
+def parallel_search(agents, items: List[Any] = None, algorithm: str = 'OS', jobs: int = None,
+                    frontier: int = None) -> List[Dict]:
+    """
+    Runs OS, RS, SD, IS, S1 or L1 on one instance with several processes and returns the same list as the serial
+    algorithm.
+
+    :param agents A list that represent the players(agents) and for each player his valuation for each item, plus the
+    player's name. Or a (2, n) array of ranks, see make_profile().
+    :param items A list of all existing items (U), or the item names of a rank array.
+    :param algorithm the abbreviation of the algorithm: OS, RS, SD, IS, S1 or L1.
+    :param jobs the number of worker processes, os.cpu_count() by default. With 1 the subtrees are searched in this
+    process.
+    :param frontier the number of subtrees to split the search into, 8 per worker by default.
+
+    >>> ranks = [[1, 2, 3, 4, 5, 6, 7, 8], [3, 4, 5, 6, 7, 8, 1, 2]]
+    >>> parallel_search(ranks, algorithm='OS', jobs=1, frontier=4) == sequential(ranks)
+    True
+    >>> parallel_search(ranks, algorithm='S1', jobs=1, frontier=4) == s1(ranks)
+    True
+    """
+    profile = make_profile(agents, items)
+    if jobs is None:
+        jobs = os.cpu_count() or 1
+    if frontier is None:
+        frontier = 8 * jobs
+    items = list(range(len(profile.items)))
+    allocations = [[], []]
+    if algorithm in SINGLES:
+        A_items, B_items = ranked_items(profile, items)
+        flag = True
+        while flag:
+            flag, items, allocations = singles(A_items, B_items, items, allocations)
+            flag = flag and algorithm in ('IS', 'L1')
+        if not items:
+            return ALGORITHMS[algorithm](profile)
+    nodes = expand_frontier(profile, algorithm, [(items, allocations, 1)], frontier)
+    tasks = [(profile, algorithm, node) for node in nodes]
+    order = list(range(len(tasks)))
+    if algorithm in COUNTED:
+        memo = {}
+        branches_function = COUNTED[algorithm]
+        sizes = [count_allocations_helper(profile, node[0], branches_function, node[2], memo) for node in nodes]
+        order.sort(key=lambda k: -sizes[k])
+    results = [None] * len(tasks)
+    if jobs == 1:
+        for k in order:
+            results[k] = search_subtree(tasks[k])
+    else:
+        import multiprocessing
+        with multiprocessing.Pool(jobs) as pool:
+            indexed = pool.imap_unordered(search_indexed_subtree, [(k, tasks[k]) for k in order], chunksize=1)
+            for k, result in indexed:
+                results[k] = result
+    end_allocation = []
+    for result in results:
+        end_allocation.extend(result)
+    return end_allocation
+
+
+# The branches of the algorithms whose subtree sizes count_allocations_helper() can count.
+COUNTED = {'OS': sequential_branches, 'RS': restricted_simple_branches}
+
+# The algorithms that allocate the singles first, with the helper that searches below the root.
+SINGLES = {'SD': singles_doubles_helper, 'IS': iterated_singles_doubles_helper, 'S1': s1_helper, 'L1': s1_helper}
+
+
+def expand_frontier(profile: Profile, algorithm: str, nodes: List[Any], frontier: int):
+    """
+    Replaces search states by their children until there are at least frontier of them or no state can be expanded.
+    A state is an (items, allocations, level) tuple and the list stays in the order the serial search visits it.
+
+    :param profile the preferences of the agents, see make_profile().
+    :param algorithm the abbreviation of the algorithm: OS, RS, SD, IS, S1 or L1.
+    :param nodes the search states to expand.
+    :param frontier the number of states to stop at.
+
+    >>> profile = make_profile([[1, 2, 3, 4], [4, 2, 3, 1]])
+    >>> expand_frontier(profile, 'OS', [([0, 1, 2, 3], [[], []], 1)], 2)
+    [([], [[0, 1], [3, 2]], 4), ([], [[0, 2], [3, 1]], 4)]
+    """
+    for _ in range(2 * len(profile.items) + 1):
+        if len(nodes) >= frontier or all(not items for items, _, _ in nodes):
+            break
+        expanded = []
+        for items, allocations, level in nodes:
+            if not items:
+                expanded.append((items, allocations, level))
+                continue
+            if algorithm in COUNTED:
+                branches = COUNTED[algorithm](profile, items, level)
+            else:
+                branches = singles_doubles_branches(profile, items)
+            if not branches:
+                expanded.append((items, allocations, level + 1))
+            for i, j in branches:
+                _items = [item for item in items if item != i and item != j]
+                expanded.append((_items, [allocations[0] + [i], allocations[1] + [j]], level + 1))
+        nodes = expanded
+    return nodes
+
+
+def search_subtree(task) -> List[Dict]:
+    """
+    Returns the allocations the serial algorithm finds below one search state.
+
+    :param task a (profile, algorithm, (items, allocations, level)) tuple.
+    """
+    profile, algorithm, (items, allocations, level) = task
+    if algorithm == 'OS':
+        return recursive_sequential(profile, items, allocations, end_allocation=[], level=level)
+    if algorithm == 'RS':
+        return recursive_restricted_simple(profile, items, allocations, end_allocation=[], level=level)
+    return SINGLES[algorithm](profile, items, allocations, end_allocation=[], do_single=False) or []
+
+
+def search_indexed_subtree(indexed_task):
+    """
+    Runs search_subtree() in a worker and returns its result with the index of the subtree.
+
+    :param indexed_task an (index, task) pair.
+    """
+    k, task = indexed_task
+    return k, search_subtree(task)
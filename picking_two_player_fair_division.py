@@ -0,0 +1,215 @@
+"""
+Picking-sequence engine for the top down, bottom up and trump families of two_players_fair_division.py
+
+The agents act in a pick order, for example ABAB (top_down()), ABBA (top_down_alternating()) or round robin with any
+number of agents, and at every step the acting agent:
+    top:    takes the remaining item it ranks best.
+    bottom: gives the remaining item it ranks worst to the next agent (the other one when there are two).
+    trump:  takes, among the remaining items it ranks within the current level, the one the next agent ranks worst.
+            The level starts at 1 and grows by the number of agents every round, and the run fails when an agent has
+            no such item.
+Taken items are marked in a mask. For top and bottom, every agent walks its items in rank order with one pointer from
+the front or from the back, which only moves forward, so a run is linear in the number of items. For trump, every agent
+keeps a heap of the items it ranks within the level, keyed by the next agent's ranks, so a run takes O(m log m).
+
+programmers: Itay Hasidi & Amichai Bitan
+"""
+import heapq
+from typing import List, Any, Dict
+
+from profile_two_player_fair_division import Profile, make_profile, allocation_dict
+
+TOP = 'top'
+BOTTOM = 'bottom'
+TRUMP = 'trump'
+
+
+def picking_sequence(agents, order='round-robin', rule: str = TOP, items: List[Any] = None,
+                     picks: int = None) -> Dict:
+    """
+    Runs a picking sequence with any number of agents and returns the allocation, or [] if a trump run fails.
+
+    :param agents A list of agents, or a (k, n) array of ranks where 1 is the most valued item, see make_profile().
+    :param order the pick order, see pick_order().
+    :param rule TOP, BOTTOM or TRUMP.
+    :param items A list of all existing items, or the item names of a rank array.
+    :param picks the number of steps, by default the most that gives every agent the same number of items.
+
+    >>> ranks = [[1, 2, 3, 4, 5, 6], [2, 1, 4, 3, 6, 5], [6, 5, 4, 3, 2, 1]]
+    >>> picking_sequence(ranks, 'round-robin')
+    {0: [0, 2], 1: [1, 3], 2: [5, 4]}
+    >>> picking_sequence(ranks, 'ABCCBA', rule=BOTTOM)
+    {0: [0, 1], 1: [5, 3], 2: [4, 2]}
+    """
+    profile = make_profile(agents, items)
+    positions = list(range(len(profile.items)))
+    if picks is None:
+        picks = len(positions) - len(positions) % len(profile.ranks)
+    bundles = pick_items(profile, positions, pick_order(order, len(profile.ranks), picks), rule)
+    if bundles is None:
+        return []
+    return allocation_dict(profile, bundles)
+
+
+def pick_order(spec, agents: int, picks: int) -> List[int]:
+    """
+    Returns the acting agent of every step.
+
+    :param spec 'round-robin' (ABCABC...), 'balanced' (ABCCBA...), a string of agent letters such as 'ABBA' or a list of
+    agent positions. The pattern repeats until there are enough steps.
+    :param agents the number of agents.
+    :param picks the number of steps.
+
+    >>> pick_order('round-robin', 3, 7)
+    [0, 1, 2, 0, 1, 2, 0]
+    >>> pick_order('balanced', 3, 7)
+    [0, 1, 2, 2, 1, 0, 0]
+    >>> pick_order('ABBA', 2, 6)
+    [0, 1, 1, 0, 0, 1]
+    """
+    if spec == 'round-robin':
+        pattern = list(range(agents))
+    elif spec == 'balanced':
+        pattern = list(range(agents)) + list(range(agents - 1, -1, -1))
+    elif isinstance(spec, str):
+        pattern = [ord(letter) - ord('A') for letter in spec.upper()]
+    else:
+        pattern = list(spec)
+    if not pattern or any(not 0 <= agent < agents for agent in pattern):
+        raise ValueError("the pick order %r does not fit %d agents" % (spec, agents))
+    return [pattern[step % len(pattern)] for step in range(picks)]
+
+
+def pick_items(profile: Profile, items: List[int], order: List[int], rule: str = TOP, ranked: List[List[int]] = None):
+    """
+    Runs the steps of a pick order over item positions and returns the positions each agent gets, or None if a trump
+    run fails. Stops early when no item is left.
+    Ties are broken as the two-agent algorithms break them: top_down() prefers the earlier item in the list, bottom_up()
+    the later one and trump() the earlier item in the order the agent states its items.
+
+    :param profile the preferences of the agents, see make_profile().
+    :param items the positions of the items to allocate.
+    :param order the acting agent of every step, see pick_order().
+    :param rule TOP, BOTTOM or TRUMP.
+    :param ranked the items of every agent sorted by rank_order(), for TRUMP the positions in the order the agent states
+    its items sorted by rank_order(). Computed here if not given, so several runs on the same items can share them.
+
+    >>> profile = make_profile([[1, 2, 3, 4], [4, 2, 3, 1]])
+    >>> pick_items(profile, [0, 1, 2, 3], [0, 1, 0, 1], TOP)
+    [[0, 1], [3, 2]]
+    >>> pick_items(profile, [0, 1, 2, 3], [0, 1, 0, 1], BOTTOM)
+    [[0, 1], [3, 2]]
+    >>> pick_items(profile, [0, 1, 2, 3], [0, 1, 0, 1], TRUMP)
+    [[0, 2], [3, 1]]
+    >>> print(pick_items(make_profile([[1, 3, 2, 4], [1, 2, 3, 4]]), [0, 1, 2, 3], [0, 1, 0, 1], TRUMP))
+    None
+    """
+    if rule not in (TOP, BOTTOM, TRUMP):
+        raise ValueError("unknown rule %r, expected one of %s, %s, %s" % (rule, TOP, BOTTOM, TRUMP))
+    k = len(profile.ranks)
+    taken = bytearray(b'\x01') * len(profile.items)
+    for i in items:
+        taken[i] = 0
+    left = len(items)
+    bundles = [[] for _ in range(k)]
+    if rule == TRUMP:
+        return trump_items(profile, order, taken, left, bundles, ranked)
+    ranked = [None] * k if ranked is None else list(ranked)
+    pointers = [None] * k
+    for agent in order:
+        if not left:
+            break
+        agent_ranked = ranked[agent]
+        if agent_ranked is None:
+            agent_ranked = ranked[agent] = rank_order(profile.ranks[agent], items)
+        if pointers[agent] is None:
+            pointers[agent] = 0 if rule == TOP else len(agent_ranked) - 1
+        p = pointers[agent]
+        if rule == TOP:
+            while taken[agent_ranked[p]]:
+                p += 1
+            pointers[agent] = p + 1
+            receiver = agent
+        else:
+            while taken[agent_ranked[p]]:
+                p -= 1
+            pointers[agent] = p - 1
+            receiver = (agent + 1) % k
+        item = agent_ranked[p]
+        taken[item] = 1
+        left -= 1
+        bundles[receiver].append(item)
+    return bundles
+
+
+def trump_items(profile: Profile, order: List[int], taken: bytearray, left: int, bundles: List[List[int]],
+                ranked: List[List[int]] = None):
+    """
+    Runs the steps of a trump pick order, see pick_items().
+
+    :param profile the preferences of the agents, see make_profile().
+    :param order the acting agent of every step, see pick_order().
+    :param taken taken[i] is 1 if the item at position i is not to be allocated.
+    :param left the number of items to allocate.
+    :param bundles the item positions each agent has, which are extended.
+    :param ranked the positions in the order every agent states its items, sorted by rank_order(). Computed here if not
+    given.
+    """
+    k = len(profile.ranks)
+    if ranked is None:
+        ranked = [rank_order(profile.ranks[agent], profile.orders[agent]) for agent in range(k)]
+    candidates = [[i for i in ranked[agent] if not taken[i]] for agent in range(k)]
+    # A heap entry is the int (-judge rank * m + place in the agent's order) * m + position, so the heap compares
+    # plain ints. Ranks that are not ints fall back to tuples.
+    m = len(profile.items) + 1
+    scan = [[0] * m for _ in range(k)]
+    for agent_scan, agent_order in zip(scan, profile.orders):
+        for idx, i in enumerate(agent_order):
+            agent_scan[i] = idx
+    packed = all(type(rank) is int for ranks in profile.ranks for rank in ranks)
+    pointers = [0] * k
+    heaps = [[] for _ in range(k)]
+    for step, agent in enumerate(order):
+        if not left:
+            break
+        level = k * (step // k) + 1
+        judge = profile.ranks[(agent + 1) % k]
+        own, agent_candidates, heap, agent_scan = profile.ranks[agent], candidates[agent], heaps[agent], scan[agent]
+        p = pointers[agent]
+        while p < len(agent_candidates) and own[agent_candidates[p]] <= level:
+            i = agent_candidates[p]
+            heapq.heappush(heap, (-judge[i] * m + agent_scan[i]) * m + i if packed else (-judge[i], agent_scan[i], i))
+            p += 1
+        pointers[agent] = p
+        while heap and taken[heap[0] % m if packed else heap[0][2]]:
+            heapq.heappop(heap)
+        if not heap:
+            return None
+        item = heapq.heappop(heap) % m if packed else heapq.heappop(heap)[2]
+        taken[item] = 1
+        left -= 1
+        bundles[agent].append(item)
+    return bundles
+
+
+def rank_order(ranks: List[int], items: List[int]) -> List[int]:
+    """
+    Returns the items sorted by their ranks, the most valued first and equal ranks in the order of the list.
+    Ranks that are whole numbers up to the number of ranked items are sorted by counting, in linear time.
+
+    :param ranks ranks[i] is the rank of the item at position i.
+    :param items the positions of the items to sort.
+
+    >>> rank_order([3, 1, 4, 2], [0, 1, 2, 3])
+    [1, 3, 0, 2]
+    >>> rank_order([2, 1, 2], [2, 1, 0])
+    [1, 2, 0]
+    """
+    n = len(ranks)
+    buckets = [[] for _ in range(n + 1)]
+    for i in items:
+        rank = ranks[i]
+        if type(rank) is not int or not 1 <= rank <= n:
+            return sorted(items, key=ranks.__getitem__)
+        buckets[rank].append(i)
+    return [i for bucket in buckets for i in bucket]
@@ -0,0 +1,271 @@
+"""
+Preference profiles for two_player_fair_division.py
+
+A profile holds the ranks of both agents as plain lists indexed by item position, so the algorithms never have to call
+agent.value() or agent.all_items() while they run.
+The algorithms accept a (2, n) rank array (a NumPy array or any pair of sequences, where 1 is the most valued item),
+and agents with value(), all_items() and name() such as fairpy.agents.AdditiveAgent, which make_profile() adapts.
+With cardinal=True the values are utilities, the higher the better: the ranks the algorithms run on are derived from
+them once, and the values are kept for evaluating allocations with bundle_values(), is_envy_free() and min_value().
+
+programmers: Itay Hasidi & Amichai Bitan
+"""
+from typing import List, Any, Dict, NamedTuple
+
+
+class Profile(NamedTuple):
+    """
+    The preferences of the agents over the items.
+
+    names: the name of each agent, used as the keys of the returned allocations.
+    items: the item names, the algorithms work on their positions in this list.
+    ranks: ranks[agent][item] is the rank the agent gives the item at that position, 1 is the most valued item.
+    orders: orders[agent] lists the item positions in the order the agent states its items. For a rank array this is
+    the order of the columns, for an agent it is the order of agent.all_items().
+    values: values[agent][item] is the cardinal utility the agent gives the item at that position, None if the profile
+    only has ranks.
+    """
+    names: List[Any]
+    items: List[Any]
+    ranks: List[List[int]]
+    orders: List[List[int]]
+    values: List[List[Any]] = None
+
+
+def make_profile(agents, items: List[Any] = None, names: List[Any] = None, cardinal: bool = False) -> Profile:
+    """
+    Builds a Profile from agents or from a rank array.
+
+    :param agents A list of agents with value(), all_items() and name(), a (2, n) array or pair of sequences of ranks,
+    or a Profile, which is returned as is.
+    :param items For agents, the items to divide (all of the first agent's items by default). For a rank array, the
+    names of the items (their positions by default).
+    :param names the names of the agents of a rank array (their positions by default).
+    :param cardinal True if the values of the agents or of the array are utilities (the higher the better) and not
+    ranks, see ranks_from_values().
+
+    >>> make_profile([[1, 2, 3, 4], [4, 2, 3, 1]], ['computer', 'phone', 'tv', 'book'], names=['Alice', 'George'])
+    Profile(names=['Alice', 'George'], items=['computer', 'phone', 'tv', 'book'], ranks=[[1, 2, 3, 4], [4, 2, 3, 1]], orders=[[0, 1, 2, 3], [0, 1, 2, 3]], values=None)
+    >>> make_profile(([2, 1], [1, 2]))
+    Profile(names=[0, 1], items=[0, 1], ranks=[[2, 1], [1, 2]], orders=[[0, 1], [0, 1]], values=None)
+    >>> make_profile([[0.5, 7.25, 7.25], [3, 2, 1]], cardinal=True)
+    Profile(names=[0, 1], items=[0, 1, 2], ranks=[[3, 1, 2], [1, 2, 3]], orders=[[0, 1, 2], [0, 1, 2]], values=[[0.5, 7.25, 7.25], [3, 2, 1]])
+    """
+    if isinstance(agents, Profile):
+        return agents
+    values = None
+    if cardinal and hasattr(agents, 'argsort'):
+        values = agents.tolist()
+        agents = ranks_from_values(agents)
+    if hasattr(agents, 'tolist'):
+        agents = agents.tolist()
+    if hasattr(agents[0], 'all_items'):
+        if items is None:
+            items = agents[0].all_items()
+        items = list(items)
+        position = {item: i for i, item in enumerate(items)}
+        ranks = [[agent.value(item) for item in items] for agent in agents]
+        if cardinal:
+            values, ranks = ranks, ranks_from_values(ranks)
+        orders = [[position[item] for item in agent.all_items() if item in position] for agent in agents]
+        return Profile([agent.name() for agent in agents], items, ranks, orders, values)
+    if cardinal and values is None:
+        values = [list(row) for row in agents]
+        agents = ranks_from_values(values)
+    ranks = [list(row) for row in agents]
+    n = len(ranks[0])
+    if any(len(row) != n for row in ranks):
+        raise ValueError("all agents must rank the same number of items")
+    items = list(range(n)) if items is None else list(items)
+    if len(items) != n:
+        raise ValueError("expected %d item names, got %d" % (n, len(items)))
+    names = list(range(len(ranks))) if names is None else list(names)
+    return Profile(names, items, ranks, [list(range(n)) for _ in ranks], values)
+
+
+def ranks_from_values(values):
+    """
+    Returns the ranks of cardinal values, 1 for the item an agent values most. Items an agent values the same get
+    consecutive ranks in the order of their positions, so ties are always broken the same way.
+    A NumPy array is ranked with two stable argsorts over all agents at once.
+
+    :param values values[agent][item] is the utility the agent gives the item at that position.
+
+    >>> ranks_from_values([[10, 30, 20, 30], [0.1, 0.2, 0.3, 0.4]])
+    [[4, 1, 3, 2], [4, 3, 2, 1]]
+    """
+    if hasattr(values, 'argsort'):
+        order = (-values.astype(float)).argsort(axis=-1, kind='stable')
+        return order.argsort(axis=-1, kind='stable') + 1
+    ranks = []
+    for row in values:
+        agent_ranks = [0] * len(row)
+        for rank, i in enumerate(sorted(range(len(row)), key=lambda i: -row[i]), 1):
+            agent_ranks[i] = rank
+        ranks.append(agent_ranks)
+    return ranks
+
+
+def allocation_dict(profile: Profile, allocations: List[Any]) -> Dict:
+    """
+    Returns the allocation of item positions as a dict from the agent's name to its item names.
+
+    :param profile the preferences of the agents.
+    :param allocations the item positions each agent gets.
+
+    >>> allocation_dict(make_profile([[1, 2], [2, 1]], ['tv', 'book'], names=['Alice', 'George']), [[0], [1]])
+    {'Alice': ['tv'], 'George': ['book']}
+    """
+    return {profile.names[k]: [profile.items[i] for i in allocations[k]] for k in range(len(allocations))}
+
+
+def desired_items(profile: Profile, items: List[int], level: int):
+    """
+    Returns the items each agent ranks at level or better, in the order the agent states them.
+    Works like H_M_l() on item positions.
+
+    :param profile the preferences of the agents.
+    :param items the positions of the items that are not allocated yet.
+    :param level is the depth level for item searching for each iteration.
+
+    >>> profile = make_profile([[1, 2, 3, 4], [4, 2, 3, 1]])
+    >>> desired_items(profile, [0, 1, 2, 3], 2)
+    [[0, 1], [1, 3]]
+    >>> desired_items(profile, [1, 2], 2)
+    [[1], [1]]
+    """
+    remaining = set(items)
+    return [[i for i in order if ranks[i] <= level and i in remaining]
+            for ranks, order in zip(profile.ranks, profile.orders)]
+
+
+def ranked_items(profile: Profile, items: List[int]):
+    """
+    Returns the items sorted by the rank each agent gives them, the most valued item first.
+    Works like sorted_valuations() and get_valuation_list() on item positions.
+
+    :param profile the preferences of the agents.
+    :param items the positions of the items to sort.
+
+    >>> ranked_items(make_profile([[1, 2, 3, 4], [4, 2, 3, 1]]), [0, 1, 2, 3])
+    [[0, 1, 2, 3], [3, 1, 2, 0]]
+    """
+    return [sorted(items, key=ranks.__getitem__) for ranks in profile.ranks]
+
+
+def least_valued_item(profile: Profile, agent: int, items: List[int]):
+    """
+    Returns the item the agent values least in the given list, the first one if there are several.
+    Works like find_last_item() on item positions.
+
+    :param profile the preferences of the agents.
+    :param agent the position of the agent.
+    :param items the positions of the items that are being checked.
+
+    >>> least_valued_item(make_profile([[1, 2, 3, 4], [4, 2, 3, 1]]), 1, [1, 2, 3])
+    2
+    """
+    ranks = profile.ranks[agent]
+    max_score = -1
+    max_item = None
+    for item in items:
+        if max_score < ranks[item]:
+            max_score = ranks[item]
+            max_item = item
+    return max_item
+
+
+def has_equal_scores(profile: Profile, allocations: List[Any]):
+    """
+    Returns True if both agents give their own items the same total rank.
+    Works like is_envy_free_partial_allocation() on item positions.
+
+    :param profile the preferences of the agents.
+    :param allocations the item positions each agent gets.
+
+    >>> has_equal_scores(make_profile([[1, 2, 3, 4], [4, 3, 2, 1]]), [[0, 1], [3, 2]])
+    True
+    >>> has_equal_scores(make_profile([[1, 2, 3, 4], [4, 2, 3, 1]]), [[0, 1], [3, 2]])
+    False
+    """
+    A_ranks, B_ranks = profile.ranks[0], profile.ranks[1]
+    A_sum = 0
+    B_sum = 0
+    for idx in range(len(allocations[0])):
+        A_sum += A_ranks[allocations[0][idx]]
+        B_sum += B_ranks[allocations[1][idx]]
+    return A_sum == B_sum
+
+
+def allocation_positions(profile: Profile, allocation: Dict) -> List[List[int]]:
+    """
+    Returns the item positions each agent gets in an allocation returned by the algorithms.
+    Works like the inverse of allocation_dict().
+
+    :param profile the preferences of the agents.
+    :param allocation a dict from the agent's name to its item names.
+
+    >>> allocation_positions(make_profile([[1, 2], [2, 1]], ['tv', 'book'], names=['Alice', 'George']),
+    ...                      {'Alice': ['tv'], 'George': ['book']})
+    [[0], [1]]
+    """
+    position = {item: i for i, item in enumerate(profile.items)}
+    return [[position[item] for item in allocation[name]] for name in profile.names]
+
+
+def agent_values(profile: Profile) -> List[List[Any]]:
+    """
+    Returns the cardinal values of the profile, or the Borda scores n + 1 - rank of a profile that only has ranks.
+
+    :param profile the preferences of the agents.
+
+    >>> agent_values(make_profile([[1, 2, 3], [3, 1, 2]]))
+    [[3, 2, 1], [1, 3, 2]]
+    """
+    if profile.values is not None:
+        return profile.values
+    n = len(profile.items)
+    return [[n + 1 - rank for rank in ranks] for ranks in profile.ranks]
+
+
+def bundle_values(profile: Profile, allocations: List[Any]) -> List[List[Any]]:
+    """
+    Returns the value every agent gives every bundle: bundle_values(...)[k][j] is what agent k thinks agent j got.
+
+    :param profile the preferences of the agents, with the values of agent_values().
+    :param allocations the item positions each agent gets.
+
+    >>> bundle_values(make_profile([[5, 1, 1.5, 0], [0, 2, 2, 4]], cardinal=True), [[0, 1], [2, 3]])
+    [[6, 1.5], [2, 6]]
+    """
+    values = agent_values(profile)
+    return [[sum(agent_values[i] for i in bundle) for bundle in allocations] for agent_values in values]
+
+
+def is_envy_free(profile: Profile, allocations: List[Any]) -> bool:
+    """
+    Returns True if no agent values another agent's bundle more than its own.
+
+    :param profile the preferences of the agents, with the values of agent_values().
+    :param allocations the item positions each agent gets.
+
+    >>> profile = make_profile([[5, 1, 1.5, 0], [0, 2, 2, 4]], cardinal=True)
+    >>> is_envy_free(profile, [[0, 1], [2, 3]]), is_envy_free(profile, [[2, 3], [0, 1]])
+    (True, False)
+    """
+    matrix = bundle_values(profile, allocations)
+    return all(matrix[k][k] >= value for k in range(len(matrix)) for value in matrix[k])
+
+
+def min_value(profile: Profile, allocations: List[Any]):
+    """
+    Returns the value of the worst-off agent for its own bundle, which max-min allocations maximize.
+
+    :param profile the preferences of the agents, with the values of agent_values().
+    :param allocations the item positions each agent gets.
+
+    >>> min_value(make_profile([[5, 1, 1.5, 0], [0, 2, 2, 4]], cardinal=True), [[0, 2], [1, 3]])
+    6
+    """
+    matrix = bundle_values(profile, allocations)
+    return min(matrix[k][k] for k in range(len(matrix)))
@@ -0,0 +1,174 @@
+"""
+Opt-in profiling of the algorithms of two_players_fair_division.py
+
+While profiled() is active, the functions the algorithms call (the recursive helpers, desired_items(), allocate(),
+singles(), allocation_dict() and the others in FUNCTIONS) are replaced by timed wrappers that record how often each
+one is called, its cumulative time and the time spent in every call stack:
+
+    with profiled() as profiler:
+        singles_doubles(ranks)
+    print(profiler.summary())
+    profiler.write_collapsed('sd.folded')    # flamegraph.pl sd.folded > sd.svg
+
+Only the functions in FUNCTIONS are timed, so the overhead is two perf_counter() calls and a lock per call of one of
+them and nothing once the block ends.
+The wrappers replace the functions for the whole process, so calls from other threads, such as those of
+threads_two_player_fair_division.solve_batch(), are timed too. Every thread keeps its own call stack, so their paths
+do not mix, and the calls, cumulative times and stacks of all the threads are added up.
+
+programmers: Itay Hasidi & Amichai Bitan
+"""
+import contextlib
+import functools
+import threading
+import time
+from typing import List, Dict
+
+import two_players_fair_division
+
+# The functions of two_players_fair_division.py that profiled() times by default.
+FUNCTIONS = [
+    'sequential', 'restricted_simple', 'singles_doubles', 'iterated_singles_doubles', 's1', 'l1', 'top_down',
+    'top_down_alternating', 'bottom_up', 'bottom_up_alternating', 'trump',
+    'recursive_sequential', 'recursive_restricted_simple', 'singles_doubles_helper',
+    'iterated_singles_doubles_helper', 's1_helper', 'l1_helper', 'top_down_helper', 'top_down_alternating_helper',
+    'bottom_up_helper', 'bottom_up_alternating_helper',
+    'sequential_branches', 'restricted_simple_branches', 'singles_doubles_branches', 'count_allocations_helper',
+    'sample_allocations_helper', 'branch_table',
+    'pick_items', 'make_profile', 'desired_items', 'ranked_items', 'least_valued_item', 'has_equal_scores',
+    'allocation_dict',
+    'H_M_l', 'allocate', 'singles', 'sorted_valuations', 'get_valuation_list',
+]
+
+
+class Profiler:
+    """
+    The measurements of one profiled() block.
+
+    calls: calls[name] is the number of calls of the function.
+    cumulative: cumulative[name] is the time in seconds spent in the function and in what it calls. Recursive calls are
+    counted once, in the outermost call, and the calls of several threads add up.
+    stacks: stacks[path] is the time in seconds spent in the last function of the path itself, where the path is the
+    semicolon separated names of the timed functions on the call stack, the outermost one first.
+    """
+
+    def __init__(self):
+        self.calls: Dict[str, int] = {}
+        self.cumulative: Dict[str, float] = {}
+        self.stacks: Dict[str, float] = {}
+        # The call stack and the number of running calls of every function, kept per thread.
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def wrap(self, name: str, function):
+        """
+        Returns a wrapper of the function that records its calls in this profiler.
+
+        :param name the name the function is recorded under.
+        :param function the function to time.
+        """
+        local = self._local
+        lock = self._lock
+        clock = time.perf_counter
+
+        @functools.wraps(function)
+        def timed(*args, **kwargs):
+            if not hasattr(local, 'frames'):
+                local.frames, local.active = [], {}
+            frames, active = local.frames, local.active
+            path = frames[-1][0] + ';' + name if frames else name
+            frame = [path, 0.0]
+            frames.append(frame)
+            active[name] = active.get(name, 0) + 1
+            start = clock()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                elapsed = clock() - start
+                frames.pop()
+                active[name] -= 1
+                if frames:
+                    frames[-1][1] += elapsed
+                with lock:
+                    self.calls[name] = self.calls.get(name, 0) + 1
+                    if not active[name]:
+                        self.cumulative[name] = self.cumulative.get(name, 0.0) + elapsed
+                    self.stacks[path] = self.stacks.get(path, 0.0) + elapsed - frame[1]
+
+        return timed
+
+    def self_times(self) -> Dict[str, float]:
+        """
+        Returns the time in seconds spent in every function itself, without the timed functions it calls.
+        """
+        times = {}
+        for path, seconds in self.stacks.items():
+            name = path.rsplit(';', 1)[-1]
+            times[name] = times.get(name, 0.0) + seconds
+        return times
+
+    def summary(self) -> str:
+        """
+        Returns a table of the calls, cumulative time and own time of every function, the slowest one first.
+        """
+        self_times = self.self_times()
+        width = max([len('function')] + [len(name) for name in self.calls])
+        lines = ['%-*s %10s %12s %12s %12s' % (width, 'function', 'calls', 'cumul ms', 'own ms', 'us/call')]
+        for name in sorted(self.calls, key=lambda name: -self.cumulative[name]):
+            lines.append('%-*s %10d %12.3f %12.3f %12.3f' % (width, name, self.calls[name], self.cumulative[name] * 1e3,
+                                                           self_times[name] * 1e3,
+                                                           self.cumulative[name] / self.calls[name] * 1e6))
+        return '\n'.join(lines)
+
+    def collapsed(self) -> List[str]:
+        """
+        Returns the stacks in the collapsed format of flamegraph.pl and speedscope, one "path microseconds" line per
+        call stack.
+        """
+        return ['%s %d' % (path, round(seconds * 1e6)) for path, seconds in sorted(self.stacks.items())]
+
+    def write_collapsed(self, path: str):
+        """
+        Writes collapsed() to a file.
+
+        :param path the path of the file.
+        """
+        with open(path, 'w') as file:
+            for line in self.collapsed():
+                file.write(line + '\n')
+
+
+@contextlib.contextmanager
+def profiled(functions: List[str] = None, module=two_players_fair_division):
+    """
+    Times the functions of the module while the block runs and yields the Profiler that records them.
+    The algorithms of the module (and of its ALGORITHMS dict) are timed however they are called, the ones imported by
+    name into another module before the block only through the functions they call.
+
+    :param functions the names of the functions to time, FUNCTIONS by default.
+    :param module the module whose functions are timed.
+
+    >>> from two_players_fair_division import sequential
+    >>> with profiled() as profiler:
+    ...     allocations = sequential([[1, 2, 3, 4], [4, 2, 3, 1]])
+    >>> profiler.calls['allocate'], profiler.calls['recursive_sequential']
+    (3, 5)
+    >>> [line.rsplit(' ', 1)[0] for line in profiler.collapsed()][:3]
+    ['make_profile', 'recursive_sequential', 'recursive_sequential;allocate']
+    """
+    profiler = Profiler()
+    originals = {}
+    for name in FUNCTIONS if functions is None else functions:
+        if hasattr(module, name):
+            originals[name] = getattr(module, name)
+            setattr(module, name, profiler.wrap(name, originals[name]))
+    algorithms = getattr(module, 'ALGORITHMS', {})
+    wrapped = {abbreviation: getattr(module, function.__name__) for abbreviation, function in algorithms.items()
+               if function.__name__ in originals}
+    algorithms.update(wrapped)
+    try:
+        yield profiler
+    finally:
+        for name, function in originals.items():
+            setattr(module, name, function)
+        algorithms.update({abbreviation: originals[algorithms[abbreviation].__name__] for abbreviation in wrapped})
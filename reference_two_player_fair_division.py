@@ -0,0 +1,529 @@
+"""
+Frozen reference implementations of the algorithms of two_players_fair_division.py
+
+These are the algorithms and utils exactly as they were before the algorithms moved to rank profiles, kept unchanged so
+every faster implementation can be checked against them (see differential_two_player_fair_division.py).
+Do not optimize or fix this file: a bug here is part of the reference behaviour. They run on agents with value(),
+all_items() and name(); reference_agents() builds such agents from a Profile.
+
+programmers: Itay Hasidi & Amichai Bitan
+"""
+from __future__ import annotations
+import logging
+from typing import List, Any, Dict, TYPE_CHECKING
+
+from profile_two_player_fair_division import Profile
+
+if TYPE_CHECKING:
+    from fairpy.fairpy.agentlist import AgentList
+
+logger = logging.getLogger(__name__)
+
+
+class ProfileAgent:
+    """
+    An agent of a Profile with the value(), all_items() and name() methods the reference algorithms use.
+
+    >>> Alice, George = reference_agents(Profile(['Alice', 'George'], ['a', 'b'], [[1, 2], [2, 1]], [[0, 1], [1, 0]]))
+    >>> Alice.value('b'), list(George.all_items()), George.name()
+    (2, ['b', 'a'], 'George')
+    """
+
+    def __init__(self, profile: Profile, agent: int):
+        self._name = profile.names[agent]
+        self._values = {profile.items[i]: profile.ranks[agent][i] for i in profile.orders[agent]}
+
+    def value(self, item):
+        return self._values[item]
+
+    def all_items(self):
+        return self._values.keys()
+
+    def name(self):
+        return self._name
+
+
+def reference_agents(profile: Profile) -> List[ProfileAgent]:
+    """
+    Returns the agents of a profile, for the reference algorithms.
+
+    :param profile the preferences of the agents, see make_profile().
+    """
+    return [ProfileAgent(profile, agent) for agent in range(len(profile.names))]
+
+
+def find_last_item(agent, item_list):
+    """Frozen copy of find_last_item()."""
+    max_score = -1
+    max_item = ""
+    for item in item_list:
+        score = agent.value(item)
+        if max_score < score:
+            max_score = score
+            max_item = item
+    return max_item
+
+
+def is_envy_free_partial_allocation(agents: AgentList, allocations: List[Any]):
+    """Frozen copy of is_envy_free_partial_allocation()."""
+    A_sum = 0
+    B_sum = 0
+    for idx in range(len(allocations[0])):
+        A_sum += agents[0].value(allocations[0][idx])
+        B_sum += agents[1].value(allocations[1][idx])
+    if A_sum == B_sum:
+        return True
+    return False
+
+
+def deep_copy_2d_list(lst: list):
+    """Frozen copy of deep_copy_2d_list()."""
+    lst_copy = []
+    for i in range(len(lst)):
+        lst_temp = []
+        for j in range(len(lst[0])):
+            lst_temp.append(lst[i][j])
+        lst_copy.append(lst_temp)
+    return lst_copy
+
+
+def allocate(items: List[Any], allocations: List[Any] = None, a_item=None, b_item=None, valuation_list=None):
+    """Frozen copy of allocate()."""
+    if a_item:
+        allocations[0].append(a_item)
+        items.remove(a_item)
+        if valuation_list:
+            valuation_list[0].remove(a_item)
+            valuation_list[1].remove(a_item)
+    if b_item:
+        allocations[1].append(b_item)
+        items.remove(b_item)
+        if valuation_list:
+            valuation_list[0].remove(b_item)
+            valuation_list[1].remove(b_item)
+    return items, allocations
+
+
+def H_M_l(agents: AgentList, items: List[Any] = None, level: int = 1):
+    """Frozen copy of H_M_l()."""
+    desired_items = []
+    for player in agents:
+        player_items = []
+        for item in player.all_items():
+            if player.value(item) <= level and item in items:
+                player_items.append(item)
+        desired_items.append(player_items)
+    return desired_items
+
+
+def have_different_elements(items_A: List[Any], items_B: List[Any]):
+    """Frozen copy of have_different_elements()."""
+    if len(items_A) != len(items_B):
+        return True
+    for i in items_A:
+        for j in items_B:
+            if i != j:
+                return True
+    return False
+
+
+def singles(A_items: List[Any], B_items: List[Any], items: List[Any], allocations: List[Any] = None):
+    """Frozen copy of singles()."""
+    A_allocations = []
+    B_allocations = []
+    for i in range(len(allocations[0])):
+        A_items.remove(allocations[0][i])
+        A_items.remove(allocations[1][i])
+        B_items.remove(allocations[0][i])
+        B_items.remove(allocations[1][i])
+    length = int(len(items))
+    for i in range(length):
+        # idx = len(A_items) - i
+        if A_items[-1 - i] != B_items[-1 - i] and A_items[-1 - i] not in A_allocations and B_items[-1 - i] \
+                not in B_allocations:
+            A_allocations.append(B_items[-1 - i])
+            B_allocations.append(A_items[-1 - i])
+        else:
+            break
+    if not A_allocations and not B_allocations:
+        return False, allocations
+    for j in range(len(A_allocations)):
+        if A_allocations[j] in items and B_allocations[j] in items:
+            allocate(items, allocations, A_allocations[j], B_allocations[j])
+    return True, allocations
+
+
+def get_valuation_list(agents: AgentList, items: List[Any]):
+    A_items_Dict = {}
+    B_items_Dict = {}
+    A_items = []
+    B_items = []
+    for item in items:
+        A_items_Dict[agents[0].value(item)] = item
+        B_items_Dict[agents[1].value(item)] = item
+    for i in range(1, len(agents[0].all_items()) + 1):
+        if i in B_items_Dict:
+            B_items.append(B_items_Dict[i])
+        if i in A_items_Dict:
+            A_items.append(A_items_Dict[i])
+    return A_items, B_items
+
+
+def sorted_valuations(agents: AgentList, items: List[Any]):
+    """Frozen copy of sorted_valuations()."""
+    sorted_lst = [[], []]
+    for agent in range(len(agents)):
+        for i in range(1, len(items) + 1):
+            for item in items:
+                if agents[agent].value(item) == i:
+                    sorted_lst[agent].append(item)
+                    break
+    return sorted_lst
+
+
+def sequential(agents: AgentList, items: List[Any] = None) -> Dict:
+    """Frozen copy of sequential()."""
+
+    return recursive_sequential(agents, items, allocations=[[], []], end_allocation=[])
+
+
+def recursive_sequential(agents: AgentList, items: List[Any], allocations: List[Any] = [[], []],
+                     end_allocation=[], level: int = 1):
+    """Frozen copy of recursive_sequential()."""
+    logger.info("\nAlgorithm: OS\nTwo Agents %s %s and items %s", agents[0].name(), agents[1].name(), items)
+    if not items:
+        end_allocation.append({agents[0].name(): allocations[0], agents[1].name(): allocations[1]})
+        return end_allocation
+    H_A_level, H_B_level = H_M_l(agents, items, level)
+    logger.info("current allocations: \n%s: %s\n%s: %s", agents[0].name(), allocations[0], agents[1].name(),
+                allocations[0])
+    if H_A_level and H_B_level and have_different_elements(H_A_level, H_B_level):
+        for i in H_A_level:
+            for j in H_B_level:
+                if i != j:
+                    _allocations = deep_copy_2d_list(allocations)
+                    _items, _allocations = allocate(items.copy(), _allocations, i, j)
+                    recursive_sequential(agents, _items, _allocations, end_allocation, level + 1)
+    else:
+        recursive_sequential(agents, items, allocations, end_allocation, level + 1)
+    return end_allocation
+
+
+def restricted_simple(agents: AgentList, items: List[Any] = None) -> Dict:
+    """Frozen copy of restricted_simple()."""
+    logger.debug("\nAlgorithm: RS\nTwo Agents %s %s and items %s", agents[0].name(), agents[1].name(), items)
+    return recursive_restricted_simple(agents, items, allocations=[[], []], end_allocation=[])
+
+
+def recursive_restricted_simple(agents: AgentList, items: List[Any], allocations: List[Any] = [[], []],
+                                end_allocation=[], level: int = 1):
+    """Frozen copy of recursive_restricted_simple()."""
+    if not items:
+        end_allocation.append({agents[0].name(): allocations[0], agents[1].name(): allocations[1]})
+        return end_allocation
+    H_A_level, H_B_level = H_M_l(agents, items, level)
+    logger.info("current allocations: \n%s: %s\n%s: %s", agents[0].name(), allocations[0], agents[1].name(),
+                allocations[0])
+    if H_A_level and H_B_level and have_different_elements(H_A_level, H_B_level):
+        if H_A_level[0] != H_B_level[0]:
+            _allocations = deep_copy_2d_list(allocations)
+            _items, _allocations = allocate(items.copy(), _allocations, H_A_level[0], H_B_level[0])
+            recursive_restricted_simple(agents, _items, _allocations, end_allocation=end_allocation, level=level + 1)
+        else:
+            if len(H_A_level) > 1:
+                _allocations = deep_copy_2d_list(allocations)
+                _items, _allocations = allocate(items.copy(), _allocations, H_A_level[1], H_B_level[0])
+                recursive_restricted_simple(agents, _items, _allocations, end_allocation=end_allocation,
+                                            level=level + 1)
+            if len(H_B_level) > 1:
+                _allocations = deep_copy_2d_list(allocations)
+                _items, _allocations = allocate(items.copy(), _allocations, H_A_level[0], H_B_level[1])
+                recursive_restricted_simple(agents, _items, _allocations, end_allocation=end_allocation,
+                                            level=level + 1)
+    else:
+        recursive_restricted_simple(agents, items, allocations, end_allocation=end_allocation, level=level + 1)
+    return end_allocation
+
+
+def singles_doubles(agents: AgentList, items: List[Any] = None) -> Dict:
+    """Frozen copy of singles_doubles()."""
+    logger.debug("\nAlgorithm: SD\nTwo Agents %s %s and items %s", agents[0].name(), agents[1].name(), items)
+    return singles_doubles_helper(agents, items, allocations=[[], []], end_allocation=[], do_single=True)
+
+
+def singles_doubles_helper(agents: AgentList, items: List[Any] = None, allocations=[[], []], end_allocation=[],
+                           do_single: bool = False) -> Dict:
+    """Frozen copy of singles_doubles_helper()."""
+    if do_single:
+        A_items, B_items = get_valuation_list(agents, items)
+        singles(A_items.copy(), B_items.copy(), items, allocations)
+    if not items:
+        if is_envy_free_partial_allocation(agents, allocations):
+            end_allocation.append({agents[0].name(): allocations[0], agents[1].name(): allocations[1]})
+            return end_allocation
+        return
+    H_A_level, H_B_level = H_M_l(agents, items, len(agents[0].all_items()))
+    if H_A_level[0] != H_B_level[0]:
+        _allocations = deep_copy_2d_list(allocations)
+        _items, _allocations = allocate(agents, items.copy(), _allocations, H_A_level[0], H_B_level[0])
+        singles_doubles_helper(agents, _items, _allocations, end_allocation)
+    temp_allocation_1 = deep_copy_2d_list(allocations)
+    temp_allocation_2 = deep_copy_2d_list(allocations)
+    items_1, temp_allocation_1 = allocate(items.copy(), temp_allocation_1, H_A_level[0], H_B_level[1])
+    items_2, temp_allocation_2 = allocate(items.copy(), temp_allocation_2, H_A_level[1], H_B_level[0])
+    logger.info("current allocations: \n%s: %s\n%s: %s", agents[0].name(), allocations[0], agents[1].name(),
+                allocations[0])
+    singles_doubles_helper(agents, items_1, temp_allocation_1, end_allocation)
+    singles_doubles_helper(agents, items_2, temp_allocation_2, end_allocation)
+    return end_allocation
+
+
+def iterated_singles_doubles(agents: AgentList, items: List[Any] = None) -> Dict:
+    """Frozen copy of iterated_singles_doubles()."""
+    logger.debug("\nAlgorithm: IS\nTwo Agents %s %s and items %s", agents[0].name(), agents[1].name(), items)
+    return iterated_singles_doubles_helper(agents, items, allocations=[[], []], end_allocation=[], do_single=True)
+
+
+def iterated_singles_doubles_helper(agents: AgentList, items: List[Any] = None, allocations=[[], []], end_allocation=[],
+                                    do_single: bool = False) -> Dict:
+    """Frozen copy of iterated_singles_doubles_helper()."""
+    if do_single:
+        A_items, B_items = get_valuation_list(agents, items)
+        flag = True
+        while flag:
+            flag, allocations = singles(A_items.copy(), B_items.copy(), items, allocations)
+    if not items:
+        if is_envy_free_partial_allocation(agents, allocations):
+            end_allocation.append({agents[0].name(): allocations[0], agents[1].name(): allocations[1]})
+            return end_allocation
+        return
+    H_A_level, H_B_level = H_M_l(agents, items, len(agents[0].all_items()))
+    if H_A_level[0] != H_B_level[0]:
+        _allocations = deep_copy_2d_list(allocations)
+        _items, _allocations = allocate(agents, items.copy(), _allocations, H_A_level[0], H_B_level[0])
+        iterated_singles_doubles_helper(agents, _items, _allocations, end_allocation)
+    temp_allocation_1 = deep_copy_2d_list(allocations)
+    temp_allocation_2 = deep_copy_2d_list(allocations)
+    items_1, temp_allocation_1 = allocate(items.copy(), temp_allocation_1, H_A_level[0], H_B_level[1])
+    items_2, temp_allocation_2 = allocate(items.copy(), temp_allocation_2, H_A_level[1], H_B_level[0])
+    logger.info("current allocations: \n%s: %s\n%s: %s", agents[0].name(), allocations[0], agents[1].name(),
+                allocations[0])
+    iterated_singles_doubles_helper(agents, items_1, temp_allocation_1, end_allocation)
+    iterated_singles_doubles_helper(agents, items_2, temp_allocation_2, end_allocation)
+    return end_allocation
+
+
+def s1(agents: AgentList, items: List[Any] = None) -> Dict:
+    """Frozen copy of s1()."""
+    logger.debug("\nAlgorithm: S1\nTwo Agents %s %s and items %s", agents[0].name(), agents[1].name(), items)
+    return s1_helper(agents, items, allocations=[[], []], end_allocation=[], do_single=True)
+
+
+def s1_helper(agents: AgentList, items: List[Any] = None, allocations=[[], []], end_allocation=[],
+              do_single: bool = False) -> Dict:
+    """Frozen copy of s1_helper()."""
+    if do_single:
+        A_items, B_items = get_valuation_list(agents, items)
+        singles(A_items.copy(), B_items.copy(), items, allocations)
+    if not items:
+        end_allocation.append({agents[0].name(): allocations[0], agents[1].name(): allocations[1]})
+        return end_allocation
+    H_A_level, H_B_level = H_M_l(agents, items, len(agents[0].all_items()))
+    if H_A_level[0] != H_B_level[0]:
+        _allocations = deep_copy_2d_list(allocations)
+        _items, _allocations = allocate(agents, items.copy(), _allocations, H_A_level[0], H_B_level[0])
+        s1_helper(agents, _items, _allocations, end_allocation)
+    temp_allocation_1 = deep_copy_2d_list(allocations)
+    temp_allocation_2 = deep_copy_2d_list(allocations)
+    items_1, temp_allocation_1 = allocate(items.copy(), temp_allocation_1, H_A_level[0], H_B_level[1])
+    items_2, temp_allocation_2 = allocate(items.copy(), temp_allocation_2, H_A_level[1], H_B_level[0])
+    logger.info("current allocations: \n%s: %s\n%s: %s", agents[0].name(), allocations[0], agents[1].name(),
+                allocations[0])
+    s1_helper(agents, items_1, temp_allocation_1, end_allocation)
+    s1_helper(agents, items_2, temp_allocation_2, end_allocation)
+    return end_allocation
+
+
+def l1(agents: AgentList, items: List[Any] = None) -> Dict:
+    """Frozen copy of l1()."""
+    logger.debug("\nAlgorithm: L1\nTwo Agents %s %s and items %s", agents[0].name(), agents[1].name(), items)
+    return l1_helper(agents, items, allocations=[[], []], end_allocation=[], do_single=True)
+
+
+def l1_helper(agents: AgentList, items: List[Any] = None, allocations=[[], []], end_allocation=[],
+              do_single: bool = False) -> Dict:
+    """Frozen copy of l1_helper()."""
+    if do_single:
+        A_items, B_items = get_valuation_list(agents, items)
+        flag = True
+        while flag:
+            flag, allocations = singles(A_items.copy(), B_items.copy(), items, allocations)
+    if not items:
+        end_allocation.append({agents[0].name(): allocations[0], agents[1].name(): allocations[1]})
+        return end_allocation
+    H_A_level, H_B_level = H_M_l(agents, items, len(agents[0].all_items()))
+    if H_A_level[0] != H_B_level[0]:
+        _allocations = deep_copy_2d_list(allocations)
+        _items, _allocations = allocate(agents, items.copy(), _allocations, H_A_level[0], H_B_level[0])
+        s1_helper(agents, _items, _allocations, end_allocation)
+    temp_allocation_1 = deep_copy_2d_list(allocations)
+    temp_allocation_2 = deep_copy_2d_list(allocations)
+    items_1, temp_allocation_1 = allocate(items.copy(), temp_allocation_1, H_A_level[0], H_B_level[1])
+    items_2, temp_allocation_2 = allocate(items.copy(), temp_allocation_2, H_A_level[1], H_B_level[0])
+    logger.info("current allocations: \n%s: %s\n%s: %s", agents[0].name(), allocations[0], agents[1].name(),
+                allocations[0])
+    s1_helper(agents, items_1, temp_allocation_1, end_allocation)
+    s1_helper(agents, items_2, temp_allocation_2, end_allocation)
+    return end_allocation
+
+
+def top_down(agents: AgentList, items: List[Any] = None) -> Dict:
+    """Frozen copy of top_down()."""
+    logger.debug("\nAlgorithm: TD\nTwo Agents %s %s and items %s", agents[0].name(), agents[1].name(), items)
+    return top_down_helper(agents, items, allocations=[])
+
+
+def top_down_helper(agents: AgentList, items: List[Any] = None, allocations: List[Any] = None):
+    """Frozen copy of top_down_helper()."""
+    length = int(len(items) / 2)
+    allocations = [[], []]
+    valuations = sorted_valuations(agents, items)
+    for i in range(length):
+        if valuations[0][0] in items:
+            items, allocations = allocate(items, allocations, a_item=valuations[0][0], valuation_list=valuations)
+        if valuations[1][0] in items:
+            items, allocations = allocate(items, allocations, b_item=valuations[1][0], valuation_list=valuations)
+        logger.info("current allocations: \n%s: %s\n%s: %s", agents[0].name(), allocations[0], agents[1].name(),
+                    allocations[0])
+    end_allocation = {agents[0].name(): allocations[0], agents[1].name(): allocations[1]}
+    return end_allocation
+
+
+def top_down_alternating(agents: AgentList, items: List[Any] = None) -> Dict:
+    """Frozen copy of top_down_alternating()."""
+    logger.debug("\nAlgorithm: TA\nTwo Agents %s %s and items %s", agents[0].name(), agents[1].name(), items)
+    return top_down_alternating_helper(agents, items, allocations=[])
+
+
+def top_down_alternating_helper(agents: AgentList, items: List[Any] = None, allocations: List[Any] = None):
+    """Frozen copy of top_down_alternating_helper()."""
+    flag = True
+    allocations = [[], []]
+    valuations = sorted_valuations(agents, items)
+    length = int(len(items) / 2)
+    for _ in range(length):
+        if flag:
+            if valuations[0][0] in items:
+                items, allocations = allocate(items, allocations, a_item=valuations[0][0], valuation_list=valuations)
+            if valuations[1][0] in items:
+                items, allocations = allocate(items, allocations, b_item=valuations[1][0], valuation_list=valuations)
+            flag = False
+        elif not flag:
+            if valuations[1][0] in items:
+                items, allocations = allocate(items, allocations, b_item=valuations[1][0], valuation_list=valuations)
+            if valuations[0][0] in items:
+                items, allocations = allocate(items, allocations, a_item=valuations[0][0], valuation_list=valuations)
+            flag = True
+        logger.info("current allocations: \n%s: %s\n%s: %s", agents[0].name(), allocations[0], agents[1].name(),
+                    allocations[0])
+
+    end_allocation = {agents[0].name(): allocations[0], agents[1].name(): allocations[1]}
+    return end_allocation
+
+
+def bottom_up(agents: AgentList, items: List[Any] = None) -> Dict:
+    """Frozen copy of bottom_up()."""
+    logger.debug("\nAlgorithm: BU\nTwo Agents %s %s and items %s", agents[0].name(), agents[1].name(), items)
+    return bottom_up_helper(agents, items, allocations=[])
+
+
+def bottom_up_helper(agents: AgentList, items: List[Any] = None, allocations: List[Any] = None):
+    """Frozen copy of bottom_up_helper()."""
+    length = int(len(items) / 2)
+    allocations = [[], []]
+    valuations = sorted_valuations(agents, items)
+    for i in range(length):
+        if valuations[0][len(valuations[0]) - 1] in items:
+            items, allocations = allocate(items, allocations, b_item=valuations[0][len(valuations[0]) - 1],
+                                          valuation_list=valuations)
+        if valuations[1][len(valuations[1]) - 1] in items:
+            items, allocations = allocate(items, allocations, a_item=valuations[1][len(valuations[1]) - 1],
+                                          valuation_list=valuations)
+        logger.info("current allocations: \n%s: %s\n%s: %s", agents[0].name(), allocations[0], agents[1].name(),
+                    allocations[0])
+
+    end_allocation = {agents[0].name(): allocations[0], agents[1].name(): allocations[1]}
+    return end_allocation
+
+
+def bottom_up_alternating(agents: AgentList, items: List[Any] = None) -> Dict:
+    """Frozen copy of bottom_up_alternating()."""
+    logger.debug("\nAlgorithm: BA\nTwo Agents %s %s and items %s", agents[0].name(), agents[1].name(), items)
+    return bottom_up_alternating_helper(agents, items, allocations=[])
+
+
+def bottom_up_alternating_helper(agents: AgentList, items: List[Any] = None, allocations: List[Any] = None):
+    """Frozen copy of bottom_up_alternating_helper()."""
+    flag = True
+    allocations = [[], []]
+    valuations = sorted_valuations(agents, items)
+    length = int(len(items) / 2)
+    for _ in range(length):
+        if flag:
+            if valuations[0][len(valuations[0]) - 1] in items:
+                items, allocations = allocate(items, allocations, b_item=valuations[0][len(valuations[0]) - 1], valuation_list=valuations)
+            if valuations[1][len(valuations[1]) - 1] in items:
+                items, allocations = allocate(items, allocations, a_item=valuations[1][len(valuations[1]) - 1], valuation_list=valuations)
+            flag = False
+        elif not flag:
+            if valuations[1][len(valuations[1]) - 1] in items:
+                items, allocations = allocate(items, allocations, a_item=valuations[1][len(valuations[1]) - 1], valuation_list=valuations)
+            if valuations[0][len(valuations[0]) - 1] in items:
+                items, allocations = allocate(items, allocations, b_item=valuations[0][len(valuations[0]) - 1], valuation_list=valuations)
+            flag = True
+        logger.info("current allocations: \n%s: %s\n%s: %s", agents[0].name(), allocations[0], agents[1].name(),
+                    allocations[0])
+
+    end_allocation = {agents[0].name(): allocations[0], agents[1].name(): allocations[1]}
+    return end_allocation
+
+
+def trump(agents: AgentList, items: List[Any] = None) -> Dict:
+    """Frozen copy of trump()."""
+    logger.debug("\nAlgorithm: TR\nTwo Agents %s %s and items %s", agents[0].name(), agents[1].name(), items)
+    i = 1
+    allocations = [[], []]
+    end_allocation = []
+    length = len(items)
+    while i < length:
+        for m in range(len(agents)):
+            hm = H_M_l(agents, items, i)
+            # if not hm[0] and not hm[1]:
+            if not hm[m]:
+                return end_allocation
+            if m == 0:
+                item = find_last_item(agents[1], hm[0])
+                allocate(items, allocations, a_item=item)
+            if m == 1:
+                item = find_last_item(agents[0], hm[1])
+                allocate(items, allocations, b_item=item)
+            logger.info("current allocations: \n%s: %s\n%s: %s", agents[0].name(), allocations[0], agents[1].name(), allocations[0])
+        i += 2
+    end_allocation = {agents[0].name(): allocations[0], agents[1].name(): allocations[1]}
+    return end_allocation
+
+
+# The reference algorithms by their abbreviation in the paper.
+REFERENCE_ALGORITHMS = {
+    'OS': sequential,
+    'RS': restricted_simple,
+    'SD': singles_doubles,
+    'IS': iterated_singles_doubles,
+    'S1': s1,
+    'L1': l1,
+    'TD': top_down,
+    'TA': top_down_alternating,
+    'BU': bottom_up,
+    'BA': bottom_up_alternating,
+    'TR': trump,
+}
@@ -0,0 +1,158 @@
+"""
+Zero-copy multiprocess execution of two_players_fair_division.py over shared memory
+
+solve_shared() copies a (k, 2, n) stack of rank arrays once into a multiprocessing.shared_memory block and allocates a
+second block for the results. The workers attach to both blocks when they start, and every task is only a
+(start, stop) range of profiles: a worker reads the ranks of its range from the input block and writes the allocations
+as bitmasks into the output block, so neither the profiles nor the results are pickled.
+
+An allocation is a pair of bitmasks, bit i of the first (second) one is set when the first (second) agent gets item i,
+so profiles have at most 64 items.
+
+programmers: Itay Hasidi & Amichai Bitan
+"""
+import os
+from typing import List, Tuple
+
+import numpy as np
+
+from two_players_fair_division import ALGORITHMS
+
+MASK_DTYPE = np.uint64
+
+# The shared blocks a worker attached to, set by attach_worker().
+worker_state = {}
+
+
+def solve_shared(profiles, algorithm: str, jobs: int = None, max_allocations: int = 1,
+                 chunk_size: int = 1000) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Runs an algorithm on every rank array of a (k, 2, n) stack and returns (counts, masks):
+    counts[p] is the number of allocations the algorithm returned for profile p, and masks[p, a] holds the two bitmasks
+    of allocation a for a < min(counts[p], max_allocations).
+
+    :param profiles a (k, 2, n) array of ranks, for example from generators_two_player_fair_division.py.
+    :param algorithm the abbreviation of the algorithm, see ALGORITHMS.
+    :param jobs the number of worker processes, os.cpu_count() by default. With 1 the profiles are solved in this
+    process.
+    :param max_allocations the number of allocations kept for every profile, for the algorithms that return several.
+    :param chunk_size the number of profiles of a task.
+
+    >>> counts, masks = solve_shared(np.array([[[1, 2, 3, 4], [4, 2, 3, 1]]]), 'OS', jobs=1, max_allocations=2)
+    >>> counts.tolist(), [mask_items(mask) for mask in masks[0, 1]]
+    ([2], [[0, 2], [1, 3]])
+    """
+    profiles = np.ascontiguousarray(profiles, dtype=np.int32)
+    k, _, n = profiles.shape
+    if n > 64:
+        raise ValueError("shared memory results hold at most 64 items, got %d" % n)
+    if algorithm not in ALGORITHMS:
+        raise ValueError("unknown algorithm %s, expected one of %s" % (algorithm, ','.join(ALGORITHMS)))
+    if jobs is None:
+        jobs = os.cpu_count() or 1
+    ranges = [(start, min(start + chunk_size, k)) for start in range(0, k, chunk_size)]
+    if jobs == 1:
+        counts = np.zeros(k, dtype=np.int32)
+        masks = np.zeros((k, max_allocations, 2), dtype=MASK_DTYPE)
+        for start, stop in ranges:
+            solve_range(profiles, counts, masks, algorithm, start, stop)
+        return counts, masks
+
+    import multiprocessing
+    from multiprocessing import shared_memory
+    blocks = []
+    try:
+        for shape, dtype in [(profiles.shape, profiles.dtype), ((k,), np.int32), ((k, max_allocations, 2), MASK_DTYPE)]:
+            size = max(1, int(np.prod(shape)) * np.dtype(dtype).itemsize)
+            blocks.append((shared_memory.SharedMemory(create=True, size=size), shape, dtype))
+        shared_profiles, counts, masks = [np.ndarray(shape, dtype, buffer=block.buf) for block, shape, dtype in blocks]
+        shared_profiles[:] = profiles
+        counts[:] = 0
+        masks[:] = 0
+        layout = [(block.name, shape, np.dtype(dtype).str) for block, shape, dtype in blocks]
+        with multiprocessing.Pool(jobs, initializer=attach_worker, initargs=(layout, algorithm)) as pool:
+            for _ in pool.imap_unordered(solve_worker_range, ranges):
+                pass
+        result = counts.copy(), masks.copy()
+        del shared_profiles, counts, masks
+        return result
+    finally:
+        for block, _, _ in blocks:
+            block.close()
+            block.unlink()
+
+
+def attach_worker(layout: List, algorithm: str):
+    """
+    Attaches a worker process to the shared blocks of solve_shared(), once per worker.
+
+    :param layout the (name, shape, dtype) of the input, counts and masks blocks.
+    :param algorithm the abbreviation of the algorithm.
+    """
+    from multiprocessing import shared_memory
+    blocks = [shared_memory.SharedMemory(name=name) for name, _, _ in layout]
+    worker_state['blocks'] = blocks
+    worker_state['arrays'] = [np.ndarray(shape, dtype, buffer=block.buf)
+                              for block, (_, shape, dtype) in zip(blocks, layout)]
+    worker_state['algorithm'] = algorithm
+
+
+def solve_worker_range(bounds: Tuple[int, int]):
+    """
+    Solves a range of profiles in a worker attached by attach_worker().
+
+    :param bounds the (start, stop) range of profiles.
+    """
+    profiles, counts, masks = worker_state['arrays']
+    solve_range(profiles, counts, masks, worker_state['algorithm'], *bounds)
+
+
+def solve_range(profiles: np.ndarray, counts: np.ndarray, masks: np.ndarray, algorithm: str, start: int, stop: int):
+    """
+    Runs the algorithm on profiles[start:stop] and writes the results into counts and masks.
+
+    :param profiles a (k, 2, n) array of ranks.
+    :param counts the number of allocations of every profile.
+    :param masks the (k, max_allocations, 2) bitmasks of the allocations.
+    :param algorithm the abbreviation of the algorithm.
+    :param start the first profile.
+    :param stop the profile after the last one.
+    """
+    function = ALGORITHMS[algorithm]
+    max_allocations = masks.shape[1]
+    for p, ranks in enumerate(profiles[start:stop].tolist(), start):
+        result = function(ranks)
+        allocations = [result] if isinstance(result, dict) else result or []
+        counts[p] = len(allocations)
+        for a, allocation in enumerate(allocations[:max_allocations]):
+            masks[p, a, 0] = items_mask(allocation[0])
+            masks[p, a, 1] = items_mask(allocation[1])
+
+
+def items_mask(items: List[int]) -> int:
+    """
+    Returns the bitmask of item positions.
+
+    >>> items_mask([0, 2, 3])
+    13
+    """
+    mask = 0
+    for i in items:
+        mask |= 1 << i
+    return mask
+
+
+def mask_items(mask) -> List[int]:
+    """
+    Returns the item positions of a bitmask, in increasing order.
+
+    >>> mask_items(13)
+    [0, 2, 3]
+    """
+    mask = int(mask)
+    items = []
+    while mask:
+        low = mask & -mask
+        items.append(low.bit_length() - 1)
+        mask ^= low
+    return items
@@ -0,0 +1,229 @@
+"""
+Memory-mapped columnar store for the allocations of sequential() (OS) and restricted_simple() (RS)
+
+write_store() enumerates the allocations of a profile without keeping them in memory and writes them straight into a
+fixed-width binary file; open_store() maps the file back as NumPy arrays without reading it, so filtering and counting
+millions of allocations never builds Python objects for them.
+
+The file is a 64-byte header followed by two columns, one row per allocation in the order sequential() returns them:
+    masks:  (count, words) uint64, bit i of word i // 64 is set when the first agent gets item i. The second agent gets
+            the other items.
+    scores: (count, 2) int32 Borda scores (n + 1 - rank) or float64 cardinal values, see agent_values(): what each agent
+            gets by its own valuation.
+The header holds the magic b'TPFDRES1', the version, n, words, the score dtype, count, the algorithm and the total value
+of all the items for each agent.
+
+programmers: Itay Hasidi & Amichai Bitan
+"""
+import mmap
+import struct
+from typing import List, Any, NamedTuple
+
+import numpy as np
+
+from two_players_fair_division import *
+
+MAGIC = b'TPFDRES1'
+VERSION = 1
+HEADER = struct.Struct('<8sIII4sQ8s2d8x')
+
+# The branches of the algorithms whose allocations the store enumerates.
+STORED = {'OS': sequential_branches, 'RS': restricted_simple_branches}
+
+
+class StoredResults(NamedTuple):
+    """
+    The allocations of a store file, see open_store().
+
+    n: the number of items.
+    algorithm: the abbreviation of the algorithm that found the allocations.
+    totals: the total value of all the items for each agent.
+    masks: a read only (count, words) uint64 view of the file, the items of the first agent.
+    scores: a read only (count, 2) view of the file, what each agent gets by its own valuation.
+    """
+    n: int
+    algorithm: str
+    totals: List[Any]
+    masks: np.ndarray
+    scores: np.ndarray
+
+
+def write_store(path: str, agents, items: List[Any] = None, algorithm: str = 'OS', batch_size: int = 65536) -> int:
+    """
+    Enumerates the allocations of OS or RS into a store file and returns their number.
+    The number is counted first (see count_allocations_helper()), so the file gets its final size up front and the
+    allocations are written into the mapped file in batches.
+
+    :param path the path of the file.
+    :param agents A list of agents or a (2, n) array of ranks, see make_profile().
+    :param items A list of all existing items (U), or the item names of a rank array.
+    :param algorithm 'OS' or 'RS'.
+    :param batch_size the number of allocations kept in memory before they are written.
+    """
+    if algorithm not in STORED:
+        raise ValueError("the store holds the allocations of %s, got %s" % (' and '.join(STORED), algorithm))
+    profile = make_profile(agents, items)
+    n = len(profile.items)
+    if n % 2:
+        raise ValueError("%s needs an even number of items, got %d" % (algorithm, n))
+    branches_function = STORED[algorithm]
+    count = count_allocations_helper(profile, list(range(n)), branches_function, 1, {})
+    words = max(1, (n + 63) // 64)
+    values = agent_values(profile)
+    dtype = np.dtype(np.int32) if all(type(value) is int for row in values for value in row) else np.dtype(np.float64)
+    totals = [sum(row) for row in values]
+    masks_offset = HEADER.size
+    scores_offset = masks_offset + count * words * 8
+    with open(path, 'wb+') as file:
+        file.write(HEADER.pack(MAGIC, VERSION, n, words, dtype.str.encode(), count, algorithm.encode(),
+                               float(totals[0]), float(totals[1])))
+        file.truncate(scores_offset + count * 2 * dtype.itemsize)
+        if not count:
+            return 0
+        with mmap.mmap(file.fileno(), 0) as mapped:
+            masks = np.ndarray((count, words), np.uint64, buffer=mapped, offset=masks_offset)
+            scores = np.ndarray((count, 2), dtype, buffer=mapped, offset=scores_offset)
+            row = 0
+            batch_masks, batch_scores = [], []
+            for A_items in iterate_allocations(profile, branches_function):
+                mask = 0
+                A_score = 0
+                for i in A_items:
+                    mask |= 1 << i
+                    A_score += values[0][i]
+                batch_masks.append(mask)
+                batch_scores.append((A_score, totals[1] - sum(values[1][i] for i in A_items)))
+                if len(batch_masks) == batch_size:
+                    write_batch(masks, scores, row, batch_masks, batch_scores)
+                    row += len(batch_masks)
+                    batch_masks, batch_scores = [], []
+            write_batch(masks, scores, row, batch_masks, batch_scores)
+            del masks, scores
+            mapped.flush()
+    return count
+
+
+def write_batch(masks: np.ndarray, scores: np.ndarray, row: int, batch_masks: List[int], batch_scores: List[Any]):
+    """
+    Writes a batch of allocations into the mapped columns, from a row on.
+
+    :param masks the mapped masks column.
+    :param scores the mapped scores column.
+    :param row the first row of the batch.
+    :param batch_masks the item bitmasks of the first agent, as ints.
+    :param batch_scores the (first agent, second agent) scores.
+    """
+    if not batch_masks:
+        return
+    stop = row + len(batch_masks)
+    for word in range(masks.shape[1]):
+        masks[row:stop, word] = [(mask >> (64 * word)) & 0xFFFFFFFFFFFFFFFF for mask in batch_masks]
+    scores[row:stop] = batch_scores
+
+
+def iterate_allocations(profile: Profile, branches_function):
+    """
+    Yields the items of the first agent of every allocation that the search of sequential() or restricted_simple()
+    finds, in the same order, keeping only the current path in memory.
+
+    :param profile the preferences of the agents, see make_profile().
+    :param branches_function sequential_branches or restricted_simple_branches.
+
+    >>> list(iterate_allocations(make_profile([[1, 2, 3, 4], [4, 2, 3, 1]]), sequential_branches))
+    [[0, 1], [0, 2]]
+    """
+    stack = [(tuple(range(len(profile.items))), (), 1)]
+    while stack:
+        items, A_items, level = stack.pop()
+        if not items:
+            yield list(A_items)
+            continue
+        branches = branches_function(profile, list(items), level)
+        if not branches:
+            stack.append((items, A_items, level + 1))
+            continue
+        for i, j in reversed(branches):
+            stack.append((tuple(item for item in items if item != i and item != j), A_items + (i,), level + 1))
+
+
+def open_store(path: str) -> StoredResults:
+    """
+    Maps a store file as NumPy arrays, without reading the allocations.
+
+    :param path the path of the file.
+
+    >>> import os, tempfile
+    >>> path = os.path.join(tempfile.mkdtemp(), 'os.bin')
+    >>> write_store(path, [[1, 2, 3, 4], [4, 2, 3, 1]])
+    2
+    >>> store = open_store(path)
+    >>> store.masks[:, 0].tolist(), store.scores.tolist(), store.totals
+    ([3, 5], [[7, 6], [6, 7]], [10.0, 10.0])
+    """
+    with open(path, 'rb') as file:
+        header = file.read(HEADER.size)
+    if len(header) < HEADER.size:
+        raise ValueError("%s is not a store file" % path)
+    magic, version, n, words, dtype, count, algorithm, A_total, B_total = HEADER.unpack(header)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError("%s is not a store file of version %d" % (path, VERSION))
+    dtype = np.dtype(dtype.rstrip(b'\0').decode())
+    masks_offset = HEADER.size
+    scores_offset = masks_offset + count * words * 8
+    if not count:
+        masks, scores = np.zeros((0, words), np.uint64), np.zeros((0, 2), dtype)
+    else:
+        masks = np.memmap(path, np.uint64, 'r', masks_offset, (count, words))
+        scores = np.memmap(path, dtype, 'r', scores_offset, (count, 2))
+    return StoredResults(n, algorithm.rstrip(b'\0').decode(), [A_total, B_total], masks, scores)
+
+
+def envy_free_rows(store: StoredResults) -> np.ndarray:
+    """
+    Returns a boolean array of the allocations where each agent values its own items at least as much as the other
+    agent's items.
+
+    :param store the result of open_store().
+    """
+    return (2 * store.scores[:, 0] >= store.totals[0]) & (2 * store.scores[:, 1] >= store.totals[1])
+
+
+def pareto_rows(store: StoredResults) -> np.ndarray:
+    """
+    Returns a boolean array of the allocations that no other stored allocation Pareto dominates: none gives both agents
+    at least their scores and one of them more. Equal allocations do not dominate each other.
+
+    :param store the result of open_store().
+    """
+    A_scores, B_scores = store.scores[:, 0], store.scores[:, 1]
+    count = len(A_scores)
+    if not count:
+        return np.zeros(0, dtype=bool)
+    order = np.lexsort((-B_scores, -A_scores))
+    A_sorted, B_sorted = A_scores[order], B_scores[order]
+    new_group = np.r_[True, A_sorted[1:] != A_sorted[:-1]]
+    group_start = np.maximum.accumulate(np.where(new_group, np.arange(count), 0))
+    running_max = np.maximum.accumulate(B_sorted)
+    better_A = np.where(group_start > 0, running_max[np.maximum(group_start - 1, 0)], -np.inf)
+    dominated = (better_A >= B_sorted) | (B_sorted[group_start] > B_sorted)
+    result = np.empty(count, dtype=bool)
+    result[order] = ~dominated
+    return result
+
+
+def stored_allocations(store: StoredResults, rows) -> List[List[List[int]]]:
+    """
+    Returns the item positions of both agents for some rows of a store.
+
+    :param store the result of open_store().
+    :param rows the rows to decode, for example np.flatnonzero(pareto_rows(store)).
+    """
+    allocations = []
+    for row in rows:
+        mask = 0
+        for word, value in enumerate(store.masks[row].tolist()):
+            mask |= value << (64 * word)
+        A_items = [i for i in range(store.n) if mask >> i & 1]
+        B_items = [i for i in range(store.n) if not mask >> i & 1]
+        allocations.append([A_items, B_items])
+    return allocations
@@ -0,0 +1,33 @@
+from differential_two_player_fair_division import check_backend
+from parallel_two_player_fair_division import parallel_search
+from two_players_fair_division import *
+import pytest
+
+
+@pytest.mark.parametrize('algorithm', list(ALGORITHMS))
+def test_algorithms_match_reference(algorithm):
+    assert check_backend(algorithm, ALGORITHMS[algorithm], count=2000) is None
+
+
+@pytest.mark.parametrize('algorithm', ['OS', 'RS', 'SD', 'IS', 'S1', 'L1'])
+def test_parallel_search_matches_reference(algorithm):
+    def backend(profile):
+        return parallel_search(profile, algorithm=algorithm, jobs=1, frontier=3)
+    assert check_backend(algorithm, backend, count=500) is None
+
+
+def test_failures_are_shrunk():
+    def backend(profile):
+        allocations = sequential(profile)
+        return allocations[::-1] if len(profile.items) > 2 else allocations
+    profile = check_backend('OS', backend)
+    assert len(profile.items) == 4
+    assert check_backend('OS', backend, ordered=False) is None
+
+
+def test_odd_and_skipped_profiles():
+    def backend(profile):
+        return {name: [] for name in profile.names} if len(profile.items) % 2 else top_down(profile)
+    assert len(check_backend('TD', backend).items) % 2 == 1
+    with pytest.raises(AssertionError):
+        check_backend('SD', singles_doubles, count=100, min_compared=100)
@@ -2,6 +2,8 @@ from fairpy import fairpy
 from two_players_fair_division import *
 from typing import List, Any, Dict
 
+import pytest
+
 
 Alice = fairpy.agents.AdditiveAgent({'a': 1, 'b': 2, 'c': 3, 'd': 4}, name = 'Alice')
 George = fairpy.agents.AdditiveAgent({'a': 4, 'c': 2, 'd': 3, 'b': 1}, name = 'George')
@@ -72,3 +74,349 @@ def test_trump():
     assert trump([Alice, George], ['a', 'b', 'c', 'd']) == \
         "[{'a': ['a', 'c'], 'b': ['b', 'd']}]"
 
+
+def test_count_sequential():
+    assert count_sequential([Alice, George], ['a', 'b', 'c', 'd']) == \
+           len(sequential([Alice, George], ['a', 'b', 'c', 'd']))
+
+
+def test_count_restricted_simple():
+    assert count_restricted_simple([Alice, George], ['a', 'b', 'c', 'd']) == \
+           len(restricted_simple([Alice, George], ['a', 'b', 'c', 'd']))
+
+
+def test_sample_sequential():
+    allocations = sequential([Alice, George], ['a', 'b', 'c', 'd'])
+    samples = sample_sequential([Alice, George], ['a', 'b', 'c', 'd'], samples=20, seed=0)
+    assert len(samples) == 20
+    assert all(sample in allocations for sample in samples)
+    assert samples == sample_sequential([Alice, George], ['a', 'b', 'c', 'd'], samples=20, seed=0)
+
+
+def test_rank_array_input():
+    ranks = [[1, 2, 3, 4], [4, 1, 2, 3]]
+    profile = make_profile(ranks, ['a', 'b', 'c', 'd'], names=['Alice', 'George'])
+    for algorithm in [sequential, restricted_simple, top_down, top_down_alternating, bottom_up,
+                      bottom_up_alternating, trump]:
+        assert algorithm(profile) == algorithm([Alice, George], ['a', 'b', 'c', 'd'])
+    assert top_down(ranks) == {0: [0, 2], 1: [1, 3]}
+
+
+def test_import_does_not_load_fairpy():
+    from benchmark_two_player_fair_division import imported_modules
+    assert 'fairpy' not in imported_modules('two_players_fair_division')
+
+
+def test_cli(tmp_path):
+    import json
+    from cli_two_player_fair_division import main
+    (tmp_path / 'in.jsonl').write_text('{"ranks": [[1, 2, 3, 4], [4, 1, 2, 3]], "items": ["a", "b", "c", "d"], '
+                                       '"names": ["Alice", "George"]}\n')
+    main([str(tmp_path / 'in.jsonl'), '-a', 'TD,OS', '-o', str(tmp_path / 'out.jsonl')])
+    result = json.loads((tmp_path / 'out.jsonl').read_text())
+    assert result['TD'] == top_down([Alice, George], ['a', 'b', 'c', 'd'])
+    assert result['OS'] == sequential([Alice, George], ['a', 'b', 'c', 'd'])
+
+
+def test_cli_invalid_line(tmp_path):
+    import json
+    from cli_two_player_fair_division import main
+    (tmp_path / 'in.jsonl').write_text('[[1, 2], [2, 1]]\n{bad\n[[1, 2], [1, 2]]\n')
+    for jobs in ['1', '2']:
+        main([str(tmp_path / 'in.jsonl'), '-a', 'TD', '-j', jobs, '-o', str(tmp_path / 'out.jsonl')])
+        results = [json.loads(line) for line in (tmp_path / 'out.jsonl').read_text().splitlines()]
+        assert [result['index'] for result in results] == [0, 1, 2]
+        assert 'JSONDecodeError' in results[1]['error'] and results[2]['TD'] == {'0': [0], '1': [1]}
+    with pytest.raises(SystemExit):
+        main([str(tmp_path / 'in.jsonl'), '-a', 'TD', '-j', '0'])
+
+
+def test_parallel_search():
+    from parallel_two_player_fair_division import parallel_search
+    ranks = [[1, 2, 3, 4, 5, 6, 7, 8, 9, 10], [3, 4, 5, 6, 7, 8, 9, 10, 1, 2]]
+    assert parallel_search(ranks, algorithm='OS', jobs=2, frontier=4) == sequential(ranks)
+    assert parallel_search(ranks, algorithm='RS', jobs=2, frontier=4) == restricted_simple(ranks)
+    assert parallel_search(ranks, algorithm='L1', jobs=2, frontier=4) == l1(ranks)
+
+
+def test_generators():
+    from generators_two_player_fair_division import uniform_profiles, mallows_profiles, sequential_worst_profiles
+    profiles = uniform_profiles(50, 6, seed=1)
+    assert (uniform_profiles(50, 6, seed=1) == profiles).all()
+    assert all(sorted(ranks) == [1, 2, 3, 4, 5, 6] for profile in profiles.tolist() for ranks in profile)
+    assert (mallows_profiles(10, 6, 0.0, seed=2)[:, 0] == mallows_profiles(10, 6, 0.0, seed=2)[:, 1]).all()
+    assert all(count_sequential(profile) == 18 for profile in sequential_worst_profiles(5, 6, seed=3))
+
+
+def test_profiled(tmp_path):
+    import two_players_fair_division
+    from profiling_two_player_fair_division import profiled, FUNCTIONS
+    ranks = [[1, 2, 3, 4, 5, 6], [2, 1, 3, 4, 5, 6]]
+    with profiled(FUNCTIONS + ['deep_copy_2d_list']) as profiler:
+        result = two_players_fair_division.singles_doubles(ranks)
+    assert result == singles_doubles(ranks)
+    assert profiler.calls['singles_doubles'] == 1 and profiler.calls['singles'] == 1
+    assert profiler.calls['allocate'] == 14 and 'deep_copy_2d_list' not in profiler.calls
+    assert profiler.cumulative['singles_doubles'] >= profiler.cumulative['singles_doubles_helper']
+    assert two_players_fair_division.allocate is allocate
+    profiler.write_collapsed(str(tmp_path / 'sd.folded'))
+    lines = (tmp_path / 'sd.folded').read_text().splitlines()
+    assert 'singles_doubles;singles_doubles_helper;singles' in [line.rsplit(' ', 1)[0] for line in lines]
+    assert profiler.summary().splitlines()[1].startswith('singles_doubles ')
+
+
+def test_profiled_threads():
+    import sys
+    from profiling_two_player_fair_division import profiled
+    from threads_two_player_fair_division import solve_batch
+    profiles = [[[1, 2, 3, 4, 5, 6, 7, 8], [1, 2, 3, 4, 5, 6, 7, 8]]] * 16
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        with profiled() as profiler:
+            solve_batch(profiles, 'OS', jobs=4, chunk_size=1)
+    finally:
+        sys.setswitchinterval(interval)
+    assert profiler.calls['sequential'] == profiler.calls['make_profile'] == 16
+    assert all(path.split(';').count('sequential') == 1 and path.startswith('sequential') for path in profiler.stacks)
+
+
+def test_cardinal_values():
+    import numpy as np
+    values = np.array([[9.5, 0.5, 3.0, 3.0], [1.0, 8.0, 2.0, 0.0]])
+    profile = make_profile(values, ['computer', 'phone', 'tv', 'book'], names=['Alice', 'George'], cardinal=True)
+    assert profile.ranks == [[1, 4, 2, 3], [3, 1, 2, 4]]
+    assert make_profile(values.tolist(), profile.items, profile.names, cardinal=True) == profile
+    allocation = top_down(profile)
+    assert allocation == {'Alice': ['computer', 'tv'], 'George': ['phone', 'book']}
+    positions = allocation_positions(profile, allocation)
+    assert bundle_values(profile, positions) == [[12.5, 3.5], [3.0, 8.0]]
+    assert is_envy_free(profile, positions) and min_value(profile, positions) == 8.0
+
+
+def test_picking_sequence():
+    ranks = [[1, 2, 3, 4, 5, 6, 7, 8], [3, 4, 5, 6, 7, 8, 1, 2]]
+    assert picking_sequence(ranks, 'AB') == top_down(ranks)
+    assert picking_sequence(ranks, 'ABBA') == top_down_alternating(ranks)
+    assert picking_sequence(ranks, 'ABBA', rule=BOTTOM) == bottom_up_alternating(ranks)
+    assert picking_sequence(ranks, 'AB', rule=TRUMP) == trump(ranks)
+    ranks = [[1, 2, 3, 4, 5, 6, 7], [2, 1, 4, 3, 6, 5, 7], [7, 6, 5, 4, 3, 2, 1]]
+    assert picking_sequence(ranks, 'balanced') == {0: [0, 2], 1: [1, 3], 2: [6, 5]}
+    assert picking_sequence(ranks, [2, 0, 1], picks=7) == {0: [0, 2], 1: [1, 3], 2: [6, 5, 4]}
+    with pytest.raises(ValueError):
+        picking_sequence(ranks, 'ABD')
+
+
+def test_run_picking_suite():
+    import random
+    rng = random.Random(0)
+    profiles = [[Alice, George], [[1, 2, 3, 4, 5, 6, 7, 8], [3, 4, 5, 6, 7, 8, 1, 2]], [[1, 3, 2, 4], [1, 2, 3, 4]],
+                make_profile([[5, 1, 1.5, 0], [0, 2, 2, 4]], cardinal=True)]
+    profiles += [[[rng.randint(1, n) for _ in range(n)] for _ in range(2)] for n in range(1, 10) for _ in range(20)]
+    for agents in profiles:
+        profile = make_profile(agents)
+        suite = run_picking_suite(agents)
+        assert list(suite) == list(PICKING)
+        items = list(range(len(profile.items)))
+        bundles = pick_items(profile, items, pick_order('AB', 2, len(items) - len(items) % 2), TRUMP)
+        assert suite['TR'][0] == ([] if bundles is None else allocation_dict(profile, bundles))
+        for name, (allocation, scores) in suite.items():
+            assert allocation == ALGORITHMS[name](agents)
+            if allocation:
+                values = bundle_values(profile, allocation_positions(profile, allocation))
+                assert scores == [values[0][0], values[1][1]]
+            else:
+                assert scores is None
+
+
+def test_experiment(tmp_path):
+    from experiment_two_player_fair_division import run_experiment, rates
+    checkpoint = str(tmp_path / 'run.jsonl')
+    totals = run_experiment(sizes=[4, 6], profiles=40, chunk_size=10, checkpoint=checkpoint)
+    lines = open(checkpoint).read().splitlines()
+    assert len(lines) == 9
+    with open(checkpoint, 'w') as output:
+        output.write('\n'.join(lines[:5]) + '\n' + lines[5][:20])
+    assert run_experiment(sizes=[4, 6], profiles=40, chunk_size=10, checkpoint=checkpoint) == totals
+    table = rates(totals)
+    assert table['EF']['TR'] == {4: 1.0, 6: 1.0}
+    assert all(table['returned'][algorithm][n] == 1.0 for algorithm in ['OS', 'TD', 'BU'] for n in [4, 6])
+    with pytest.raises(ValueError):
+        run_experiment(sizes=[4], profiles=40, chunk_size=10, seed=1, checkpoint=checkpoint)
+
+
+def test_solve_shared():
+    from generators_two_player_fair_division import uniform_profiles
+    from shared_two_player_fair_division import solve_shared, mask_items
+    profiles = uniform_profiles(30, 8, seed=4)
+    counts, masks = solve_shared(profiles, 'OS', jobs=2, max_allocations=50, chunk_size=7)
+    for p, ranks in enumerate(profiles.tolist()):
+        expected = sequential(ranks)
+        assert counts[p] == len(expected)
+        assert [[mask_items(mask) for mask in masks[p, a]] for a in range(counts[p])] == \
+               [[sorted(allocation[0]), sorted(allocation[1])] for allocation in expected]
+    counts, masks = solve_shared(profiles, 'TR', jobs=2)
+    assert counts.tolist() == [1 if trump(ranks) else 0 for ranks in profiles.tolist()]
+
+
+def test_result_store(tmp_path):
+    import numpy as np
+    from store_two_player_fair_division import write_store, open_store, envy_free_rows, pareto_rows, \
+        stored_allocations
+    ranks = [[1, 2, 3, 4, 5, 6, 7, 8, 9, 10], [1, 3, 2, 5, 4, 7, 6, 9, 8, 10]]
+    path = str(tmp_path / 'os.bin')
+    assert write_store(path, ranks) == count_sequential(ranks) == 162
+    store = open_store(path)
+    assert isinstance(store.masks, np.memmap) and store.algorithm == 'OS'
+    assert stored_allocations(store, range(162)) == [[sorted(a[0]), sorted(a[1])] for a in sequential(ranks)]
+    ef = envy_free_rows(store)
+    scores = store.scores.tolist()
+    assert ef.tolist() == [2 * a >= 55 and 2 * b >= 55 for a, b in scores]
+    assert pareto_rows(store).tolist() == [not any(c >= a and d >= b and (c, d) != (a, b) for c, d in scores)
+                                           for a, b in scores]
+
+
+def test_max_min():
+    import itertools
+    from maxmin_two_player_fair_division import max_min, max_min_value
+    ranks = [[1, 2, 3, 4, 5, 6, 7, 8], [3, 4, 5, 6, 7, 8, 1, 2]]
+    scores = []
+    for A_items in itertools.combinations(range(8), 4):
+        B_items = [i for i in range(8) if i not in A_items]
+        scores.append(min(sum(9 - ranks[0][i] for i in A_items), sum(9 - ranks[1][i] for i in B_items)))
+    assert max_min_value(ranks) == max(scores)
+    allocation = max_min(ranks)
+    assert len(allocation[0]) == 4
+    assert min(sum(9 - ranks[0][i] for i in allocation[0]), sum(9 - ranks[1][i] for i in allocation[1])) == max(scores)
+    assert max_min_value(make_profile([[10, 0, 5], [0, 10, 5]], cardinal=True), balanced=False) == 10
+
+
+def test_envy_free_exists():
+    import itertools
+    import random
+    from oracle_two_player_fair_division import envy_free_exists
+    rng = random.Random(0)
+    for n in [2, 3, 4, 5, 6, 7, 8]:
+        for _ in range(200):
+            ranks = [rng.sample(range(1, n + 1), n), rng.sample(range(1, n + 1), n)]
+            assert envy_free_exists(ranks) == bool(trump(ranks))
+            if n % 2 == 0:
+                equal = any(sum(ranks[0][i] for i in A_items) == sum(ranks[1][i] for i in range(n) if i not in A_items)
+                            for A_items in itertools.combinations(range(n), n // 2))
+                if not equal:
+                    assert singles_doubles(ranks) in ([], None)
+                    assert iterated_singles_doubles(ranks) in ([], None)
+
+
+def test_trump_tied_ranks():
+    import random
+    from reference_two_player_fair_division import REFERENCE_ALGORITHMS, reference_agents
+    assert trump([[1, 1, 2, 4], [1, 4, 3, 2]], ['a', 'b', 'c', 'd']) == {0: ['b', 'c'], 1: ['a', 'd']}
+    rng = random.Random(0)
+    for _ in range(2000):
+        n = rng.randint(2, 6)
+        profile = make_profile([[rng.randint(1, n) for _ in range(n)] for _ in range(2)], list('abcdef'[:n]))
+        assert trump(profile) == REFERENCE_ALGORITHMS['TR'](reference_agents(profile), list(profile.items))
+
+
+def test_resolve_session():
+    import random
+    from incremental_two_player_fair_division import ResolveSession
+    rng = random.Random(1)
+    for algorithm, cold in [('OS', sequential), ('SD', singles_doubles)]:
+        session = ResolveSession([[1, 2, 3, 4, 5, 6], [2, 1, 3, 5, 4, 6]], ['a', 'b', 'c', 'd', 'e', 'f'], algorithm)
+        assert session.solve() == cold(session.profile)
+        for step in range(30):
+            agent = rng.randrange(2)
+            order = ranked_items(session.base, session.items)[agent]
+            session.swap_ranks(agent, session.base.items[rng.choice(order[:-1])])
+            if step % 10 == 9:
+                session.withdraw_item(session.base.items[session.items[0]])
+                session.add_item(step, [len(session.items) + 1, rng.randint(1, len(session.items) + 1)])
+            assert session.solve() == cold(session.profile)
+    with pytest.raises(ValueError):
+        ResolveSession([[1, 2], [2, 1]], algorithm='TR')
+
+
+def test_online_allocator():
+    import random
+    from online_two_player_fair_division import OnlineAllocator
+    rng = random.Random(2)
+    for algorithm, function in [('TD', top_down), ('TA', top_down_alternating), ('TR', trump)]:
+        for n in [1, 2, 5, 8, 11]:
+            ranks = [rng.sample(range(1, n + 1), n), rng.sample(range(1, n + 1), n)]
+            allocator = OnlineAllocator(n, algorithm)
+            arrival = list(range(n))
+            rng.shuffle(arrival)
+            picks = allocator.add_items([(i, [ranks[0][i], ranks[1][i]]) for i in arrival])
+            assert allocator.done
+            assert allocator.allocation() == function(ranks)
+            if allocator.allocation():
+                assert [item for agent, item in picks if agent == 0] == allocator.allocation()[0]
+                assert [item for agent, item in picks if agent == 1] == allocator.allocation()[1]
+    allocator = OnlineAllocator(2, 'TD')
+    with pytest.raises(ValueError):
+        allocator.add_items([('a', [1, 2]), ('b', [1, 1])])
+
+
+def test_top_allocations():
+    import random
+    from topk_two_player_fair_division import top_allocations, best_first_search, OBJECTIVES
+    rng = random.Random(3)
+    for n in [2, 6, 10]:
+        ranks = [rng.sample(range(1, n + 1), n), rng.sample(range(1, n + 1), n)]
+        for algorithm, function in [('OS', sequential), ('RS', restricted_simple)]:
+            everything = function(ranks)
+            for objective in OBJECTIVES:
+                def key(allocation):
+                    A_score = sum(n + 1 - ranks[0][i] for i in allocation[0])
+                    B_score = sum(n + 1 - ranks[1][i] for i in allocation[1])
+                    return -{'max-min': min(A_score, B_score), 'difference': -abs(A_score - B_score),
+                             'sum': A_score + B_score}[objective]
+                assert top_allocations(ranks, k=4, objective=objective, algorithm=algorithm) == \
+                       sorted(everything, key=key)[:4]
+    ranks = [[1, 2, 3, 4, 5, 6, 7, 8, 9, 10], [1, 3, 2, 5, 4, 7, 6, 9, 8, 10]]
+    assert best_first_search(make_profile(ranks), sequential_branches, 'sum', 1)[1] < count_sequential(ranks) // 10
+    with pytest.raises(ValueError):
+        top_allocations([[1, 2, 3], [3, 2, 1]])
+
+
+def test_solve_batch_threads():
+    import sys
+    import threading
+    from generators_two_player_fair_division import uniform_profiles
+    from threads_two_player_fair_division import solve_batch
+    profiles = uniform_profiles(40, 8, seed=4).tolist()
+    expected = {algorithm: [function(ranks) for ranks in profiles] for algorithm, function in ALGORITHMS.items()}
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        for algorithm in ALGORITHMS:
+            assert solve_batch(profiles, algorithm, jobs=8, chunk_size=1) == expected[algorithm]
+        barrier = threading.Barrier(8)
+        mismatches = []
+
+        def run(thread):
+            barrier.wait()
+            for p in range(thread, len(profiles), 8):
+                for algorithm, function in ALGORITHMS.items():
+                    if function(profiles[p]) != expected[algorithm][p]:
+                        mismatches.append((algorithm, p))
+
+        threads = [threading.Thread(target=run, args=(thread,)) for thread in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert not mismatches
+    finally:
+        sys.setswitchinterval(interval)
+
+
+def test_solve_batch_scaling():
+    import os
+    from benchmark_two_player_fair_division import thread_scaling
+    from threads_two_player_fair_division import gil_enabled
+    if gil_enabled() or (os.cpu_count() or 1) < 4:
+        pytest.skip("threads only run in parallel on a free-threaded build with 4 cores")
+    assert thread_scaling('OS', jobs=4) > 2
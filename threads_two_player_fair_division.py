@@ -0,0 +1,58 @@
+"""
+Thread-pool batch execution of the algorithms of two_players_fair_division.py
+
+The algorithms keep no state between calls and do not change what they get: every call builds its own profile, the
+recursive helpers start from fresh lists instead of shared default arguments, and allocate() and singles() return new
+lists. So any number of threads can run them at once, and solve_batch() runs a batch of profiles on a
+concurrent.futures thread pool, in chunks so the pool is not paid for every profile.
+
+With the GIL the threads take turns and a batch takes as long as a serial run. On free-threaded builds of Python
+(python3.13t and later, see gil_enabled()) the threads run in parallel on as many cores as there are workers.
+
+programmers: Itay Hasidi & Amichai Bitan
+"""
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Any
+
+from two_players_fair_division import ALGORITHMS
+
+
+def solve_batch(profiles, algorithm: str, jobs: int = None, chunk_size: int = 16) -> List[Any]:
+    """
+    Runs an algorithm on every profile on a thread pool and returns the results in the order of the profiles.
+
+    :param profiles a list of agent lists or rank arrays, or a (k, 2, n) array of ranks.
+    :param algorithm the abbreviation of the algorithm, see ALGORITHMS.
+    :param jobs the number of threads, os.cpu_count() by default. With 1 the profiles are solved in this thread.
+    :param chunk_size the number of profiles a thread solves at a time.
+
+    >>> solve_batch([[[1, 2, 3, 4], [4, 2, 3, 1]], [[1, 3, 2, 4], [1, 2, 3, 4]]], 'TR', jobs=2)
+    [{0: [0, 2], 1: [3, 1]}, []]
+    """
+    if algorithm not in ALGORITHMS:
+        raise ValueError("unknown algorithm %s, expected one of %s" % (algorithm, ','.join(ALGORITHMS)))
+    if hasattr(profiles, 'tolist'):
+        profiles = profiles.tolist()
+    profiles = list(profiles)
+    function = ALGORITHMS[algorithm]
+    if jobs is None:
+        jobs = os.cpu_count() or 1
+    if jobs == 1:
+        return [function(profile) for profile in profiles]
+    chunks = [profiles[start:start + chunk_size] for start in range(0, len(profiles), chunk_size)]
+    results = []
+    with ThreadPoolExecutor(jobs) as executor:
+        for chunk_results in executor.map(lambda chunk: [function(profile) for profile in chunk], chunks):
+            results.extend(chunk_results)
+    return results
+
+
+def gil_enabled() -> bool:
+    """
+    Returns False on a free-threaded build of Python running without the GIL, where solve_batch() scales with the
+    number of threads.
+    """
+    is_gil_enabled = getattr(sys, '_is_gil_enabled', None)
+    return True if is_gil_enabled is None else is_gil_enabled()
@@ -0,0 +1,142 @@
+"""
+Best-first top-k search over the allocations of sequential() (OS) and restricted_simple() (RS)
+
+top_allocations() returns the k allocations of OS or RS that are best by an objective, what sorting the list
+sequential() returns by the objective and taking the first k would give, without building that list:
+    max-min:    the lower of the agents' scores, the higher the better.
+    difference: the difference between the agents' scores, the smaller the better.
+    sum:        the sum of the agents' scores, the higher the better.
+An agent's score is what its own items are worth to it, the Borda scores n + 1 - rank or the cardinal values of a
+profile made with cardinal=True (see agent_values()).
+
+The search keeps the open search states in a heap, ordered by a bound on the objective of the allocations below them,
+and always expands the state with the best bound. Every allocation below a state gives each agent half of the
+remaining items, so an agent can add at most the values of its best half of them and at least those of its worst
+half, which bounds all three objectives from above (the lower score is also at most half the sum). An allocation taken
+off the heap is therefore at least as good as everything still on it, and allocations with the same objective come out
+in the order sequential() returns them.
+
+programmers: Itay Hasidi & Amichai Bitan
+"""
+import heapq
+from typing import List, Any, Dict
+
+from two_players_fair_division import *
+
+# The branches of the algorithms top_allocations() searches.
+SEARCHED = {'OS': sequential_branches, 'RS': restricted_simple_branches}
+
+OBJECTIVES = ['max-min', 'difference', 'sum']
+
+
+def top_allocations(agents, items: List[Any] = None, k: int = 1, objective: str = 'max-min',
+                    algorithm: str = 'OS') -> List[Dict]:
+    """
+    Returns the k best allocations of OS or RS by an objective, the best first.
+
+    :param agents A list of agents or a (2, n) array of ranks, see make_profile().
+    :param items A list of all existing items (U), or the item names of a rank array.
+    :param k the number of allocations, fewer if the algorithm returns fewer.
+    :param objective 'max-min', 'difference' or 'sum', see the module docstring.
+    :param algorithm 'OS' or 'RS'.
+
+    >>> ranks = [[1, 3, 2, 4], [1, 2, 3, 4]]
+    >>> top_allocations(ranks, ['computer', 'phone', 'tv', 'book'], k=2)
+    [{0: ['computer', 'book'], 1: ['phone', 'tv']}, {0: ['tv', 'phone'], 1: ['computer', 'book']}]
+    >>> top_allocations(ranks, ['computer', 'phone', 'tv', 'book'], objective='sum')
+    [{0: ['computer', 'tv'], 1: ['phone', 'book']}]
+    """
+    if algorithm not in SEARCHED:
+        raise ValueError("the search runs over %s, got %s" % (' and '.join(SEARCHED), algorithm))
+    if objective not in OBJECTIVES:
+        raise ValueError("unknown objective %s, expected one of %s" % (objective, ', '.join(OBJECTIVES)))
+    profile = make_profile(agents, items)
+    if len(profile.items) % 2:
+        raise ValueError("%s needs an even number of items, got %d" % (algorithm, len(profile.items)))
+    found = best_first_search(profile, SEARCHED[algorithm], objective, k)[0]
+    return [allocation_dict(profile, allocations) for allocations in found]
+
+
+def best_first_search(profile: Profile, branches_function, objective: str, k: int):
+    """
+    Returns (allocations, expanded): the item positions of both agents in the k best allocations, and the number of
+    search states whose branches were computed.
+
+    :param profile the preferences of the agents, see make_profile().
+    :param branches_function sequential_branches or restricted_simple_branches.
+    :param objective 'max-min', 'difference' or 'sum'.
+    :param k the number of allocations.
+
+    >>> found, expanded = best_first_search(make_profile([[1, 2, 3, 4], [4, 2, 3, 1]]), sequential_branches, 'sum', 1)
+    >>> found, expanded
+    ([[[0, 1], [3, 2]]], 2)
+    """
+    values = agent_values(profile)
+    ranked = [sorted(range(len(profile.items)), key=lambda i: -row[i]) for row in values]
+    root = tuple(range(len(profile.items)))
+    # An entry is (-bound, path, remaining items, level, first agent's items, second agent's items, scores), where
+    # path holds the index of the branch taken at every step, so entries with the same bound leave in the order of
+    # the depth-first search and no two entries compare further than their paths.
+    heap = [(-score_bound(objective, values, ranked, root, 0, 0), (), root, 1, (), (), 0, 0)]
+    found = []
+    expanded = 0
+    while heap and len(found) < k:
+        _, path, items, level, A_items, B_items, A_score, B_score = heapq.heappop(heap)
+        if not items:
+            found.append([list(A_items), list(B_items)])
+            continue
+        expanded += 1
+        branches = branches_function(profile, list(items), level)
+        while not branches:
+            level += 1
+            branches = branches_function(profile, list(items), level)
+        for index, (i, j) in enumerate(branches):
+            _items = tuple(item for item in items if item != i and item != j)
+            _A_score, _B_score = A_score + values[0][i], B_score + values[1][j]
+            bound = score_bound(objective, values, ranked, _items, _A_score, _B_score)
+            heapq.heappush(heap, (-bound, path + (index,), _items, level + 1, A_items + (i,), B_items + (j,),
+                                  _A_score, _B_score))
+    return found, expanded
+
+
+def score_bound(objective: str, values: List[List[Any]], ranked: List[List[int]], items, A_score, B_score):
+    """
+    Returns an upper bound on the objective of the allocations that split the remaining items in half, given the
+    scores so far. With no items left it is the objective of the allocation.
+
+    :param objective 'max-min', 'difference' or 'sum'.
+    :param values the values of both agents, see agent_values().
+    :param ranked the item positions of every agent, the most valued first.
+    :param items the positions of the items that are not allocated yet.
+    :param A_score the first agent's score so far.
+    :param B_score the second agent's score so far.
+
+    >>> values = [[4, 3, 2, 1], [1, 3, 2, 4]]
+    >>> ranked = [[0, 1, 2, 3], [3, 1, 2, 0]]
+    >>> score_bound('max-min', values, ranked, (0, 1, 2, 3), 0, 0), score_bound('difference', values, ranked, (), 7, 6)
+    (6.5, -1)
+    """
+    half = len(items) // 2
+    remaining = set(items)
+    (A_low, A_high), (B_low, B_high) = [half_sums(row, order, remaining, half) for row, order in zip(values, ranked)]
+    if objective == 'difference':
+        low = A_score + A_low - B_score - B_high
+        high = A_score + A_high - B_score - B_low
+        return -max(low, -high, 0)
+    total = A_score + B_score + min(A_high + B_high, sum(max(values[0][i], values[1][i]) for i in items))
+    if objective == 'max-min':
+        return min(A_score + A_high, B_score + B_high, total / 2)
+    return total
+
+
+def half_sums(row: List[Any], order: List[int], remaining: set, half: int):
+    """
+    Returns the sums of the worst and of the best half of the remaining values of an agent.
+
+    :param row the agent's values.
+    :param order the item positions, the most valued first.
+    :param remaining the positions of the items that are not allocated yet.
+    :param half the number of items the agent gets.
+    """
+    kept = [row[i] for i in order if i in remaining]
+    return sum(kept[len(kept) - half:]), sum(kept[:half])
@@ -4,10 +4,18 @@ By: D. Marc Kilgour, Rudolf Vetschera
 
 programmers: Itay Hasidi & Amichai Bitan
 """
+from __future__ import annotations
+from typing import List, Any, Dict, TYPE_CHECKING
 from utils_two_player_fair_division import *
+from profile_two_player_fair_division import *
+from picking_two_player_fair_division import *
+from oracle_two_player_fair_division import *
+import bisect
 import logging
-from fairpy import fairpy
-from fairpy.fairpy.agentlist import AgentList
+import random
+
+if TYPE_CHECKING:
+    from fairpy.fairpy.agentlist import AgentList
 
 
 # logging.basicConfig(level=loggining.DEBUG)
@@ -20,10 +28,11 @@ def sequential(agents: AgentList, items: List[Any] = None) -> Dict:
     one Pareto optimality allocation.
 
     :param agents A list that represent the players(agents) and for each player his valuation for each item, plus the
-    player's name.
-    :param items A list of all existing items (U).
+    player's name. Or a (2, n) array of ranks, see make_profile().
+    :param items A list of all existing items (U), or the item names of a rank array.
 
     # test 1 :
+    >>> from fairpy import fairpy
     >>> Alice = fairpy.agents.AdditiveAgent({'computer': 1, 'phone': 2, 'tv': 3, 'book': 4}, name = 'Alice')
     >>> George = fairpy.agents.AdditiveAgent({'computer': 4, 'phone': 2, 'tv': 3, 'book': 1}, name = 'George')
     >>> sequential([Alice, George], ['computer', 'phone', 'tv', 'book'])
@@ -59,52 +68,105 @@ def sequential(agents: AgentList, items: List[Any] = None) -> Dict:
     >>> sequential([Alice, George], ['a', 'b', 'c', 'd', 'e', 'f','g','h','i' , 'j'])
     [{'Alice': ['a', 'b', 'd', 'f', 'h'], 'George': ['i', 'j', 'c', 'e', 'g']}, {'Alice': ['a', 'b', 'd', 'g', 'h'], 'George': ['i', 'j', 'c', 'e', 'f']}, {'Alice': ['a', 'b', 'e', 'f', 'h'], 'George': ['i', 'j', 'c', 'd', 'g']}]
 
-    """
+    # test 7: a rank array
+    >>> sequential([[1, 2, 3, 4], [4, 2, 3, 1]], ['computer', 'phone', 'tv', 'book'])
+    [{0: ['computer', 'phone'], 1: ['book', 'tv']}, {0: ['computer', 'tv'], 1: ['book', 'phone']}]
 
-    return recursive_sequential(agents, items, allocations=[[], []], end_allocation=[])
+    """
+    profile = make_profile(agents, items)
+    return recursive_sequential(profile, list(range(len(profile.items))), allocations=[[], []], end_allocation=[])
 
 
-def recursive_sequential(agents: AgentList, items: List[Any], allocations: List[Any] = [[], []],
-                     end_allocation=[], level: int = 1):
+def recursive_sequential(profile: Profile, items: List[int], allocations: List[Any] = None,
+                         end_allocation: List[Dict] = None, level: int = 1):
     """
     A recursive helper function to sequential()
 
-    :param agents A list that represent the players(agents) and for each player his valuation for each item, plus the
-    player's name.
-    :param items A list of all existing items (U).
+    :param profile the preferences of the agents, see make_profile().
+    :param items the positions of all existing items (U).
     :param allocations is the allocation for each player so far.
     :param end_allocation is the end allocation for each player.
     :param level is the depth level for item searching for each iteration.
     """
-    logger.info("\nAlgorithm: OS\nTwo Agents %s %s and items %s", agents[0].name(), agents[1].name(), items)
+    if allocations is None:
+        allocations = [[], []]
+    if end_allocation is None:
+        end_allocation = []
+    logger.info("\nAlgorithm: OS\nTwo Agents %s %s and items %s", profile.names[0], profile.names[1], items)
     if not items:
-        end_allocation.append({agents[0].name(): allocations[0], agents[1].name(): allocations[1]})
+        end_allocation.append(allocation_dict(profile, allocations))
         return end_allocation
-    H_A_level, H_B_level = H_M_l(agents, items, level)
-    logger.info("current allocations: \n%s: %s\n%s: %s", agents[0].name(), allocations[0], agents[1].name(),
-                allocations[0])
-    if H_A_level and H_B_level and have_different_elements(H_A_level, H_B_level):
-        for i in H_A_level:
-            for j in H_B_level:
-                if i != j:
-                    _allocations = deep_copy_2d_list(allocations)
-                    _items, _allocations = allocate(items.copy(), _allocations, i, j)
-                    recursive_sequential(agents, _items, _allocations, end_allocation, level + 1)
+    branches = sequential_branches(profile, items, level)
+    logger.info("current allocations: \n%s: %s\n%s: %s", profile.names[0], allocations[0], profile.names[1],
+                allocations[1])
+    if branches:
+        for i, j in branches:
+            _items, _allocations = allocate(items, allocations, i, j)
+            recursive_sequential(profile, _items, _allocations, end_allocation, level + 1)
     else:
-        recursive_sequential(agents, items, allocations, end_allocation, level + 1)
+        recursive_sequential(profile, items, allocations, end_allocation, level + 1)
     return end_allocation
 
 
+def sequential_branches(profile: Profile, items: List[int], level: int):
+    """
+    Returns the (A item, B item) pairs that sequential() branches on at the given level, in the order it visits them.
+    An empty list means no item is allocated at this level and the search moves on to the next one.
+
+    :param profile the preferences of the agents, see make_profile().
+    :param items the positions of the items that are not allocated yet.
+    :param level is the depth level for item searching for each iteration.
+
+    >>> profile = make_profile([[1, 2, 3, 4], [4, 2, 3, 1]])
+    >>> sequential_branches(profile, [0, 1, 2, 3], 1)
+    [(0, 3)]
+    >>> sequential_branches(profile, [1, 2], 2)
+    []
+    >>> sequential_branches(profile, [1, 2], 3)
+    [(1, 2), (2, 1)]
+    """
+    H_A_level, H_B_level = desired_items(profile, items, level)
+    if not (H_A_level and H_B_level and have_different_elements(H_A_level, H_B_level)):
+        return []
+    return [(i, j) for i in H_A_level for j in H_B_level if i != j]
+
+
+def count_sequential(agents: AgentList, items: List[Any] = None) -> int:
+    """
+    Returns the number of allocations sequential() returns, without building them.
+    Every search state (remaining items, level) is counted once, so the running time depends on the number of distinct
+    states and not on the number of allocations.
+
+    :param agents A list that represent the players(agents) and for each player his valuation for each item, plus the
+    player's name. Or a (2, n) array of ranks, see make_profile().
+    :param items A list of all existing items (U), or the item names of a rank array.
+
+    >>> from fairpy import fairpy
+    >>> Alice = fairpy.agents.AdditiveAgent({'computer': 1, 'phone': 3, 'tv': 2, 'book': 4}, name = 'Alice')
+    >>> George = fairpy.agents.AdditiveAgent({'computer': 1, 'phone': 2, 'tv': 3, 'book': 4}, name = 'George')
+    >>> count_sequential([Alice, George], ['computer', 'phone', 'tv', 'book'])
+    6
+
+    >>> Alice = fairpy.agents.AdditiveAgent({'a': 1, 'b': 2, 'c': 3, 'd': 4, 'e': 5, 'f': 6}, name = 'Alice')
+    >>> George = fairpy.agents.AdditiveAgent({'c': 1, 'a': 2, 'd': 3, 'b': 4, 'f': 5, 'e': 6}, name = 'George')
+    >>> count_sequential([Alice, George], ['a', 'b', 'c', 'd', 'e', 'f'])
+    1
+    """
+    profile = make_profile(agents, items)
+    return count_allocations_helper(profile, list(range(len(profile.items))), sequential_branches, level=1, memo={})
+
+
 def restricted_simple(agents: AgentList, items: List[Any] = None) -> Dict:
     """
     a.k.a RS. The algorithm does not return envy-free allocations, does not return max-min allocations and does not
     return one Pareto optimality allocations.
 
     :param agents A list that represent the players(agents) and for each player his valuation for each item, plus the
-    player's name.
-    :param items A list of all existing items (U).
+    player's name. Or a (2, n) array of ranks, see make_profile().
+    :param items A list of all existing items (U), or the item names of a rank array.
 
     # test1:
+    >>> from fairpy import fairpy
     >>> Alice = fairpy.agents.AdditiveAgent({'computer': 1, 'phone': 2, 'tv': 3, 'book': 4}, name = 'Alice')
     >>> George = fairpy.agents.AdditiveAgent({'computer': 4, 'phone': 2, 'tv': 3, 'book': 1}, name = 'George')
     >>> restricted_simple([Alice, George], ['computer', 'phone', 'tv', 'book'])
@@ -141,59 +203,231 @@ def restricted_simple(agents: AgentList, items: List[Any] = None) -> Dict:
     [{'Alice': ['a', 'b', 'd', 'f', 'h'], 'George': ['i', 'j', 'c', 'e', 'g']}]
 
     """
-    logger.debug("\nAlgorithm: RS\nTwo Agents %s %s and items %s", agents[0].name(), agents[1].name(), items)
-    return recursive_restricted_simple(agents, items, allocations=[[], []], end_allocation=[])
+    profile = make_profile(agents, items)
+    logger.debug("\nAlgorithm: RS\nTwo Agents %s %s and items %s", profile.names[0], profile.names[1], profile.items)
+    return recursive_restricted_simple(profile, list(range(len(profile.items))), allocations=[[], []],
+                                       end_allocation=[])
 
 
-def recursive_restricted_simple(agents: AgentList, items: List[Any], allocations: List[Any] = [[], []],
-                                end_allocation=[], level: int = 1):
+def recursive_restricted_simple(profile: Profile, items: List[int], allocations: List[Any] = None,
+                                end_allocation: List[Dict] = None, level: int = 1):
     """
     A recursive helper function to restricted_simple()
 
-    :param agents A list that represent the players(agents) and for each player his valuation for each item, plus the
-    player's name.
-    :param items A list of all existing items (U).
+    :param profile the preferences of the agents, see make_profile().
+    :param items the positions of all existing items (U).
     :param allocations is the allocation for each player so far.
     :param end_allocation is the end allocation for each player.
     :param level is the depth level for item searching for each iteration.
     """
+    if allocations is None:
+        allocations = [[], []]
+    if end_allocation is None:
+        end_allocation = []
     if not items:
-        end_allocation.append({agents[0].name(): allocations[0], agents[1].name(): allocations[1]})
+        end_allocation.append(allocation_dict(profile, allocations))
         return end_allocation
-    H_A_level, H_B_level = H_M_l(agents, items, level)
-    logger.info("current allocations: \n%s: %s\n%s: %s", agents[0].name(), allocations[0], agents[1].name(),
-                allocations[0])
-    if H_A_level and H_B_level and have_different_elements(H_A_level, H_B_level):
-        if H_A_level[0] != H_B_level[0]:
-            _allocations = deep_copy_2d_list(allocations)
-            _items, _allocations = allocate(items.copy(), _allocations, H_A_level[0], H_B_level[0])
-            recursive_restricted_simple(agents, _items, _allocations, end_allocation=end_allocation, level=level + 1)
-        else:
-            if len(H_A_level) > 1:
-                _allocations = deep_copy_2d_list(allocations)
-                _items, _allocations = allocate(items.copy(), _allocations, H_A_level[1], H_B_level[0])
-                recursive_restricted_simple(agents, _items, _allocations, end_allocation=end_allocation,
-                                            level=level + 1)
-            if len(H_B_level) > 1:
-                _allocations = deep_copy_2d_list(allocations)
-                _items, _allocations = allocate(items.copy(), _allocations, H_A_level[0], H_B_level[1])
-                recursive_restricted_simple(agents, _items, _allocations, end_allocation=end_allocation,
-                                            level=level + 1)
+    branches = restricted_simple_branches(profile, items, level)
+    logger.info("current allocations: \n%s: %s\n%s: %s", profile.names[0], allocations[0], profile.names[1],
+                allocations[1])
+    if branches:
+        for i, j in branches:
+            _items, _allocations = allocate(items, allocations, i, j)
+            recursive_restricted_simple(profile, _items, _allocations, end_allocation=end_allocation, level=level + 1)
     else:
-        recursive_restricted_simple(agents, items, allocations, end_allocation=end_allocation, level=level + 1)
+        recursive_restricted_simple(profile, items, allocations, end_allocation=end_allocation, level=level + 1)
     return end_allocation
 
 
+def restricted_simple_branches(profile: Profile, items: List[int], level: int):
+    """
+    Returns the (A item, B item) pairs that restricted_simple() branches on at the given level, in the order it visits
+    them. An empty list means no item is allocated at this level and the search moves on to the next one.
+
+    :param profile the preferences of the agents, see make_profile().
+    :param items the positions of the items that are not allocated yet.
+    :param level is the depth level for item searching for each iteration.
+
+    >>> profile = make_profile([[1, 3, 2, 4], [1, 2, 3, 4]])
+    >>> restricted_simple_branches(profile, [0, 1, 2, 3], 1)
+    []
+    >>> restricted_simple_branches(profile, [0, 1, 2, 3], 2)
+    [(2, 0), (0, 1)]
+    """
+    H_A_level, H_B_level = desired_items(profile, items, level)
+    if not (H_A_level and H_B_level and have_different_elements(H_A_level, H_B_level)):
+        return []
+    if H_A_level[0] != H_B_level[0]:
+        return [(H_A_level[0], H_B_level[0])]
+    branches = []
+    if len(H_A_level) > 1:
+        branches.append((H_A_level[1], H_B_level[0]))
+    if len(H_B_level) > 1:
+        branches.append((H_A_level[0], H_B_level[1]))
+    return branches
+
+
+def count_restricted_simple(agents: AgentList, items: List[Any] = None) -> int:
+    """
+    Returns the number of allocations restricted_simple() returns, without building them.
+
+    :param agents A list that represent the players(agents) and for each player his valuation for each item, plus the
+    player's name. Or a (2, n) array of ranks, see make_profile().
+    :param items A list of all existing items (U), or the item names of a rank array.
+
+    >>> from fairpy import fairpy
+    >>> Alice = fairpy.agents.AdditiveAgent({'computer': 1, 'phone': 3, 'tv': 2, 'book': 4}, name = 'Alice')
+    >>> George = fairpy.agents.AdditiveAgent({'computer': 1, 'phone': 2, 'tv': 3, 'book': 4}, name = 'George')
+    >>> count_restricted_simple([Alice, George], ['computer', 'phone', 'tv', 'book'])
+    4
+    """
+    profile = make_profile(agents, items)
+    return count_allocations_helper(profile, list(range(len(profile.items))), restricted_simple_branches, level=1,
+                                    memo={})
+
+
+def count_allocations_helper(profile: Profile, items: List[int], branches_function, level: int, memo: Dict):
+    """
+    A recursive helper function to count_sequential() and count_restricted_simple().
+    Counts the complete allocations below a search state, memoized by (remaining items, level).
+
+    :param profile the preferences of the agents, see make_profile().
+    :param items the positions of the items that are not allocated yet.
+    :param branches_function sequential_branches or restricted_simple_branches.
+    :param level is the depth level for item searching for each iteration.
+    :param memo maps a search state to the number of allocations below it.
+    """
+    if not items:
+        return 1
+    key = (frozenset(items), level)
+    if key in memo:
+        return memo[key]
+    branches = branches_function(profile, items, level)
+    if branches:
+        count = 0
+        for i, j in branches:
+            _items = [item for item in items if item != i and item != j]
+            count += count_allocations_helper(profile, _items, branches_function, level + 1, memo)
+    else:
+        count = count_allocations_helper(profile, items, branches_function, level + 1, memo)
+    memo[key] = count
+    return count
+
+
+def sample_sequential(agents: AgentList, items: List[Any] = None, samples: int = 1, seed=None) -> List[Dict]:
+    """
+    Draws allocations uniformly at random from the list sequential() would return, without building that list.
+
+    :param agents A list that represent the players(agents) and for each player his valuation for each item, plus the
+    player's name. Or a (2, n) array of ranks, see make_profile().
+    :param items A list of all existing items (U), or the item names of a rank array.
+    :param samples is the number of allocations to draw.
+    :param seed is the seed of the random generator, the same seed always draws the same allocations.
+
+    >>> from fairpy import fairpy
+    >>> Alice = fairpy.agents.AdditiveAgent({'a': 1, 'b': 2, 'c': 3, 'd': 4, 'e': 5, 'f': 6}, name = 'Alice')
+    >>> George = fairpy.agents.AdditiveAgent({'c': 1, 'a': 2, 'd': 3, 'b': 4, 'f': 5, 'e': 6}, name = 'George')
+    >>> sample_sequential([Alice, George], ['a', 'b', 'c', 'd', 'e', 'f'], samples=2, seed=1)
+    [{'Alice': ['a', 'b', 'e'], 'George': ['c', 'd', 'f']}, {'Alice': ['a', 'b', 'e'], 'George': ['c', 'd', 'f']}]
+    """
+    profile = make_profile(agents, items)
+    return sample_allocations_helper(profile, list(range(len(profile.items))), sequential_branches, samples,
+                                     random.Random(seed))
+
+
+def sample_restricted_simple(agents: AgentList, items: List[Any] = None, samples: int = 1, seed=None) -> List[Dict]:
+    """
+    Draws allocations uniformly at random from the list restricted_simple() would return, without building that list.
+
+    :param agents A list that represent the players(agents) and for each player his valuation for each item, plus the
+    player's name. Or a (2, n) array of ranks, see make_profile().
+    :param items A list of all existing items (U), or the item names of a rank array.
+    :param samples is the number of allocations to draw.
+    :param seed is the seed of the random generator, the same seed always draws the same allocations.
+
+    >>> from fairpy import fairpy
+    >>> Alice = fairpy.agents.AdditiveAgent({'a': 1, 'b': 2, 'c': 3, 'd': 4, 'e': 5, 'f': 6}, name = 'Alice')
+    >>> George = fairpy.agents.AdditiveAgent({'c': 1, 'a': 2, 'd': 3, 'b': 4, 'f': 5, 'e': 6}, name = 'George')
+    >>> sample_restricted_simple([Alice, George], ['a', 'b', 'c', 'd', 'e', 'f'])
+    [{'Alice': ['a', 'b', 'e'], 'George': ['c', 'd', 'f']}]
+    """
+    profile = make_profile(agents, items)
+    return sample_allocations_helper(profile, list(range(len(profile.items))), restricted_simple_branches, samples,
+                                     random.Random(seed))
+
+
+def sample_allocations_helper(profile: Profile, items: List[int], branches_function, samples: int,
+                              rng: random.Random) -> List[Dict]:
+    """
+    A helper function to sample_sequential() and sample_restricted_simple().
+    Walks from the root of the search tree to a leaf, picking every branch with probability proportional to the number
+    of allocations below it, so every allocation is equally likely.
+    The branch table of a search state is built on its first visit, after that a step costs one binary search.
+
+    :param profile the preferences of the agents, see make_profile().
+    :param items the positions of all existing items (U).
+    :param branches_function sequential_branches or restricted_simple_branches.
+    :param samples is the number of allocations to draw.
+    :param rng is the random generator the branches are drawn with.
+    """
+    memo = {}
+    tables = {}
+    count_allocations_helper(profile, items, branches_function, level=1, memo=memo)
+    end_allocation = []
+    for _ in range(samples):
+        allocations = [[], []]
+        state = (frozenset(items), 1)
+        while state[0]:
+            if state not in tables:
+                tables[state] = branch_table(profile, state, branches_function, memo)
+            branches, cumulative, children = tables[state]
+            k = bisect.bisect_right(cumulative, rng.randrange(cumulative[-1]))
+            i, j = branches[k]
+            if i is not None:
+                allocations[0].append(i)
+                allocations[1].append(j)
+            state = children[k]
+        end_allocation.append(allocation_dict(profile, allocations))
+    return end_allocation
+
+
+def branch_table(profile: Profile, state, branches_function, memo: Dict):
+    """
+    Returns the branches of a search state together with the running totals of the allocations below them and the
+    search state each branch leads to.
+    A level without allocation is recorded as the single branch (None, None).
+
+    :param profile the preferences of the agents, see make_profile().
+    :param state is a (remaining items, level) pair.
+    :param branches_function sequential_branches or restricted_simple_branches.
+    :param memo is the table filled by count_allocations_helper().
+    """
+    items, level = state
+    branches = branches_function(profile, list(items), level)
+    if not branches:
+        return [(None, None)], [1], [(items, level + 1)]
+    cumulative = []
+    children = []
+    total = 0
+    for i, j in branches:
+        child = (items - {i, j}, level + 1)
+        total += count_allocations_helper(profile, list(child[0]), branches_function, level + 1, memo)
+        cumulative.append(total)
+        children.append(child)
+    return branches, cumulative, children
+
+
 def singles_doubles(agents: AgentList, items: List[Any] = None) -> Dict:
     """
     a.k.a SD. The algorithm returns envy-free allocations, returns max-min allocations and returns one Pareto
     optimality allocations.
 
     :param agents A list that represent the players(agents) and for each player his valuation for each item, plus the
-    player's name.
-    :param items A list of all existing items (U).
+    player's name. Or a (2, n) array of ranks, see make_profile().
+    :param items A list of all existing items (U), or the item names of a rank array.
 
     # test 1:
+    >>> from fairpy import fairpy
     >>> Alice = fairpy.agents.AdditiveAgent({'computer': 1, 'phone': 2, 'tv': 3, 'book': 4}, name = 'Alice')
     >>> George = fairpy.agents.AdditiveAgent({'computer': 4, 'phone': 2, 'tv': 3, 'book': 1}, name = 'George')
     >>> singles_doubles([Alice, George], ['computer', 'phone', 'tv', 'book'])
@@ -223,57 +457,83 @@ def singles_doubles(agents: AgentList, items: List[Any] = None) -> Dict:
     >>> singles_doubles([Alice, George], ['a', 'b', 'c', 'd', 'e', 'f', 'g', 'h', 'i', 'j'])
     []
     """
-    logger.debug("\nAlgorithm: SD\nTwo Agents %s %s and items %s", agents[0].name(), agents[1].name(), items)
-    return singles_doubles_helper(agents, items, allocations=[[], []], end_allocation=[], do_single=True)
+    profile = make_profile(agents, items)
+    logger.debug("\nAlgorithm: SD\nTwo Agents %s %s and items %s", profile.names[0], profile.names[1], profile.items)
+    return singles_doubles_helper(profile, list(range(len(profile.items))), do_single=True)
 
 
-def singles_doubles_helper(agents: AgentList, items: List[Any] = None, allocations=[[], []], end_allocation=[],
+def singles_doubles_helper(profile: Profile, items: List[int] = None, allocations=None, end_allocation=None,
                            do_single: bool = False) -> Dict:
     """
     A recursive helper function to singles_doubles()
 
-    :param agents A list that represent the players(agents) and for each player his valuation for each item, plus the
-    player's name.
-    :param items A list of all existing items (U).
+    :param profile the preferences of the agents, see make_profile().
+    :param items the positions of all existing items (U).
     :param allocations is the allocation for each player so far.
     :param end_allocation is the end allocation for each player.
     :param do_single is a boolean flag that indicates if the singles() algorithm should be used or not, in this function
      it will only be used the first time the function is called.
     """
+    if allocations is None:
+        allocations = [[], []]
+    if end_allocation is None:
+        end_allocation = []
     if do_single:
-        A_items, B_items = get_valuation_list(agents, items)
-        singles(A_items.copy(), B_items.copy(), items, allocations)
+        A_items, B_items = ranked_items(profile, items)
+        _, items, allocations = singles(A_items, B_items, items, allocations)
+        if items and len(items) % 2 == 0 and not equal_scores_exist(profile, items, allocations):
+            return end_allocation
     if not items:
-        if is_envy_free_partial_allocation(agents, allocations):
-            end_allocation.append({agents[0].name(): allocations[0], agents[1].name(): allocations[1]})
+        if has_equal_scores(profile, allocations):
+            end_allocation.append(allocation_dict(profile, allocations))
             return end_allocation
         return
-    H_A_level, H_B_level = H_M_l(agents, items, len(agents[0].all_items()))
-    if H_A_level[0] != H_B_level[0]:
-        _allocations = deep_copy_2d_list(allocations)
-        _items, _allocations = allocate(agents, items.copy(), _allocations, H_A_level[0], H_B_level[0])
-        singles_doubles_helper(agents, _items, _allocations, end_allocation)
-    temp_allocation_1 = deep_copy_2d_list(allocations)
-    temp_allocation_2 = deep_copy_2d_list(allocations)
-    items_1, temp_allocation_1 = allocate(items.copy(), temp_allocation_1, H_A_level[0], H_B_level[1])
-    items_2, temp_allocation_2 = allocate(items.copy(), temp_allocation_2, H_A_level[1], H_B_level[0])
-    logger.info("current allocations: \n%s: %s\n%s: %s", agents[0].name(), allocations[0], agents[1].name(),
-                allocations[0])
-    singles_doubles_helper(agents, items_1, temp_allocation_1, end_allocation)
-    singles_doubles_helper(agents, items_2, temp_allocation_2, end_allocation)
+    logger.info("current allocations: \n%s: %s\n%s: %s", profile.names[0], allocations[0], profile.names[1],
+                allocations[1])
+    for i, j in singles_doubles_branches(profile, items):
+        _items, _allocations = allocate(items, allocations, i, j)
+        singles_doubles_helper(profile, _items, _allocations, end_allocation)
     return end_allocation
 
 
+def singles_doubles_branches(profile: Profile, items: List[int], level: int = None):
+    """
+    Returns the (A item, B item) pairs that singles_doubles(), iterated_singles_doubles(), s1() and l1() branch on
+    after the singles are allocated. The first and second items of an agent are the first two remaining items in the
+    order the agent states them (see desired_items()). If the agents' first items differ, both get them, otherwise
+    there are the two ways of giving one agent its first item and the other agent its second one.
+
+    :param profile the preferences of the agents, see make_profile().
+    :param items the positions of the items that are not allocated yet.
+    :param level is the rank up to which the items count, the number of items of the profile by default.
+
+    >>> profile = make_profile([[1, 2, 3, 4], [1, 2, 3, 4]])
+    >>> singles_doubles_branches(profile, [0, 1, 2, 3])
+    [(0, 1), (1, 0)]
+    >>> singles_doubles_branches(profile, [1, 2])
+    [(1, 2), (2, 1)]
+    >>> singles_doubles_branches(make_profile([[1, 2], [2, 1]]), [0, 1])
+    [(0, 1), (1, 0)]
+    >>> singles_doubles_branches(Profile([0, 1], ['a', 'b'], [[1, 2], [2, 1]], [[0, 1], [1, 0]]), [0, 1])
+    [(0, 1)]
+    """
+    H_A_level, H_B_level = desired_items(profile, items, len(profile.items) if level is None else level)
+    if H_A_level[0] != H_B_level[0]:
+        return [(H_A_level[0], H_B_level[0])]
+    return [(H_A_level[0], H_B_level[1]), (H_A_level[1], H_B_level[0])]
+
+
 def iterated_singles_doubles(agents: AgentList, items: List[Any] = None) -> Dict:
     """
     a.k.a IS. The algorithm returns envy-free allocations, returns max-min allocations and returns one Pareto
     optimality allocations.
 
     :param agents A list that represent the players(agents) and for each player his valuation for each item, plus the
-    player's name.
-    :param items A list of all existing items (U).
+    player's name. Or a (2, n) array of ranks, see make_profile().
+    :param items A list of all existing items (U), or the item names of a rank array.
 
     # test 1:
+    >>> from fairpy import fairpy
     >>> Alice = fairpy.agents.AdditiveAgent({'computer': 1, 'phone': 2, 'tv': 3, 'book': 4}, name = 'Alice')
     >>> George = fairpy.agents.AdditiveAgent({'computer': 4, 'phone': 2, 'tv': 3, 'book': 1}, name = 'George')
     >>> iterated_singles_doubles([Alice, George], ['computer', 'phone', 'tv', 'book'])
@@ -303,46 +563,44 @@ def iterated_singles_doubles(agents: AgentList, items: List[Any] = None) -> Dict
     >>> iterated_singles_doubles([Alice, George], ['a', 'b', 'c', 'd', 'e', 'f','g','h','i' , 'j'])
     []
     """
-    logger.debug("\nAlgorithm: IS\nTwo Agents %s %s and items %s", agents[0].name(), agents[1].name(), items)
-    return iterated_singles_doubles_helper(agents, items, allocations=[[], []], end_allocation=[], do_single=True)
+    profile = make_profile(agents, items)
+    logger.debug("\nAlgorithm: IS\nTwo Agents %s %s and items %s", profile.names[0], profile.names[1], profile.items)
+    return iterated_singles_doubles_helper(profile, list(range(len(profile.items))), do_single=True)
 
 
-def iterated_singles_doubles_helper(agents: AgentList, items: List[Any] = None, allocations=[[], []], end_allocation=[],
+def iterated_singles_doubles_helper(profile: Profile, items: List[int] = None, allocations=None, end_allocation=None,
                                     do_single: bool = False) -> Dict:
     """
     A recursive helper function to iterated_singles_doubles()
 
-    :param agents A list that represent the players(agents) and for each player his valuation for each item, plus the
-    player's name.
-    :param items A list of all existing items (U).
+    :param profile the preferences of the agents, see make_profile().
+    :param items the positions of all existing items (U).
     :param allocations is the allocation for each player so far.
     :param end_allocation is the end allocation for each player.
     :param do_single is a boolean flag that indicates if the singles() algorithm should be used or not, in this function
      it will only be used the first time the function is called as many times as possible.
     """
+    if allocations is None:
+        allocations = [[], []]
+    if end_allocation is None:
+        end_allocation = []
     if do_single:
-        A_items, B_items = get_valuation_list(agents, items)
+        A_items, B_items = ranked_items(profile, items)
         flag = True
         while flag:
-            flag, allocations = singles(A_items.copy(), B_items.copy(), items, allocations)
+            flag, items, allocations = singles(A_items, B_items, items, allocations)
+        if items and len(items) % 2 == 0 and not equal_scores_exist(profile, items, allocations):
+            return end_allocation
     if not items:
-        if is_envy_free_partial_allocation(agents, allocations):
-            end_allocation.append({agents[0].name(): allocations[0], agents[1].name(): allocations[1]})
+        if has_equal_scores(profile, allocations):
+            end_allocation.append(allocation_dict(profile, allocations))
             return end_allocation
         return
-    H_A_level, H_B_level = H_M_l(agents, items, len(agents[0].all_items()))
-    if H_A_level[0] != H_B_level[0]:
-        _allocations = deep_copy_2d_list(allocations)
-        _items, _allocations = allocate(agents, items.copy(), _allocations, H_A_level[0], H_B_level[0])
-        iterated_singles_doubles_helper(agents, _items, _allocations, end_allocation)
-    temp_allocation_1 = deep_copy_2d_list(allocations)
-    temp_allocation_2 = deep_copy_2d_list(allocations)
-    items_1, temp_allocation_1 = allocate(items.copy(), temp_allocation_1, H_A_level[0], H_B_level[1])
-    items_2, temp_allocation_2 = allocate(items.copy(), temp_allocation_2, H_A_level[1], H_B_level[0])
-    logger.info("current allocations: \n%s: %s\n%s: %s", agents[0].name(), allocations[0], agents[1].name(),
-                allocations[0])
-    iterated_singles_doubles_helper(agents, items_1, temp_allocation_1, end_allocation)
-    iterated_singles_doubles_helper(agents, items_2, temp_allocation_2, end_allocation)
+    logger.info("current allocations: \n%s: %s\n%s: %s", profile.names[0], allocations[0], profile.names[1],
+                allocations[1])
+    for i, j in singles_doubles_branches(profile, items):
+        _items, _allocations = allocate(items, allocations, i, j)
+        iterated_singles_doubles_helper(profile, _items, _allocations, end_allocation)
     return end_allocation
 
 
@@ -351,10 +609,11 @@ def s1(agents: AgentList, items: List[Any] = None) -> Dict:
     The algorithm returns envy-free allocations if they exist and returns max-min allocations.
 
     :param agents A list that represent the players(agents) and for each player his valuation for each item, plus the
-    player's name.
-    :param items A list of all existing items (U).
+    player's name. Or a (2, n) array of ranks, see make_profile().
+    :param items A list of all existing items (U), or the item names of a rank array.
 
     # test 1:
+    >>> from fairpy import fairpy
     >>> Alice = fairpy.agents.AdditiveAgent({'computer': 1, 'phone': 2, 'tv': 3, 'book': 4}, name = 'Alice')
     >>> George = fairpy.agents.AdditiveAgent({'computer': 4, 'phone': 2, 'tv': 3, 'book': 1}, name = 'George')
     >>> s1([Alice, George], ['computer', 'phone', 'tv', 'book'])
@@ -384,42 +643,38 @@ def s1(agents: AgentList, items: List[Any] = None) -> Dict:
     >>> s1([Alice, George], ['a', 'b', 'c', 'd', 'e', 'f','g','h','i' , 'j'])
     [{'Alice': ['h', 'g', 'a', 'c', 'e'], 'George': ['j', 'i', 'b', 'd', 'f']}, {'Alice': ['h', 'g', 'a', 'c', 'f'], 'George': ['j', 'i', 'b', 'd', 'e']}, {'Alice': ['h', 'g', 'a', 'd', 'e'], 'George': ['j', 'i', 'b', 'c', 'f']}, {'Alice': ['h', 'g', 'a', 'd', 'f'], 'George': ['j', 'i', 'b', 'c', 'e']}, {'Alice': ['h', 'g', 'b', 'c', 'e'], 'George': ['j', 'i', 'a', 'd', 'f']}, {'Alice': ['h', 'g', 'b', 'c', 'f'], 'George': ['j', 'i', 'a', 'd', 'e']}, {'Alice': ['h', 'g', 'b', 'd', 'e'], 'George': ['j', 'i', 'a', 'c', 'f']}, {'Alice': ['h', 'g', 'b', 'd', 'f'], 'George': ['j', 'i', 'a', 'c', 'e']}]
     """
-    logger.debug("\nAlgorithm: S1\nTwo Agents %s %s and items %s", agents[0].name(), agents[1].name(), items)
-    return s1_helper(agents, items, allocations=[[], []], end_allocation=[], do_single=True)
+    profile = make_profile(agents, items)
+    logger.debug("\nAlgorithm: S1\nTwo Agents %s %s and items %s", profile.names[0], profile.names[1], profile.items)
+    return s1_helper(profile, list(range(len(profile.items))), allocations=[[], []], end_allocation=[], do_single=True)
 
 
-def s1_helper(agents: AgentList, items: List[Any] = None, allocations=[[], []], end_allocation=[],
+def s1_helper(profile: Profile, items: List[int] = None, allocations=None, end_allocation=None,
               do_single: bool = False) -> Dict:
     """
     A recursive helper function to s1()
 
-    :param agents A list that represent the players(agents) and for each player his valuation for each item, plus the
-    player's name.
-    :param items A list of all existing items (U).
+    :param profile the preferences of the agents, see make_profile().
+    :param items the positions of all existing items (U).
     :param allocations is the allocation for each player so far.
     :param end_allocation is the end allocation for each player.
     :param do_single is a boolean flag that indicates if the singles() algorithm should be used or not, in this function
      it will only be used the first time the function is called.
     """
+    if allocations is None:
+        allocations = [[], []]
+    if end_allocation is None:
+        end_allocation = []
     if do_single:
-        A_items, B_items = get_valuation_list(agents, items)
-        singles(A_items.copy(), B_items.copy(), items, allocations)
+        A_items, B_items = ranked_items(profile, items)
+        _, items, allocations = singles(A_items, B_items, items, allocations)
     if not items:
-        end_allocation.append({agents[0].name(): allocations[0], agents[1].name(): allocations[1]})
+        end_allocation.append(allocation_dict(profile, allocations))
         return end_allocation
-    H_A_level, H_B_level = H_M_l(agents, items, len(agents[0].all_items()))
-    if H_A_level[0] != H_B_level[0]:
-        _allocations = deep_copy_2d_list(allocations)
-        _items, _allocations = allocate(agents, items.copy(), _allocations, H_A_level[0], H_B_level[0])
-        s1_helper(agents, _items, _allocations, end_allocation)
-    temp_allocation_1 = deep_copy_2d_list(allocations)
-    temp_allocation_2 = deep_copy_2d_list(allocations)
-    items_1, temp_allocation_1 = allocate(items.copy(), temp_allocation_1, H_A_level[0], H_B_level[1])
-    items_2, temp_allocation_2 = allocate(items.copy(), temp_allocation_2, H_A_level[1], H_B_level[0])
-    logger.info("current allocations: \n%s: %s\n%s: %s", agents[0].name(), allocations[0], agents[1].name(),
-                allocations[0])
-    s1_helper(agents, items_1, temp_allocation_1, end_allocation)
-    s1_helper(agents, items_2, temp_allocation_2, end_allocation)
+    logger.info("current allocations: \n%s: %s\n%s: %s", profile.names[0], allocations[0], profile.names[1],
+                allocations[1])
+    for i, j in singles_doubles_branches(profile, items):
+        _items, _allocations = allocate(items, allocations, i, j)
+        s1_helper(profile, _items, _allocations, end_allocation)
     return end_allocation
 
 
@@ -428,10 +683,11 @@ def l1(agents: AgentList, items: List[Any] = None) -> Dict:
     The algorithm returns envy-free allocations if they exist and returns max-min allocations.
 
     :param agents A list that represent the players(agents) and for each player his valuation for each item, plus the
-    player's name.
-    :param items A list of all existing items (U).
+    player's name. Or a (2, n) array of ranks, see make_profile().
+    :param items A list of all existing items (U), or the item names of a rank array.
 
     # test 1:
+    >>> from fairpy import fairpy
     >>> Alice = fairpy.agents.AdditiveAgent({'computer': 1, 'phone': 2, 'tv': 3, 'book': 4}, name = 'Alice')
     >>> George = fairpy.agents.AdditiveAgent({'computer': 4, 'phone': 2, 'tv': 3, 'book': 1}, name = 'George')
     >>> l1([Alice, George], ['computer', 'phone', 'tv', 'book'])
@@ -461,44 +717,40 @@ def l1(agents: AgentList, items: List[Any] = None) -> Dict:
     >>> l1([Alice, George], ['a', 'b', 'c', 'd', 'e', 'f','g','h','i' , 'j'])
     [{'Alice': ['h', 'g', 'a', 'c', 'e'], 'George': ['j', 'i', 'b', 'd', 'f']}, {'Alice': ['h', 'g', 'a', 'c', 'f'], 'George': ['j', 'i', 'b', 'd', 'e']}, {'Alice': ['h', 'g', 'a', 'd', 'e'], 'George': ['j', 'i', 'b', 'c', 'f']}, {'Alice': ['h', 'g', 'a', 'd', 'f'], 'George': ['j', 'i', 'b', 'c', 'e']}, {'Alice': ['h', 'g', 'b', 'c', 'e'], 'George': ['j', 'i', 'a', 'd', 'f']}, {'Alice': ['h', 'g', 'b', 'c', 'f'], 'George': ['j', 'i', 'a', 'd', 'e']}, {'Alice': ['h', 'g', 'b', 'd', 'e'], 'George': ['j', 'i', 'a', 'c', 'f']}, {'Alice': ['h', 'g', 'b', 'd', 'f'], 'George': ['j', 'i', 'a', 'c', 'e']}]
     """
-    logger.debug("\nAlgorithm: L1\nTwo Agents %s %s and items %s", agents[0].name(), agents[1].name(), items)
-    return l1_helper(agents, items, allocations=[[], []], end_allocation=[], do_single=True)
+    profile = make_profile(agents, items)
+    logger.debug("\nAlgorithm: L1\nTwo Agents %s %s and items %s", profile.names[0], profile.names[1], profile.items)
+    return l1_helper(profile, list(range(len(profile.items))), allocations=[[], []], end_allocation=[], do_single=True)
 
 
-def l1_helper(agents: AgentList, items: List[Any] = None, allocations=[[], []], end_allocation=[],
+def l1_helper(profile: Profile, items: List[int] = None, allocations=None, end_allocation=None,
               do_single: bool = False) -> Dict:
     """
      A recursive helper function to l1()
 
-     :param agents A list that represent the players(agents) and for each player his valuation for each item, plus the
-     player's name.
-     :param items A list of all existing items (U).
+     :param profile the preferences of the agents, see make_profile().
+     :param items the positions of all existing items (U).
      :param allocations is the allocation for each player so far.
      :param end_allocation is the end allocation for each player.
      :param do_single is a boolean flag that indicates if the singles() algorithm should be used or not,
      in this function it will only be used the first time the function is called as many times as possible.
      """
+    if allocations is None:
+        allocations = [[], []]
+    if end_allocation is None:
+        end_allocation = []
     if do_single:
-        A_items, B_items = get_valuation_list(agents, items)
+        A_items, B_items = ranked_items(profile, items)
         flag = True
         while flag:
-            flag, allocations = singles(A_items.copy(), B_items.copy(), items, allocations)
+            flag, items, allocations = singles(A_items, B_items, items, allocations)
     if not items:
-        end_allocation.append({agents[0].name(): allocations[0], agents[1].name(): allocations[1]})
+        end_allocation.append(allocation_dict(profile, allocations))
         return end_allocation
-    H_A_level, H_B_level = H_M_l(agents, items, len(agents[0].all_items()))
-    if H_A_level[0] != H_B_level[0]:
-        _allocations = deep_copy_2d_list(allocations)
-        _items, _allocations = allocate(agents, items.copy(), _allocations, H_A_level[0], H_B_level[0])
-        s1_helper(agents, _items, _allocations, end_allocation)
-    temp_allocation_1 = deep_copy_2d_list(allocations)
-    temp_allocation_2 = deep_copy_2d_list(allocations)
-    items_1, temp_allocation_1 = allocate(items.copy(), temp_allocation_1, H_A_level[0], H_B_level[1])
-    items_2, temp_allocation_2 = allocate(items.copy(), temp_allocation_2, H_A_level[1], H_B_level[0])
-    logger.info("current allocations: \n%s: %s\n%s: %s", agents[0].name(), allocations[0], agents[1].name(),
-                allocations[0])
-    s1_helper(agents, items_1, temp_allocation_1, end_allocation)
-    s1_helper(agents, items_2, temp_allocation_2, end_allocation)
+    logger.info("current allocations: \n%s: %s\n%s: %s", profile.names[0], allocations[0], profile.names[1],
+                allocations[1])
+    for i, j in singles_doubles_branches(profile, items):
+        _items, _allocations = allocate(items, allocations, i, j)
+        s1_helper(profile, _items, _allocations, end_allocation)
     return end_allocation
 
 
@@ -507,10 +759,11 @@ def top_down(agents: AgentList, items: List[Any] = None) -> Dict:
     a.k.a TD. The algorithm does not return envy-free allocations and returns max-min allocations.
 
     :param agents A list that represent the players(agents) and for each player his valuation for each item, plus the
-    player's name.
-    :param items A list of all existing items (U).
+    player's name. Or a (2, n) array of ranks, see make_profile().
+    :param items A list of all existing items (U), or the item names of a rank array.
 
     # test 1:
+    >>> from fairpy import fairpy
     >>> Alice = fairpy.agents.AdditiveAgent({'computer': 1, 'phone': 2, 'tv': 3, 'book': 4}, name = 'Alice')
     >>> George = fairpy.agents.AdditiveAgent({'computer': 4, 'phone': 2, 'tv': 3, 'book': 1}, name = 'George')
     >>> top_down([Alice, George], ['computer', 'phone', 'tv', 'book'])
@@ -541,31 +794,20 @@ def top_down(agents: AgentList, items: List[Any] = None) -> Dict:
     >>> top_down([Alice, George], ['a', 'b', 'c', 'd', 'e', 'f','g','h','i' , 'j'])
     {'Alice': ['a', 'b', 'c', 'e', 'g'], 'George': ['i', 'j', 'd', 'f', 'h']}
     """
-    logger.debug("\nAlgorithm: TD\nTwo Agents %s %s and items %s", agents[0].name(), agents[1].name(), items)
-    return top_down_helper(agents, items, allocations=[])
+    profile = make_profile(agents, items)
+    logger.debug("\nAlgorithm: TD\nTwo Agents %s %s and items %s", profile.names[0], profile.names[1], profile.items)
+    return top_down_helper(profile, list(range(len(profile.items))))
 
 
-def top_down_helper(agents: AgentList, items: List[Any] = None, allocations: List[Any] = None):
+def top_down_helper(profile: Profile, items: List[int] = None):
     """
     A helper function to top_down()
 
-    :param agents A list that represent the players(agents) and for each player his valuation for each item, plus the
-    player's name.
-    :param items A list of all existing items (U).
-    :param allocations is the allocation for each player so far.
+    :param profile the preferences of the agents, see make_profile().
+    :param items the positions of all existing items (U).
     """
-    length = int(len(items) / 2)
-    allocations = [[], []]
-    valuations = sorted_valuations(agents, items)
-    for i in range(length):
-        if valuations[0][0] in items:
-            items, allocations = allocate(items, allocations, a_item=valuations[0][0], valuation_list=valuations)
-        if valuations[1][0] in items:
-            items, allocations = allocate(items, allocations, b_item=valuations[1][0], valuation_list=valuations)
-        logger.info("current allocations: \n%s: %s\n%s: %s", agents[0].name(), allocations[0], agents[1].name(),
-                    allocations[0])
-    end_allocation = {agents[0].name(): allocations[0], agents[1].name(): allocations[1]}
-    return end_allocation
+    order = pick_order('AB', 2, len(items) - len(items) % 2)
+    return allocation_dict(profile, pick_items(profile, items, order, TOP))
 
 
 def top_down_alternating(agents: AgentList, items: List[Any] = None) -> Dict:
@@ -573,10 +815,11 @@ def top_down_alternating(agents: AgentList, items: List[Any] = None) -> Dict:
     a.k.a TA. The algorithm does not return envy-free allocations and returns max-min allocations.
 
     :param agents A list that represent the players(agents) and for each player his valuation for each item, plus the
-    player's name. A-BB-AA...-B
-    :param items A list of all existing items (U).
+    player's name. Or a (2, n) array of ranks, see make_profile(). A-BB-AA...-B
+    :param items A list of all existing items (U), or the item names of a rank array.
 
     # test 1:
+    >>> from fairpy import fairpy
     >>> Alice = fairpy.agents.AdditiveAgent({'computer': 1, 'phone': 2, 'tv': 3, 'book': 4}, name = 'Alice')
     >>> George = fairpy.agents.AdditiveAgent({'computer': 4, 'phone': 2, 'tv': 3, 'book': 1}, name = 'George')
     >>> top_down_alternating([Alice, George], ['computer', 'phone', 'tv', 'book'])
@@ -607,41 +850,20 @@ def top_down_alternating(agents: AgentList, items: List[Any] = None) -> Dict:
     {'Alice': ['a', 'b', 'c', 'f', 'g'], 'George': ['i', 'j', 'd', 'e', 'h']}
 
     """
-    logger.debug("\nAlgorithm: TA\nTwo Agents %s %s and items %s", agents[0].name(), agents[1].name(), items)
-    return top_down_alternating_helper(agents, items, allocations=[])
+    profile = make_profile(agents, items)
+    logger.debug("\nAlgorithm: TA\nTwo Agents %s %s and items %s", profile.names[0], profile.names[1], profile.items)
+    return top_down_alternating_helper(profile, list(range(len(profile.items))))
 
 
-def top_down_alternating_helper(agents: AgentList, items: List[Any] = None, allocations: List[Any] = None):
+def top_down_alternating_helper(profile: Profile, items: List[int] = None):
     """
     A helper function to top_down_alternating()
 
-    :param agents A list that represent the players(agents) and for each player his valuation for each item, plus the
-    player's name.
-    :param items A list of all existing items (U).
-    :param allocations is the allocation for each player so far.
+    :param profile the preferences of the agents, see make_profile().
+    :param items the positions of all existing items (U).
     """
-    flag = True
-    allocations = [[], []]
-    valuations = sorted_valuations(agents, items)
-    length = int(len(items) / 2)
-    for _ in range(length):
-        if flag:
-            if valuations[0][0] in items:
-                items, allocations = allocate(items, allocations, a_item=valuations[0][0], valuation_list=valuations)
-            if valuations[1][0] in items:
-                items, allocations = allocate(items, allocations, b_item=valuations[1][0], valuation_list=valuations)
-            flag = False
-        elif not flag:
-            if valuations[1][0] in items:
-                items, allocations = allocate(items, allocations, b_item=valuations[1][0], valuation_list=valuations)
-            if valuations[0][0] in items:
-                items, allocations = allocate(items, allocations, a_item=valuations[0][0], valuation_list=valuations)
-            flag = True
-        logger.info("current allocations: \n%s: %s\n%s: %s", agents[0].name(), allocations[0], agents[1].name(),
-                    allocations[0])
-
-    end_allocation = {agents[0].name(): allocations[0], agents[1].name(): allocations[1]}
-    return end_allocation
+    order = pick_order('ABBA', 2, len(items) - len(items) % 2)
+    return allocation_dict(profile, pick_items(profile, items, order, TOP))
 
 
 def bottom_up(agents: AgentList, items: List[Any] = None) -> Dict:
@@ -649,10 +871,11 @@ def bottom_up(agents: AgentList, items: List[Any] = None) -> Dict:
     a.k.a BU. The algorithm does not return envy-free allocations and does not return max-min allocations.
 
     :param agents A list that represent the players(agents) and for each player his valuation for each item, plus the
-    player's name.
-    :param items A list of all existing items (U).
+    player's name. Or a (2, n) array of ranks, see make_profile().
+    :param items A list of all existing items (U), or the item names of a rank array.
 
     # test 1:
+    >>> from fairpy import fairpy
     >>> Alice = fairpy.agents.AdditiveAgent({'computer': 1, 'phone': 2, 'tv': 3, 'book': 4}, name = 'Alice')
     >>> George = fairpy.agents.AdditiveAgent({'computer': 4, 'phone': 2, 'tv': 3, 'book': 1}, name = 'George')
     >>> bottom_up([Alice, George], ['computer', 'phone', 'tv', 'book'])
@@ -683,34 +906,20 @@ def bottom_up(agents: AgentList, items: List[Any] = None) -> Dict:
     {'Alice': ['h', 'g', 'e', 'c', 'a'], 'George': ['j', 'i', 'f', 'd', 'b']}
 
     """
-    logger.debug("\nAlgorithm: BU\nTwo Agents %s %s and items %s", agents[0].name(), agents[1].name(), items)
-    return bottom_up_helper(agents, items, allocations=[])
+    profile = make_profile(agents, items)
+    logger.debug("\nAlgorithm: BU\nTwo Agents %s %s and items %s", profile.names[0], profile.names[1], profile.items)
+    return bottom_up_helper(profile, list(range(len(profile.items))))
 
 
-def bottom_up_helper(agents: AgentList, items: List[Any] = None, allocations: List[Any] = None):
+def bottom_up_helper(profile: Profile, items: List[int] = None):
     """
     A helper function to bottom_up()
 
-    :param agents A list that represent the players(agents) and for each player his valuation for each item, plus the
-    player's name.
-    :param items A list of all existing items (U).
-    :param allocations is the allocation for each player so far.
+    :param profile the preferences of the agents, see make_profile().
+    :param items the positions of all existing items (U).
     """
-    length = int(len(items) / 2)
-    allocations = [[], []]
-    valuations = sorted_valuations(agents, items)
-    for i in range(length):
-        if valuations[0][len(valuations[0]) - 1] in items:
-            items, allocations = allocate(items, allocations, b_item=valuations[0][len(valuations[0]) - 1],
-                                          valuation_list=valuations)
-        if valuations[1][len(valuations[1]) - 1] in items:
-            items, allocations = allocate(items, allocations, a_item=valuations[1][len(valuations[1]) - 1],
-                                          valuation_list=valuations)
-        logger.info("current allocations: \n%s: %s\n%s: %s", agents[0].name(), allocations[0], agents[1].name(),
-                    allocations[0])
-
-    end_allocation = {agents[0].name(): allocations[0], agents[1].name(): allocations[1]}
-    return end_allocation
+    order = pick_order('AB', 2, len(items) - len(items) % 2)
+    return allocation_dict(profile, pick_items(profile, items, order, BOTTOM))
 
 
 def bottom_up_alternating(agents: AgentList, items: List[Any] = None) -> Dict:
@@ -718,10 +927,11 @@ def bottom_up_alternating(agents: AgentList, items: List[Any] = None) -> Dict:
     a.k.a BA. The algorithm does not return envy-free allocations and does not return max-min allocations.
 
     :param agents A list that represent the players(agents) and for each player his valuation for each item, plus the
-    player's name.
-    :param items A list of all existing items (U).
+    player's name. Or a (2, n) array of ranks, see make_profile().
+    :param items A list of all existing items (U), or the item names of a rank array.
 
     # test 1:
+    >>> from fairpy import fairpy
     >>> Alice = fairpy.agents.AdditiveAgent({'computer': 1, 'phone': 2, 'tv': 3, 'book': 4}, name = 'Alice')
     >>> George = fairpy.agents.AdditiveAgent({'computer': 4, 'phone': 2, 'tv': 3, 'book': 1}, name = 'George')
     >>> bottom_up_alternating([Alice, George], ['computer', 'phone', 'tv', 'book'])
@@ -751,41 +961,20 @@ def bottom_up_alternating(agents: AgentList, items: List[Any] = None) -> Dict:
     >>> bottom_up_alternating([Alice, George], ['a', 'b', 'c', 'd', 'e', 'f','g','h','i' , 'j'])
     {'Alice': ['h', 'g', 'e', 'd', 'a'], 'George': ['j', 'i', 'f', 'c', 'b']}
     """
-    logger.debug("\nAlgorithm: BA\nTwo Agents %s %s and items %s", agents[0].name(), agents[1].name(), items)
-    return bottom_up_alternating_helper(agents, items, allocations=[])
+    profile = make_profile(agents, items)
+    logger.debug("\nAlgorithm: BA\nTwo Agents %s %s and items %s", profile.names[0], profile.names[1], profile.items)
+    return bottom_up_alternating_helper(profile, list(range(len(profile.items))))
 
 
-def bottom_up_alternating_helper(agents: AgentList, items: List[Any] = None, allocations: List[Any] = None):
+def bottom_up_alternating_helper(profile: Profile, items: List[int] = None):
     """
     A helper function to bottom_up_alternating()
 
-    :param agents A list that represent the players(agents) and for each player his valuation for each item, plus the
-    player's name.
-    :param items A list of all existing items (U).
-    :param allocations is the allocation for each player so far.
+    :param profile the preferences of the agents, see make_profile().
+    :param items the positions of all existing items (U).
     """
-    flag = True
-    allocations = [[], []]
-    valuations = sorted_valuations(agents, items)
-    length = int(len(items) / 2)
-    for _ in range(length):
-        if flag:
-            if valuations[0][len(valuations[0]) - 1] in items:
-                items, allocations = allocate(items, allocations, b_item=valuations[0][len(valuations[0]) - 1], valuation_list=valuations)
-            if valuations[1][len(valuations[1]) - 1] in items:
-                items, allocations = allocate(items, allocations, a_item=valuations[1][len(valuations[1]) - 1], valuation_list=valuations)
-            flag = False
-        elif not flag:
-            if valuations[1][len(valuations[1]) - 1] in items:
-                items, allocations = allocate(items, allocations, a_item=valuations[1][len(valuations[1]) - 1], valuation_list=valuations)
-            if valuations[0][len(valuations[0]) - 1] in items:
-                items, allocations = allocate(items, allocations, b_item=valuations[0][len(valuations[0]) - 1], valuation_list=valuations)
-            flag = True
-        logger.info("current allocations: \n%s: %s\n%s: %s", agents[0].name(), allocations[0], agents[1].name(),
-                    allocations[0])
-
-    end_allocation = {agents[0].name(): allocations[0], agents[1].name(): allocations[1]}
-    return end_allocation
+    order = pick_order('ABBA', 2, len(items) - len(items) % 2)
+    return allocation_dict(profile, pick_items(profile, items, order, BOTTOM))
 
 
 def trump(agents: AgentList, items: List[Any] = None) -> Dict:
@@ -794,10 +983,11 @@ def trump(agents: AgentList, items: List[Any] = None) -> Dict:
     optimality allocations.
 
     :param agents A list that represent the players(agents) and for each player his valuation for each item, plus the
-    player's name.
-    :param items A list of all existing items (U).
+    player's name. Or a (2, n) array of ranks, see make_profile().
+    :param items A list of all existing items (U), or the item names of a rank array.
 
     # test 1:
+    >>> from fairpy import fairpy
     >>> Alice = fairpy.agents.AdditiveAgent({'computer': 1, 'phone': 2, 'tv': 3, 'book': 4}, name = 'Alice')
     >>> George = fairpy.agents.AdditiveAgent({'computer': 4, 'phone': 2, 'tv': 3, 'book': 1}, name = 'George')
     >>> trump([Alice, George], ['computer', 'phone', 'tv', 'book'])
@@ -827,30 +1017,84 @@ def trump(agents: AgentList, items: List[Any] = None) -> Dict:
     >>> trump([Alice, George], ['a', 'b', 'c', 'd', 'e', 'f','g','h','i' , 'j'])
     {'Alice': ['a', 'c', 'e', 'g', 'h'], 'George': ['i', 'j', 'b', 'd', 'f']}
     """
-    logger.debug("\nAlgorithm: TR\nTwo Agents %s %s and items %s", agents[0].name(), agents[1].name(), items)
-    i = 1
-    allocations = [[], []]
-    end_allocation = []
-    length = len(items)
-    while i < length:
-        for m in range(len(agents)):
-            hm = H_M_l(agents, items, i)
-            # if not hm[0] and not hm[1]:
-            if not hm[m]:
-                return end_allocation
-            if m == 0:
-                item = find_last_item(agents[1], hm[0])
-                allocate(items, allocations, a_item=item)
-            if m == 1:
-                item = find_last_item(agents[0], hm[1])
-                allocate(items, allocations, b_item=item)
-            logger.info("current allocations: \n%s: %s\n%s: %s", agents[0].name(), allocations[0], agents[1].name(), allocations[0])
-        i += 2
-    end_allocation = {agents[0].name(): allocations[0], agents[1].name(): allocations[1]}
-    return end_allocation
+    profile = make_profile(agents, items)
+    logger.debug("\nAlgorithm: TR\nTwo Agents %s %s and items %s", profile.names[0], profile.names[1], profile.items)
+    items = list(range(len(profile.items)))
+    if strict_ranks(profile, items) and not envy_free_items_exist(profile, items):
+        return []
+    allocations = pick_items(profile, items, pick_order('AB', 2, len(items) - len(items) % 2), TRUMP)
+    if allocations is None:
+        return []
+    return allocation_dict(profile, allocations)
+
 
+# The pick order and rule of the picking algorithms, the ones run_picking_suite() runs.
+PICKING = {'TD': ('AB', TOP), 'TA': ('ABBA', TOP), 'BU': ('AB', BOTTOM), 'BA': ('ABBA', BOTTOM), 'TR': ('AB', TRUMP)}
 
-# if __name__ == '__main__':
-#     Alice = fairpy.agents.AdditiveAgent({'computer': 1, 'phone': 3, 'tv': 2, 'book': 4}, name='Alice')
-#     George = fairpy.agents.AdditiveAgent({'computer': 1, 'phone': 2, 'tv': 3, 'book': 4}, name='George')
-#     sequential([Alice, George], ['computer', 'phone', 'tv', 'book'])
\ No newline at end of file
+
+def run_picking_suite(agents: AgentList, items: List[Any] = None) -> Dict:
+    """
+    Runs TD, TA, BU, BA and TR on one profile and returns, for each abbreviation, the pair (allocation, scores): what
+    the algorithm returns, and the value each agent gives its own items (the Borda scores n + 1 - rank, or the cardinal
+    values, see agent_values()). A failed trump run gives ([], None).
+    The profile is built once, every agent's items are sorted by rank once and shared by all the runs, and so are the
+    pick orders, so the suite takes about 2/3 of the time of the five algorithms called one by one.
+
+    :param agents A list of agents or a (2, n) array of ranks, see make_profile().
+    :param items A list of all existing items (U), or the item names of a rank array.
+
+    >>> suite = run_picking_suite([[1, 2, 3, 4], [4, 2, 3, 1]], ['computer', 'phone', 'tv', 'book'])
+    >>> suite['TD']
+    ({0: ['computer', 'phone'], 1: ['book', 'tv']}, [7, 6])
+    >>> suite['TR']
+    ({0: ['computer', 'tv'], 1: ['book', 'phone']}, [6, 7])
+    >>> run_picking_suite([[1, 3, 2, 4], [1, 2, 3, 4]])['TR']
+    ([], None)
+    >>> run_picking_suite([[1, 1, 2, 4], [1, 4, 3, 2]], ['a', 'b', 'c', 'd'])['TR']
+    ({0: ['b', 'c'], 1: ['a', 'd']}, [7, 7])
+    """
+    profile = make_profile(agents, items)
+    logger.debug("\nAlgorithm: picking suite\nTwo Agents %s %s and items %s", profile.names[0], profile.names[1],
+                 profile.items)
+    items = list(range(len(profile.items)))
+    picks = len(items) - len(items) % 2
+    orders = {pattern: pick_order(pattern, 2, picks) for pattern in ('AB', 'ABBA')}
+    ranked = [rank_order(ranks, items) for ranks in profile.ranks]
+    # trump() breaks ties in the order the agents state their items, which for a rank array is the order of the items.
+    stated = [agent_ranked if order == items else rank_order(ranks, order)
+              for ranks, order, agent_ranked in zip(profile.ranks, profile.orders, ranked)]
+    strict = strict_ranks(profile, items)
+    values = agent_values(profile)
+    suite = {}
+    for name, (pattern, rule) in PICKING.items():
+        if rule == TRUMP:
+            bundles = pick_items(profile, items, orders[pattern], rule, stated) \
+                if not strict or envy_free_items_exist(profile, items, ranked) else None
+        else:
+            bundles = pick_items(profile, items, orders[pattern], rule, ranked)
+        if bundles is None:
+            suite[name] = ([], None)
+        else:
+            suite[name] = (allocation_dict(profile, bundles), [sum(values[k][i] for i in bundles[k]) for k in range(2)])
+    return suite
+
+
+# The algorithms by their abbreviation in the paper.
+ALGORITHMS = {
+    'OS': sequential,
+    'RS': restricted_simple,
+    'SD': singles_doubles,
+    'IS': iterated_singles_doubles,
+    'S1': s1,
+    'L1': l1,
+    'TD': top_down,
+    'TA': top_down_alternating,
+    'BU': bottom_up,
+    'BA': bottom_up_alternating,
+    'TR': trump,
+}
+
+
+if __name__ == '__main__':
+    from cli_two_player_fair_division import main
+    main()
@@ -3,9 +3,11 @@ Utils file for two_player_fair_division.py
 
 programmers: Itay Hasidi & Amichai Bitan
 """
-from typing import List, Any, Dict
-from fairpy import fairpy
-from fairpy.fairpy.agentlist import AgentList
+from __future__ import annotations
+from typing import List, Any, Dict, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from fairpy.fairpy.agentlist import AgentList
 
 
 def find_last_item(agent, item_list):
@@ -15,6 +17,7 @@ def find_last_item(agent, item_list):
     :param agent the agent for which the function checks the least valued item.
     :param item_list all the items that are being checked.
 
+    >>> from fairpy import fairpy
     >>> Alice = fairpy.agents.AdditiveAgent({'computer': 1, 'phone': 2, 'tv': 3, 'book': 4}, name = 'Alice')
     >>> find_last_item(Alice, ['computer', 'phone', 'tv', 'book'])
     'book'
@@ -41,6 +44,7 @@ def is_envy_free_partial_allocation(agents: AgentList, allocations: List[Any]):
     player's name.
     :param allocations is the allocation for each player so far.
 
+    >>> from fairpy import fairpy
     >>> Alice = fairpy.agents.AdditiveAgent({'computer': 1, 'phone': 2, 'tv': 3, 'book': 4}, name = 'Alice')
     >>> George = fairpy.agents.AdditiveAgent({'computer': 4, 'phone': 2, 'tv': 3, 'book': 1}, name = 'George')
     >>> is_envy_free_partial_allocation([Alice, George], [['computer', 'phone'], ['book', 'tv']])
@@ -80,15 +84,15 @@ def deep_copy_2d_list(lst: list):
     return lst_copy
 
 
-def allocate(items: List[Any], allocations: List[Any] = None, a_item=None, b_item=None, valuation_list=None):
+def allocate(items: List[Any], allocations: List[Any] = None, a_item=None, b_item=None):
     """
     Allocates the first item, to agent A and the second item to agent B.
+    Returns new lists of the remaining items and of the allocations, the lists it gets are not changed.
 
     :param items A list of all existing items (U).
     :param allocations is the allocation for each player so far
     :param a_item the item that agent A gets
     :param b_item the item that agent B gets
-    :param valuation_list a list with valuations for each agent, only used in BU BA TD TA algorithms
 
     >>> itm, alloc = allocate(['a', 'b', 'c', 'd'], [[], []], 'a', 'b')
     >>> itm
@@ -102,18 +106,14 @@ def allocate(items: List[Any], allocations: List[Any] = None, a_item=None, b_ite
     >>> alloc
     [['a'], []]
     """
-    if a_item:
+    items = list(items)
+    allocations = [list(allocations[0]), list(allocations[1])]
+    if a_item is not None:
         allocations[0].append(a_item)
         items.remove(a_item)
-        if valuation_list:
-            valuation_list[0].remove(a_item)
-            valuation_list[1].remove(a_item)
-    if b_item:
+    if b_item is not None:
         allocations[1].append(b_item)
         items.remove(b_item)
-        if valuation_list:
-            valuation_list[0].remove(b_item)
-            valuation_list[1].remove(b_item)
     return items, allocations
 
 
@@ -126,6 +126,7 @@ def H_M_l(agents: AgentList, items: List[Any] = None, level: int = 1):
     :param items A list of all existing items (U).
     :param level is the depth level for item searching for each iteration.
 
+    >>> from fairpy import fairpy
     >>> Alice = fairpy.agents.AdditiveAgent({'computer': 1, 'phone': 2, 'tv': 3, 'book': 4}, name = 'Alice')
     >>> George = fairpy.agents.AdditiveAgent({'computer': 4, 'phone': 2, 'tv': 3, 'book': 1}, name = 'George')
     >>> H_M_l([Alice, George], ['computer', 'phone', 'tv', 'book'])
@@ -173,33 +174,29 @@ def singles(A_items: List[Any], B_items: List[Any], items: List[Any], allocation
     For instance: A = [1, 2, 3, 4], B = [1, 4, 3, 2] we see that 2 is single in B and 4 in A, but 3 is in both A and B
     so that means 3 is not a single.
 
-    :param agents A list that represent the players(agents) and for each player his valuation for each item, plus the
-    player's name.
+    Returns (found, items, allocations): whether there were singles, and new lists of the remaining items and of the
+    allocations. The lists it gets are not changed.
+
+    :param A_items the items in the order agent A ranks them, the most valued first.
+    :param B_items the items in the order agent B ranks them, the most valued first.
     :param items A list of all existing items (U).
     :param allocations is the allocation for each player so far.
 
-    >>> Alice = fairpy.agents.AdditiveAgent({'computer': 1, 'phone': 2, 'tv': 3, 'book': 4}, name = 'Alice')
-    >>> George = fairpy.agents.AdditiveAgent({'computer': 4, 'phone': 2, 'tv': 3, 'book': 1}, name = 'George')
-    >>> singles([Alice, George], ['computer', 'phone', 'tv', 'book'], [[], []])
-    (True, [['computer'], ['book']])
-
-    >>> Alice = fairpy.agents.AdditiveAgent({'computer': 1, 'phone': 3, 'tv': 2, 'book': 4}, name = 'Alice')
-    >>> George = fairpy.agents.AdditiveAgent({'computer': 4, 'phone': 2, 'tv': 3, 'book': 1}, name = 'George')
-    >>> singles([Alice, George], ['computer', 'phone', 'tv', 'book'], [[], []])
-    (True, [['computer', 'tv'], ['book', 'phone']])
-
-    >>> Alice = fairpy.agents.AdditiveAgent({'computer': 1, 'phone': 2, 'tv': 3, 'book': 4}, name = 'Alice')
-    >>> George = fairpy.agents.AdditiveAgent({'computer': 1, 'phone': 2, 'tv': 3, 'book': 4}, name = 'George')
-    >>> singles([Alice, George], ['computer', 'phone', 'tv', 'book'], [[], []])
-    (False, [[], []])
+    >>> items = ['computer', 'phone', 'tv', 'book']
+    >>> singles(['computer', 'phone', 'tv', 'book'], ['book', 'phone', 'tv', 'computer'], items, [[], []])
+    (True, ['phone', 'tv'], [['computer'], ['book']])
+    >>> singles(['computer', 'tv', 'phone', 'book'], ['book', 'phone', 'tv', 'computer'], items, [[], []])
+    (True, [], [['computer', 'tv'], ['book', 'phone']])
+    >>> singles(['computer', 'phone', 'tv', 'book'], ['computer', 'phone', 'tv', 'book'], items, [[], []])
+    (False, ['computer', 'phone', 'tv', 'book'], [[], []])
+    >>> items
+    ['computer', 'phone', 'tv', 'book']
     """
     A_allocations = []
     B_allocations = []
-    for i in range(len(allocations[0])):
-        A_items.remove(allocations[0][i])
-        A_items.remove(allocations[1][i])
-        B_items.remove(allocations[0][i])
-        B_items.remove(allocations[1][i])
+    allocated = set(allocations[0]) | set(allocations[1])
+    A_items = [item for item in A_items if item not in allocated]
+    B_items = [item for item in B_items if item not in allocated]
     length = int(len(items))
     for i in range(length):
         # idx = len(A_items) - i
@@ -210,11 +207,11 @@ def singles(A_items: List[Any], B_items: List[Any], items: List[Any], allocation
         else:
             break
     if not A_allocations and not B_allocations:
-        return False, allocations
+        return False, items, allocations
     for j in range(len(A_allocations)):
         if A_allocations[j] in items and B_allocations[j] in items:
-            allocate(items, allocations, A_allocations[j], B_allocations[j])
-    return True, allocations
+            items, allocations = allocate(items, allocations, A_allocations[j], B_allocations[j])
+    return True, items, allocations
 
 
 def get_valuation_list(agents: AgentList, items: List[Any]):
@@ -242,6 +239,7 @@ def sorted_valuations(agents: AgentList, items: List[Any]):
     player's name.
     :param items A list of all existing items (U).
 
+    >>> from fairpy import fairpy
     >>> Alice = fairpy.agents.AdditiveAgent({'computer': 1, 'phone': 2, 'tv': 3, 'book': 4}, name = 'Alice')
     >>> George = fairpy.agents.AdditiveAgent({'computer': 4, 'phone': 2, 'tv': 3, 'book': 1}, name = 'George')
     >>> sorted_valuations([Alice, George], ['computer', 'phone', 'tv', 'book'])